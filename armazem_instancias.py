@@ -0,0 +1,185 @@
+import json
+import mmap
+import os
+import atexit
+import struct
+import sys
+from array import array
+
+from heuristicas_v3 import Instancia, ler_instancia_agregada
+
+# ==========================================
+# ARMAZÉM BINÁRIO DE INSTÂNCIAS
+# ==========================================
+# Layout do arquivo (inteiros de 8 bytes, ordem nativa):
+#   cabeçalho: MAGICO (8 bytes) | offset do índice (q) | tamanho do índice (q)
+#   dados:     para cada instância, m tamanhos seguidos de m demandas (q)
+#   índice:    JSON {caminho: [mtime_ns, capacidade, inicio, m]}, inicio em
+#              número de inteiros a partir do início da área de dados
+# Os dados são lidos por mmap + memoryview.cast('q'), então carregar uma
+# instância não faz parsing nem cópia: tamanhos e demandas são fatias do mapa.
+# Por isso o mapa só fecha quando nenhuma Instancia devolvida por carregar()
+# estiver viva; quem guarda instâncias por muito tempo usa carregar(copiar=True).
+
+MAGICO = b'CSPINST1'
+CABECALHO = struct.Struct('8sqq')
+ARMAZEM_PADRAO = 'instancias.bin'
+
+def _mtime(caminho):
+    try:
+        return os.stat(caminho).st_mtime_ns
+    except OSError:
+        return None
+
+def construir_armazem(padroes=None, destino=ARMAZEM_PADRAO):
+    """
+    Gera (ou atualiza) o armazém com as instâncias dos padrões. Entradas cujo
+    arquivo não mudou (mesmo mtime) são copiadas do armazém anterior; as demais
+    são lidas de novo do texto. A escrita é atômica (arquivo temporário + replace).
+    Retorna (total, relidas).
+    """
+    from lote import SUITE_NOTURNA, listar_instancias  # lote importa este módulo
+    anterior = ArmazemInstancias(destino) if os.path.exists(destino) else None
+    indice = {}
+    dados = array('q')
+    relidas = 0
+    for caminho in listar_instancias(padroes or SUITE_NOTURNA):
+        mtime = _mtime(caminho)
+        if anterior is not None and anterior.atualizada(caminho, mtime):
+            _, capacidade, inicio, m = anterior.indice[caminho]
+            indice[caminho] = [mtime, capacidade, len(dados), m]
+            dados.extend(anterior.dados[inicio:inicio + 2 * m])
+        else:
+            instancia = ler_instancia_agregada(caminho)
+            if instancia is None:
+                continue
+            indice[caminho] = [mtime, instancia.capacidade, len(dados), instancia.num_tipos]
+            dados.extend(instancia.tamanhos)
+            dados.extend(instancia.demandas)
+            relidas += 1
+    if anterior is not None:
+        anterior.fechar()
+    escrever_armazem(indice, dados, destino)
+    return len(indice), relidas
+
+def gravar_instancias(instancias, destino=ARMAZEM_PADRAO):
+    """
+    Grava Instancias já em memória (ex.: geradas por gerador_cutgen.py) num
+    armazém novo, indexadas por instancia.nome. Sem arquivo de origem, o mtime
+    fica nulo e a entrada vale sempre. Retorna o total gravado.
+    """
+    indice = {}
+    dados = array('q')
+    for instancia in instancias:
+        indice[instancia.nome] = [None, instancia.capacidade, len(dados), instancia.num_tipos]
+        dados.extend(instancia.tamanhos)
+        dados.extend(instancia.demandas)
+    escrever_armazem(indice, dados, destino)
+    return len(indice)
+
+def escrever_armazem(indice, dados, destino):
+    """Escreve cabeçalho, dados e índice de forma atômica (arquivo temporário + replace)."""
+    bruto_indice = json.dumps(indice).encode()
+    offset_indice = CABECALHO.size + dados.itemsize * len(dados)
+    temporario = destino + '.tmp'
+    with open(temporario, 'wb') as f:
+        f.write(CABECALHO.pack(MAGICO, offset_indice, len(bruto_indice)))
+        dados.tofile(f)
+        f.write(bruto_indice)
+    os.replace(temporario, destino)
+
+class ArmazemInstancias:
+    """
+    Leitura do armazém por mmap; carregar() devolve Instancia sem copiar os
+    vetores, que continuam presos ao mapa enquanto a instância existir.
+    """
+
+    def __init__(self, caminho=ARMAZEM_PADRAO):
+        self.caminho = caminho
+        self._arquivo = open(caminho, 'rb')
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, offset_indice, tamanho_indice = CABECALHO.unpack_from(self._mapa, 0)
+        if magico != MAGICO:
+            raise ValueError(f"{caminho} não é um armazém de instâncias")
+        self.indice = json.loads(self._mapa[offset_indice:offset_indice + tamanho_indice])
+        self.dados = memoryview(self._mapa)[CABECALHO.size:offset_indice].cast('q')
+
+    def __contains__(self, caminho):
+        return caminho in self.indice
+
+    def atualizada(self, caminho, mtime=None):
+        """A entrada existe e o arquivo de origem não mudou (ou não existe mais)."""
+        if caminho not in self.indice:
+            return False
+        if mtime is None:
+            mtime = _mtime(caminho)
+        return mtime is None or mtime == self.indice[caminho][0]
+
+    def carregar(self, caminho, copiar=False):
+        """
+        Instancia a partir do armazém; relê o texto se a entrada estiver
+        desatualizada. Com copiar=True os vetores são copiados para array('q') e
+        a instância não impede o armazém de fechar.
+        """
+        if self.dados is None:
+            raise ValueError(f"armazém {self.caminho} já foi fechado")
+        if not self.atualizada(caminho):
+            return ler_instancia_agregada(caminho)
+        _, capacidade, inicio, m = self.indice[caminho]
+        tamanhos = self.dados[inicio:inicio + m]
+        demandas = self.dados[inicio + m:inicio + 2 * m]
+        if copiar:
+            tamanhos, demandas = array('q', tamanhos), array('q', demandas)
+        return Instancia.de_vetores(capacidade, tamanhos, demandas, nome=caminho)
+
+    def fechar(self):
+        """
+        Fecha o mapa e devolve True. Se ainda houver instâncias sem cópia vivas,
+        o mmap não pode fechar (BufferError): carregar() deixa de funcionar, o
+        mapa fica aberto até uma nova chamada de fechar() sem instâncias vivas
+        (ou até o fim do processo) e o retorno é False.
+        """
+        if self.dados is not None:
+            self.dados.release()
+            self.dados = None
+            self._arquivo.close()
+        try:
+            self._mapa.close()
+        except BufferError:
+            return False
+        return True
+
+# Um armazém aberto por processo (cada worker do pool abre o seu uma vez)
+_abertos = {}
+
+def abrir_armazem(armazem):
+    """ArmazemInstancias do arquivo, aberto uma vez por processo; None se não existir."""
+    if armazem is None or not os.path.exists(armazem):
+        return None
+    if armazem not in _abertos:
+        if not _abertos:
+            atexit.register(fechar_armazens)
+        _abertos[armazem] = ArmazemInstancias(armazem)
+    return _abertos[armazem]
+
+def fechar_armazens():
+    """Fecha os armazéns abertos por abrir_armazem; retorna quantos ficaram pendentes."""
+    pendentes = sum(not aberto.fechar() for aberto in _abertos.values())
+    _abertos.clear()
+    return pendentes
+
+def carregar_instancia(caminho, armazem=None):
+    """Carrega pelo armazém se houver um, senão lê o arquivo de texto."""
+    aberto = abrir_armazem(armazem)
+    if aberto is None:
+        return ler_instancia_agregada(caminho)
+    return aberto.carregar(caminho)
+
+# ==========================================
+# MAIN
+# ==========================================
+if __name__ == "__main__":
+    destino = sys.argv[1] if len(sys.argv) > 1 else ARMAZEM_PADRAO
+    padroes = sys.argv[2:] or None
+    total, relidas = construir_armazem(padroes, destino)
+    print(f"{destino}: {total} instâncias ({relidas} lidas do texto, {total - relidas} reaproveitadas)")
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from lote import ALGORITMOS, executar_trabalho, listar_instancias
+
+# ==========================================
+# 1. SUÍTES
+# ==========================================
+SUITES = {f"cutgen_type{k:02d}": [f"cutgen/type{k:02d}/TEST*"] for k in range(1, 19)}
+SUITES['fiber_5180'] = ['fiber/*_5180.txt']
+SUITES['fiber_9080'] = ['fiber/*_9080.txt']
+SUITES['teste'] = ['Teste_*.txt']
+
+PASTA_LINHAS_BASE = 'linhas_base'
+
+def percentil(valores, p):
+    """Percentil pelo posto mais próximo (p em 0..100)."""
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    posto = max(1, -(-len(ordenados) * p // 100))
+    return ordenados[int(posto) - 1]
+
+# ==========================================
+# 2. EXECUÇÃO
+# ==========================================
+def medir_instancia(caminho, algoritmo, repeticoes=3, aquecimento=1, semente=0, max_iter=None, tempo_limite=30):
+    """
+    Roda aquecimento + repeticoes execuções sequenciais (tempos por perf_counter)
+    e devolve a mediana e o p95 do tempo, com barras, desperdício e limite da
+    última execução. Com a semente fixa o resultado só varia se o tempo cortar a busca.
+    """
+    for _ in range(aquecimento):
+        executar_trabalho(caminho, algoritmo, semente, max_iter, tempo_limite)
+    execucoes = [executar_trabalho(caminho, algoritmo, semente, max_iter, tempo_limite)
+                 for _ in range(repeticoes)]
+    ultima = execucoes[-1]
+    if any(r['status'] != 'ok' for r in execucoes):
+        return {'instancia': caminho, 'status': next(r['status'] for r in execucoes if r['status'] != 'ok')}
+    tempos = [r['tempo'] for r in execucoes]
+    return {
+        'instancia': caminho,
+        'status': 'ok',
+        'barras': max(r['barras'] for r in execucoes),
+        'desperdicio': max(r['desperdicio'] for r in execucoes),
+        'limite_inferior': ultima['limite_inferior'],
+        'tempo_mediana': statistics.median(tempos),
+        'tempo_p95': percentil(tempos, 95),
+    }
+
+def rodar_suite(nome, algoritmo, repeticoes=3, aquecimento=1, semente=0, max_iter=None, tempo_limite=30):
+    """
+    Mede todas as instâncias da suíte e agrega os números da suíte. Levanta
+    ValueError se os padrões da suíte não casam com nenhum arquivo (ex.: rodando
+    de outra pasta), em vez de medir o padrão literal como uma instância.
+    """
+    caminhos = [caminho for caminho in listar_instancias(SUITES[nome]) if os.path.isfile(caminho)]
+    if not caminhos:
+        raise ValueError(f"suíte {nome}: nenhum arquivo para {', '.join(SUITES[nome])} a partir de {os.getcwd()}")
+    instancias = [medir_instancia(caminho, algoritmo, repeticoes, aquecimento, semente, max_iter, tempo_limite)
+                  for caminho in caminhos]
+    ok = [r for r in instancias if r['status'] == 'ok']
+    medianas = [r['tempo_mediana'] for r in ok]
+    barras = sum(r['barras'] for r in ok)
+    limite = sum(r['limite_inferior'] for r in ok)
+    return {
+        'suite': nome,
+        'algoritmo': algoritmo,
+        'config': {'repeticoes': repeticoes, 'aquecimento': aquecimento, 'semente': semente,
+                   'max_iter': max_iter, 'tempo_limite': tempo_limite},
+        'data': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'instancias': len(instancias),
+        'falhas': len(instancias) - len(ok),
+        'barras': barras,
+        'limite_inferior': limite,
+        'gap': 100.0 * (barras - limite) / limite if limite else 0.0,
+        'desperdicio': sum(r['desperdicio'] for r in ok),
+        'tempo_total': sum(medianas),
+        'tempo_mediana': statistics.median(medianas) if medianas else 0.0,
+        'tempo_p95': percentil(medianas, 95),
+        'por_instancia': instancias,
+    }
+
+# ==========================================
+# 3. LINHAS DE BASE E PORTÃO DE REGRESSÃO
+# ==========================================
+def caminho_linha_base(nome, algoritmo, pasta=PASTA_LINHAS_BASE):
+    return os.path.join(pasta, f"{nome}__{algoritmo}.json")
+
+def salvar_linha_base(resultado, pasta=PASTA_LINHAS_BASE):
+    os.makedirs(pasta, exist_ok=True)
+    caminho = caminho_linha_base(resultado['suite'], resultado['algoritmo'], pasta)
+    with open(caminho, 'w') as f:
+        json.dump(resultado, f, indent=1, ensure_ascii=False)
+    return caminho
+
+def carregar_linha_base(nome, algoritmo, pasta=PASTA_LINHAS_BASE):
+    caminho = caminho_linha_base(nome, algoritmo, pasta)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho) as f:
+        return json.load(f)
+
+def comparar(resultado, base, tolerancia_tempo=0.10, folga_tempo=0.005):
+    """
+    Lista as regressões em relação à linha de base: mais barras, mais desperdício,
+    mais falhas, ou tempo total (soma das medianas) acima de
+    base * (1 + tolerancia_tempo) + folga_tempo segundos. A folga absoluta evita
+    alarmes em suítes que rodam em milissegundos.
+    """
+    regressoes = []
+    for campo in ('barras', 'desperdicio', 'falhas'):
+        if resultado[campo] > base[campo]:
+            regressoes.append(f"{campo}: {base[campo]} -> {resultado[campo]}")
+    limite_tempo = base['tempo_total'] * (1 + tolerancia_tempo) + folga_tempo
+    if resultado['tempo_total'] > limite_tempo:
+        regressoes.append(f"tempo_total: {base['tempo_total']:.4f}s -> {resultado['tempo_total']:.4f}s "
+                          f"(limite {limite_tempo:.4f}s)")
+    return regressoes
+
+def imprimir_resultado_suite(r, base=None):
+    linha = (f"{r['suite']:<14} | {r['algoritmo']:<12} | {r['instancias']:<5} | {r['barras']:<7} | "
+             f"{r['gap']:>6.2f}% | {r['desperdicio']:<10} | {r['tempo_mediana']:<9.4f} | "
+             f"{r['tempo_p95']:<9.4f} | {r['tempo_total']:.3f}")
+    if base is not None:
+        linha += f"  (base: {base['barras']} barras, {base['tempo_total']:.3f}s)"
+    print(linha)
+
+# ==========================================
+# MAIN
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark reprodutível das heurísticas com portão de regressão.")
+    parser.add_argument('suites', nargs='*', default=sorted(SUITES), help=f"suítes: {', '.join(sorted(SUITES))}")
+    parser.add_argument('-a', '--algoritmo', action='append', choices=sorted(ALGORITMOS))
+    parser.add_argument('-n', '--repeticoes', type=int, default=3)
+    parser.add_argument('-w', '--aquecimento', type=int, default=1)
+    parser.add_argument('-s', '--semente', type=int, default=0)
+    parser.add_argument('-i', '--max-iter', type=int, default=None)
+    parser.add_argument('-t', '--tempo-limite', type=float, default=30)
+    parser.add_argument('--pasta', default=PASTA_LINHAS_BASE, help="pasta das linhas de base")
+    parser.add_argument('--salvar', action='store_true', help="grava o resultado como nova linha de base")
+    parser.add_argument('--tolerancia', type=float, default=0.10, help="tolerância relativa de tempo (padrão 0.10)")
+    args = parser.parse_args(argv)
+
+    regressoes = []
+    erros = []
+    print(f"{'Suíte':<14} | {'Método':<12} | {'Inst.':<5} | {'Barras':<7} | {'Gap':>7} | {'Desperdício':<10} | "
+          f"{'Med.(s)':<9} | {'p95(s)':<9} | Total(s)")
+    print("-" * 110)
+    for nome in args.suites:
+        if nome not in SUITES:
+            parser.error(f"suíte desconhecida: {nome}")
+        for algoritmo in args.algoritmo or ['bl_avancada']:
+            try:
+                resultado = rodar_suite(nome, algoritmo, args.repeticoes, args.aquecimento, args.semente,
+                                        args.max_iter, args.tempo_limite)
+            except ValueError as erro:
+                erros.append(str(erro))
+                continue
+            base = carregar_linha_base(nome, algoritmo, args.pasta)
+            imprimir_resultado_suite(resultado, base)
+            if base is not None:
+                for regressao in comparar(resultado, base, args.tolerancia):
+                    regressoes.append(f"{nome}/{algoritmo}: {regressao}")
+            if resultado['falhas']:
+                # Uma linha de base com falhas esconderia as mesmas falhas depois
+                erros.append(f"{nome}/{algoritmo}: {resultado['falhas']} instância(s) com falha"
+                             + ("; linha de base não gravada" if args.salvar else ""))
+            elif args.salvar:
+                salvar_linha_base(resultado, args.pasta)
+
+    if erros:
+        print("\nERROS:")
+        for erro in erros:
+            print("  " + erro)
+    if regressoes:
+        print("\nREGRESSÕES:")
+        for regressao in regressoes:
+            print("  " + regressao)
+    return 1 if erros or regressoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import random
+import time
+from bisect import bisect_right
+
+from heuristicas_v3 import (Cancelamento, IndiceTrocas, ganho_realocacao, ganho_troca,
+                            tentar_eliminar_barra, consolidar_barras)
+from limites import calcular_limite_inferior, contagem_de_barras
+from solucao import SolucaoIncremental
+
+MASCARA = (1 << 64) - 1
+
+# ==========================================
+# 1. HASH ZOBRIST DA ATRIBUIÇÃO ITEM -> BARRA
+# ==========================================
+class HashZobrist:
+    """
+    Hash de 64 bits da solução: soma (mod 2^64) de um valor aleatório por par
+    (tamanho, barra) para cada item. Itens iguais são indistinguíveis, então a
+    soma no lugar do XOR evita que duas cópias na mesma barra se anulem. Mover
+    um item atualiza o hash em O(1), e o hash de um vizinho sai sem aplicar o
+    movimento.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.valores = {}
+        self.valor = 0
+
+    def chave(self, tamanho, barra):
+        valor = self.valores.get((tamanho, barra))
+        if valor is None:
+            valor = self.rng.getrandbits(64)
+            self.valores[(tamanho, barra)] = valor
+        return valor
+
+    def recalcular(self, estado):
+        self.valor = sum(self.chave(item, idx) for idx, barra in enumerate(estado.barras)
+                         for item in barra) & MASCARA
+
+    def apos_realocacao(self, origem, destino, item):
+        return (self.valor - self.chave(item, origem) + self.chave(item, destino)) & MASCARA
+
+    def apos_troca(self, i, j, item_i, item_j):
+        return (self.valor - self.chave(item_i, i) - self.chave(item_j, j)
+                + self.chave(item_j, i) + self.chave(item_i, j)) & MASCARA
+
+# ==========================================
+# 2. VIZINHANÇAS
+# ==========================================
+# Ao contrário de realocar_item e swap_entre_barras, aqui entram também os
+# movimentos de ganho negativo: a busca tabu aceita o melhor vizinho admissível
+# mesmo que piore. Para cada (barra de origem, tamanho) basta o melhor destino,
+# que é a barra mais cheia em que o item cabe, e as trocas vêm do IndiceTrocas.
+
+def realocacoes(estado):
+    """(ganho, ('realocar', origem, pos, destino, item)) para cada tamanho de cada barra."""
+    capacidade = estado.capacidade
+    ordenadas = sorted((estado.cargas[idx], idx) for idx in estado.indices_ativos())
+    for origem in estado.indices_ativos():
+        vistos = set()
+        for pos, item in enumerate(estado.barras[origem]):
+            if item in vistos:
+                continue
+            vistos.add(item)
+            k = bisect_right(ordenadas, (capacidade - item, float('inf'))) - 1
+            if k >= 0 and ordenadas[k][1] == origem:
+                k -= 1
+            if k < 0:
+                continue
+            destino = ordenadas[k][1]
+            yield ganho_realocacao(estado, origem, destino, item), ('realocar', origem, pos, destino, item)
+
+def trocas(estado):
+    """(ganho, ('trocar', i, pos_i, j, pos_j, item_i, item_j)) com item_j > item_i cabendo em i."""
+    indice = IndiceTrocas(estado)
+    for i, posicoes in indice.posicoes.items():
+        folga_i = estado.folga(i)
+        for item_i, pos_i in posicoes.items():
+            for item_j in indice.tamanhos_entre(item_i, item_i + folga_i):
+                j = indice.barra_mais_leve(item_j, i)
+                if j is not None:
+                    yield (ganho_troca(estado, i, j, item_i, item_j),
+                           ('trocar', i, pos_i, j, indice.posicoes[j][item_j], item_i, item_j))
+
+# ==========================================
+# 3. BUSCA TABU
+# ==========================================
+def busca_tabu(capacidade, solucao_inicial, max_iter=5000, tempo_limite=30, limite_inferior=None,
+               semente=None, duracao_tabu=None, parada=None):
+    """
+    Busca tabu sobre a SolucaoIncremental. A cada iteração tenta primeiro os
+    movimentos que eliminam barra (tentar_eliminar_barra, consolidar_barras) e,
+    se nenhum serve, aplica o melhor vizinho admissível entre realocações e
+    trocas, mesmo que piore a soma dos quadrados das cargas. Um movimento é tabu
+    se mexe num tamanho de item movido nas últimas duracao_tabu iterações
+    (padrão: um terço dos tamanhos distintos) ou se leva a um estado cujo hash
+    Zobrist já foi visitado. Aspiração: um movimento tabu é aceito se leva a uma
+    solução melhor que a melhor já vista. Sem vizinho admissível, faz uma troca
+    aleatória viável. Retorna (melhor_solucao, melhor_desperdicio, tempo).
+    """
+    inicio = time.time()
+    rng = random.Random(semente)
+    interrupcao = Cancelamento(prazo=inicio + tempo_limite, origem=parada)
+    estado = SolucaoIncremental(capacidade, solucao_inicial)
+    contagem = contagem_de_barras(estado.barras)
+    if limite_inferior is None:
+        limite_inferior = calcular_limite_inferior(capacidade, contagem)
+    if duracao_tabu is None:
+        duracao_tabu = max(1, len(contagem) // 3)
+
+    zobrist = HashZobrist(rng)
+    zobrist.recalcular(estado)
+    visitados = {zobrist.valor}
+    tabu_ate = {}
+    soma_quadrados = sum(carga * carga for carga in estado.cargas)
+    melhor_solucao = estado.para_listas()
+    melhor_desperdicio = estado.desperdicio
+    melhor_valor = (estado.num_barras, -soma_quadrados)
+
+    for iteracao in range(max_iter):
+        if interrupcao.esgotado() or estado.num_barras <= limite_inferior:
+            break
+
+        if tentar_eliminar_barra(estado, parada=interrupcao) or consolidar_barras(estado):
+            estado.confirmar()
+            zobrist.recalcular(estado)
+            soma_quadrados = sum(carga * carga for carga in estado.cargas)
+        else:
+            escolhido = None
+            melhor_ganho = None
+            for vizinhanca in (realocacoes, trocas):
+                for ganho, movimento in vizinhanca(estado):
+                    if melhor_ganho is not None and ganho <= melhor_ganho:
+                        continue
+                    if movimento[0] == 'realocar':
+                        _, origem, _, destino, item = movimento
+                        tamanhos = (item,)
+                        novo_hash = zobrist.apos_realocacao(origem, destino, item)
+                    else:
+                        _, i, _, j, _, item_i, item_j = movimento
+                        tamanhos = (item_i, item_j)
+                        novo_hash = zobrist.apos_troca(i, j, item_i, item_j)
+                    barras_apos = estado.num_barras - (ganho[0] // capacidade)
+                    aspiracao = (barras_apos, -(soma_quadrados + ganho[1])) < melhor_valor
+                    tabu = novo_hash in visitados or any(tabu_ate.get(t, -1) >= iteracao for t in tamanhos)
+                    if tabu and not aspiracao:
+                        continue
+                    melhor_ganho = ganho
+                    escolhido = (movimento, novo_hash, tamanhos)
+
+            if escolhido is None:
+                _perturbar(estado, rng)
+                estado.confirmar()
+                zobrist.recalcular(estado)
+                soma_quadrados = sum(carga * carga for carga in estado.cargas)
+            else:
+                movimento, novo_hash, tamanhos = escolhido
+                if movimento[0] == 'realocar':
+                    estado.mover(movimento[1], movimento[2], movimento[3])
+                else:
+                    estado.trocar(movimento[1], movimento[2], movimento[3], movimento[4])
+                estado.confirmar()
+                zobrist.valor = novo_hash
+                soma_quadrados += melhor_ganho[1]
+                for tamanho in tamanhos:
+                    tabu_ate[tamanho] = iteracao + duracao_tabu
+        visitados.add(zobrist.valor)
+
+        valor = (estado.num_barras, -soma_quadrados)
+        if valor < melhor_valor:
+            melhor_valor = valor
+            if estado.num_barras < len(melhor_solucao):
+                melhor_solucao = estado.para_listas()
+                melhor_desperdicio = estado.desperdicio
+
+    return melhor_solucao, melhor_desperdicio, time.time() - inicio
+
+def _perturbar(estado, rng, tentativas=20):
+    """Troca aleatória viável entre duas barras (mesma perturbação da busca_local_avancada)."""
+    ativos = estado.indices_ativos()
+    if len(ativos) < 2:
+        return
+    for _ in range(tentativas):
+        idx1, idx2 = rng.sample(ativos, 2)
+        pos1 = rng.randrange(len(estado.barras[idx1]))
+        pos2 = rng.randrange(len(estado.barras[idx2]))
+        item1 = estado.barras[idx1][pos1]
+        item2 = estado.barras[idx2][pos2]
+        if estado.cargas[idx1] - item1 + item2 <= estado.capacidade and \
+           estado.cargas[idx2] - item2 + item1 <= estado.capacidade:
+            estado.trocar(idx1, pos1, idx2, pos2)
+            return
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+from heuristicas_v3 import (resolver_ffd_agregado, expandir_barras, agregar_barras,
+                            busca_local_avancada)
+from limites import calcular_limite_inferior
+
+# ==========================================
+# CACHE PERSISTENTE DE SOLUÇÕES
+# ==========================================
+CACHE_PADRAO = 'solucoes.sqlite'
+
+def impressao_digital(instancia, configuracao=None):
+    """
+    Chave canônica: capacidade, pares (tamanho, demanda) ordenados e a configuração
+    do solver. A Instancia já vem agregada e ordenada, então a ordem das linhas no
+    arquivo e tamanhos repetidos não mudam a chave.
+    """
+    partes = [str(instancia.capacidade),
+              ';'.join(f"{t}x{d}" for t, d in sorted(instancia.tipos())),
+              json.dumps(configuracao or {}, sort_keys=True)]
+    return hashlib.sha256('|'.join(partes).encode()).hexdigest()
+
+def _melhor(barras_a, desp_a, barras_b, desp_b):
+    return (barras_a, desp_a) < (barras_b, desp_b)
+
+class CacheSolucoes:
+    """
+    Cache LRU de soluções em SQLite, limitado a max_entradas. Guarda a melhor
+    solução conhecida para cada chave (menos barras, depois menos desperdício),
+    em formato agregado {tamanho: quantidade} por barra.
+    """
+
+    def __init__(self, caminho=CACHE_PADRAO, max_entradas=10000):
+        self.max_entradas = max_entradas
+        self.conexao = sqlite3.connect(caminho, timeout=30)
+        self.conexao.execute("""
+            CREATE TABLE IF NOT EXISTS solucoes (
+                chave TEXT PRIMARY KEY,
+                capacidade INTEGER,
+                num_barras INTEGER,
+                desperdicio INTEGER,
+                barras TEXT,
+                acesso REAL
+            )""")
+        self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_acesso ON solucoes (acesso)")
+        self.conexao.commit()
+
+    def obter(self, instancia, configuracao=None):
+        """Retorna (barras em listas, desperdicio) ou None; marca a entrada como usada."""
+        chave = impressao_digital(instancia, configuracao)
+        linha = self.conexao.execute(
+            "SELECT barras, desperdicio FROM solucoes WHERE chave = ?", (chave,)).fetchone()
+        if linha is None:
+            return None
+        self.conexao.execute("UPDATE solucoes SET acesso = ? WHERE chave = ?", (time.time(), chave))
+        self.conexao.commit()
+        barras = [{int(t): q for t, q in barra} for barra in json.loads(linha[0])]
+        return expandir_barras(barras), linha[1]
+
+    def guardar(self, instancia, configuracao, barras, desperdicio):
+        """Grava a solução se for nova ou melhor que a guardada; aplica o limite LRU."""
+        chave = impressao_digital(instancia, configuracao)
+        atual = self.conexao.execute(
+            "SELECT num_barras, desperdicio FROM solucoes WHERE chave = ?", (chave,)).fetchone()
+        if atual is not None and not _melhor(len(barras), desperdicio, *atual):
+            self.conexao.execute("UPDATE solucoes SET acesso = ? WHERE chave = ?", (time.time(), chave))
+        else:
+            compactas = json.dumps([sorted(barra.items()) for barra in agregar_barras(barras)])
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO solucoes VALUES (?, ?, ?, ?, ?, ?)",
+                (chave, instancia.capacidade, len(barras), desperdicio, compactas, time.time()))
+            self.conexao.execute("""
+                DELETE FROM solucoes WHERE chave IN (
+                    SELECT chave FROM solucoes ORDER BY acesso DESC LIMIT -1 OFFSET ?)""",
+                (self.max_entradas,))
+        self.conexao.commit()
+
+    def __len__(self):
+        return self.conexao.execute("SELECT COUNT(*) FROM solucoes").fetchone()[0]
+
+    def fechar(self):
+        self.conexao.close()
+
+def resolver_com_cache(instancia, cache, configuracao=None, max_iter=500, tempo_limite=30, semente=0):
+    """
+    Resolve com FFD + busca_local_avancada consultando o cache antes. Num acerto
+    a solução guardada volta na hora; se ainda houver tempo_limite > 0 e ela não
+    estiver no limite inferior, serve de partida para a busca, e uma melhoria
+    volta para o cache. Retorna (barras, desperdicio, tempo, veio_do_cache).
+    """
+    inicio = time.time()
+    capacidade = instancia.capacidade
+    limite = calcular_limite_inferior(capacidade, instancia.contagem())
+    guardada = cache.obter(instancia, configuracao)
+
+    if guardada is not None:
+        barras, desperdicio = guardada
+        if tempo_limite <= 0 or len(barras) <= limite:
+            return barras, desperdicio, time.time() - inicio, True
+        partida = barras
+    else:
+        barras_ffd, _, _ = resolver_ffd_agregado(instancia)
+        partida = expandir_barras(barras_ffd)
+
+    barras, desperdicio, _ = busca_local_avancada(capacidade, partida, max_iter=max_iter,
+                                                  tempo_limite=tempo_limite, limite_inferior=limite,
+                                                  semente=semente)
+    cache.guardar(instancia, configuracao, barras, desperdicio)
+    return barras, desperdicio, time.time() - inicio, guardada is not None
@@ -0,0 +1,88 @@
+import argparse
+import csv
+import json
+import sys
+
+from armazem_instancias import fechar_armazens
+from lote import ALGORITMOS, listar_instancias, executar_trabalho, gerar_sementes, rodar_lote
+
+CAMPOS_CSV = ['instancia', 'grupo', 'algoritmo', 'semente', 'status', 'capacidade', 'tipos',
+              'itens', 'barras', 'limite_inferior', 'gap', 'desperdicio', 'tempo', 'erro']
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        description="Corte de estoque 1D (1DCSP): roda heurísticas sobre instâncias CUTGEN/fiber sem interação.")
+    parser.add_argument('instancias', nargs='+',
+                        help="arquivos ou globs, ex.: 'cutgen/type1*/TEST*' 'fiber/*_9080.txt'")
+    parser.add_argument('-a', '--algoritmo', action='append', choices=sorted(ALGORITMOS),
+                        help="algoritmo a rodar (pode repetir; padrão: bl_avancada)")
+    parser.add_argument('-t', '--tempo-limite', type=float, default=30,
+                        help="tempo limite por execução em segundos (padrão: 30)")
+    parser.add_argument('-i', '--max-iter', type=int, default=None,
+                        help="máximo de iterações da busca (padrão: o de cada algoritmo)")
+    parser.add_argument('-s', '--semente', type=int, action='append',
+                        help="semente aleatória (pode repetir; padrão: 0)")
+    parser.add_argument('-r', '--repeticoes', type=int, default=None,
+                        help="roda N sementes consecutivas a partir da primeira semente")
+    parser.add_argument('-f', '--formato', choices=['jsonl', 'csv'], default='jsonl',
+                        help="formato da saída (padrão: jsonl)")
+    parser.add_argument('-o', '--saida', default='-',
+                        help="arquivo de saída (padrão: stdout)")
+    parser.add_argument('-p', '--processos', type=int, default=1,
+                        help="processos em paralelo (padrão: 1, sem pool)")
+    parser.add_argument('--armazem', default=None,
+                        help="armazém binário gerado por armazem_instancias.py (evita reler os textos)")
+    parser.add_argument('-w', '--trabalhadores', type=int, default=None,
+                        help="processos de cada portfólio (padrão: núcleos sem pool, 1 com -p > 1)")
+    parser.add_argument('--perfil', action='store_true',
+                        help="anexa contadores e tempo por operador da busca (só jsonl; bl_avancada)")
+    return parser
+
+def executar(args):
+    """Gera os resultados, em série ou pelo pool de lote.py."""
+    caminhos = listar_instancias(args.instancias, args.armazem)
+    algoritmos = args.algoritmo or ['bl_avancada']
+    sementes = args.semente or [0]
+    if args.repeticoes:
+        sementes = gerar_sementes(sementes[0], args.repeticoes)
+    if args.processos > 1:
+        yield from rodar_lote(caminhos, algoritmos, sementes, args.max_iter, args.tempo_limite,
+                              processos=args.processos, armazem=args.armazem, perfil=args.perfil,
+                              trabalhadores=args.trabalhadores or 1)
+        return
+    for caminho in caminhos:
+        for algoritmo in algoritmos:
+            for semente in sementes:
+                yield executar_trabalho(caminho, algoritmo, semente, args.max_iter, args.tempo_limite,
+                                        armazem=args.armazem, perfil=args.perfil,
+                                        trabalhadores=args.trabalhadores)
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    saida = sys.stdout if args.saida == '-' else open(args.saida, 'w', newline='')
+    falhas = 0
+    try:
+        if args.formato == 'csv':
+            escritor = csv.DictWriter(saida, fieldnames=CAMPOS_CSV, extrasaction='ignore')
+            escritor.writeheader()
+        for resultado in executar(args):
+            if resultado['status'] != 'ok':
+                falhas += 1
+            if args.formato == 'csv':
+                escritor.writerow(resultado)
+            else:
+                saida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+            saida.flush()
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+        fechar_armazens()
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except BrokenPipeError:
+        # saída ligada a 'head' ou similar que fechou o pipe
+        sys.stderr.close()
+        sys.exit(1)
@@ -0,0 +1,119 @@
+import heapq
+
+from heuristicas_v3 import busca_local_avancada
+from limites import calcular_limite_inferior, contagem_de_barras
+
+# ==========================================
+# EMPACOTAMENTO EM FLUXO (ITENS CHEGANDO UM A UM)
+# ==========================================
+class EmpacotadorFluxo:
+    """
+    Corte online com memória constante: os itens entram numa janela de
+    antecipação de `janela` itens, e o maior da janela sai para a barra aberta de
+    melhor encaixe (a regra do BFD restrita ao que já chegou). No máximo
+    `max_abertas` barras ficam abertas. Uma barra é fechada e emitida quando passa
+    de `limiar` da capacidade ou quando a folga não comporta nem o menor item já
+    visto; sem barra que sirva e com todas as vagas ocupadas, fecha a mais cheia.
+    A cada `reotimizar_a_cada` itens colocados, uma busca_local_avancada curta
+    (max_iter, tempo_limite) reorganiza as barras abertas.
+    """
+
+    def __init__(self, capacidade, max_abertas=8, janela=16, limiar=0.98, reotimizar_a_cada=64,
+                 max_iter=50, tempo_limite=0.05, semente=0):
+        self.capacidade = capacidade
+        self.max_abertas = max_abertas
+        self.janela = janela
+        self.limiar = limiar
+        self.reotimizar_a_cada = reotimizar_a_cada
+        self.max_iter = max_iter
+        self.tempo_limite = tempo_limite
+        self.semente = semente
+        self.pendentes = []  # heap de -tamanho: a janela de antecipação
+        self.abertas = []
+        self.menor_item = capacidade
+        self.colocados = 0
+        self.estatisticas = {'itens': 0, 'barras': 0, 'desperdicio': 0, 'reotimizacoes': 0}
+
+    # --- entrada ---
+    def adicionar(self, item):
+        """Recebe um item e retorna a lista (possivelmente vazia) de barras fechadas."""
+        emitidas = []
+        self.estatisticas['itens'] += 1
+        self.menor_item = min(self.menor_item, item)
+        heapq.heappush(self.pendentes, -item)
+        while len(self.pendentes) > self.janela:
+            self._colocar(-heapq.heappop(self.pendentes), emitidas)
+        return emitidas
+
+    def adicionar_lote(self, itens):
+        emitidas = []
+        for item in itens:
+            emitidas.extend(self.adicionar(item))
+        return emitidas
+
+    def finalizar(self):
+        """Fim do fluxo: coloca a janela, faz uma última busca e emite todas as barras abertas."""
+        emitidas = []
+        while self.pendentes:
+            self._colocar(-heapq.heappop(self.pendentes), emitidas)
+        self._reotimizar(emitidas)
+        while self.abertas:
+            self._emitir(self.abertas.pop(0), emitidas)
+        return emitidas
+
+    # --- colocação ---
+    def _colocar(self, item, emitidas):
+        if item > self.capacidade:
+            self._emitir([item], emitidas)
+            return
+        melhor = None
+        menor_folga = self.capacidade + 1
+        for idx, barra in enumerate(self.abertas):
+            folga = self.capacidade - sum(barra) - item
+            if 0 <= folga < menor_folga:
+                menor_folga = folga
+                melhor = idx
+        if melhor is None:
+            if len(self.abertas) >= self.max_abertas:
+                mais_cheia = max(range(len(self.abertas)), key=lambda idx: sum(self.abertas[idx]))
+                self._emitir(self.abertas.pop(mais_cheia), emitidas)
+            self.abertas.append([])
+            melhor = len(self.abertas) - 1
+        self.abertas[melhor].append(item)
+        self._fechar_cheias(emitidas)
+
+        self.colocados += 1
+        if self.reotimizar_a_cada and self.colocados % self.reotimizar_a_cada == 0:
+            self._reotimizar(emitidas)
+
+    def _fechar_cheias(self, emitidas):
+        restantes = []
+        for barra in self.abertas:
+            carga = sum(barra)
+            if carga >= self.limiar * self.capacidade or self.capacidade - carga < self.menor_item:
+                self._emitir(barra, emitidas)
+            else:
+                restantes.append(barra)
+        self.abertas = restantes
+
+    def _reotimizar(self, emitidas):
+        if len(self.abertas) < 2:
+            return
+        limite = calcular_limite_inferior(self.capacidade, contagem_de_barras(self.abertas))
+        self.abertas, _, _ = busca_local_avancada(self.capacidade, self.abertas, max_iter=self.max_iter,
+                                                  tempo_limite=self.tempo_limite, limite_inferior=limite,
+                                                  semente=self.semente)
+        self.estatisticas['reotimizacoes'] += 1
+        self._fechar_cheias(emitidas)
+
+    def _emitir(self, barra, emitidas):
+        self.estatisticas['barras'] += 1
+        self.estatisticas['desperdicio'] += self.capacidade - sum(barra)
+        emitidas.append(barra)
+
+def empacotar_fluxo(capacidade, itens, **opcoes):
+    """Gerador: consome um iterável de itens e produz as barras à medida que fecham."""
+    empacotador = EmpacotadorFluxo(capacidade, **opcoes)
+    for item in itens:
+        yield from empacotador.adicionar(item)
+    yield from empacotador.finalizar()
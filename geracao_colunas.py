@@ -0,0 +1,169 @@
+import time
+
+from heuristicas_v3 import Instancia, resolver_ffd_agregado, calcular_desperdicio_agregado
+from mochila import mochila_limitada
+
+EPS = 1e-9
+
+# ==========================================
+# 1. RELAXAÇÃO LINEAR (GILMORE-GOMORY)
+# ==========================================
+def _inverter(matriz):
+    """Inversa por Gauss-Jordan com pivoteamento parcial."""
+    m = len(matriz)
+    aumentada = [list(linha) + [1.0 if i == j else 0.0 for j in range(m)]
+                 for i, linha in enumerate(matriz)]
+    for col in range(m):
+        piv = max(range(col, m), key=lambda r: abs(aumentada[r][col]))
+        aumentada[col], aumentada[piv] = aumentada[piv], aumentada[col]
+        fator = aumentada[col][col]
+        aumentada[col] = [v / fator for v in aumentada[col]]
+        for r in range(m):
+            if r != col and aumentada[r][col] != 0.0:
+                f = aumentada[r][col]
+                linha_piv = aumentada[col]
+                aumentada[r] = [v - f * p for v, p in zip(aumentada[r], linha_piv)]
+    return [linha[m:] for linha in aumentada]
+
+def resolver_lp(instancia, max_iter=2000, refatorar_a_cada=50, prazo=None):
+    """
+    Resolve a relaxação linear min sum(x_p) s.a. sum(a_p * x_p) >= d por geração
+    de colunas: simplex revisado sobre as m restrições de demanda, com o
+    subproblema de precificação resolvido como mochila limitada sobre os duais.
+    A base inicial são os padrões homogêneos (um tipo por barra), que já é viável.
+
+    Retorna (valor_lp, padroes, x): padrões básicos com x > 0, cada um como lista
+    de quantidades na ordem de instancia.tamanhos. O custo depende de m e de L,
+    não da demanda total. Passado o prazo (instante em time.time()), para na base
+    atual: a solução continua viável, mas o valor deixa de ser limite inferior.
+    """
+    capacidade = instancia.capacidade
+    pesos = list(instancia.tamanhos)
+    demandas = list(instancia.demandas)
+    m = len(pesos)
+    if m == 0:
+        return 0.0, [], []
+    limites = [min(d, capacidade // w) for w, d in zip(pesos, demandas)]
+
+    # colunas >= 0 são padrões; coluna -(i+1) é a folga (excesso) da restrição i
+    padroes = []
+    for i in range(m):
+        padrao = [0] * m
+        padrao[i] = max(1, limites[i])  # item maior que a barra: uma cópia por barra
+        padroes.append(padrao)
+    base = list(range(m))
+    b_inv = [[(1.0 / padroes[i][i] if i == j else 0.0) for j in range(m)] for i in range(m)]
+    x_base = [demandas[i] / padroes[i][i] for i in range(m)]
+
+    def coluna(indice):
+        if indice >= 0:
+            return padroes[indice]
+        col = [0] * m
+        col[-indice - 1] = -1
+        return col
+
+    pivots = 0
+    for _ in range(max_iter):
+        if prazo is not None and time.time() >= prazo:
+            break
+        custos = [1.0 if j >= 0 else 0.0 for j in base]
+        duais = [sum(custos[r] * b_inv[r][i] for r in range(m)) for i in range(m)]
+
+        # Coluna que entra: folga com custo reduzido negativo ou padrão com valor dual > 1
+        entra = None
+        for i in range(m):
+            if duais[i] < -EPS:
+                entra = -(i + 1)
+                break
+        if entra is None:
+            valor, quantidades = mochila_limitada(duais, pesos, limites, capacidade)
+            if valor > 1 + 1e-7:
+                padroes.append(quantidades)
+                entra = len(padroes) - 1
+        if entra is None:
+            break
+
+        col = coluna(entra)
+        direcao = [sum(b_inv[r][i] * col[i] for i in range(m) if col[i]) for r in range(m)]
+        sai = None
+        menor_razao = float('inf')
+        for r in range(m):
+            if direcao[r] > EPS:
+                razao = x_base[r] / direcao[r]
+                if razao < menor_razao - EPS:
+                    menor_razao = razao
+                    sai = r
+        if sai is None:
+            break  # ilimitado: não ocorre com demandas positivas
+
+        piv = direcao[sai]
+        b_inv[sai] = [v / piv for v in b_inv[sai]]
+        x_base[sai] /= piv
+        for r in range(m):
+            if r != sai and direcao[r] != 0.0:
+                f = direcao[r]
+                linha_piv = b_inv[sai]
+                b_inv[r] = [v - f * p for v, p in zip(b_inv[r], linha_piv)]
+                x_base[r] -= f * x_base[sai]
+        base[sai] = entra
+
+        pivots += 1
+        if pivots % refatorar_a_cada == 0 and (prazo is None or time.time() < prazo):
+            # Recalcula a inversa para conter o erro numérico acumulado
+            matriz_base = [[coluna(j)[i] for j in base] for i in range(m)]
+            b_inv = _inverter(matriz_base)
+            x_base = [sum(b_inv[r][i] * demandas[i] for i in range(m)) for r in range(m)]
+
+    valor_lp = sum(x for j, x in zip(base, x_base) if j >= 0)
+    basicos = [(padroes[j], x) for j, x in zip(base, x_base) if j >= 0 and x > EPS]
+    return valor_lp, [p for p, _ in basicos], [x for _, x in basicos]
+
+# ==========================================
+# 2. SOLUÇÃO INTEIRA POR ARREDONDAMENTO RESIDUAL
+# ==========================================
+def resolver_geracao_colunas(instancia, max_rodadas=10, tempo_limite=None):
+    """
+    Solver por padrões de corte. A cada rodada resolve o LP da demanda ainda não
+    atendida, corta floor(x_p) barras de cada padrão (limitando ao que falta de
+    cada tipo) e repete sobre o resíduo; o que sobra no fim vai para o FFD.
+    Com tempo_limite, uma rodada cujo LP não termina no prazo é descartada e o
+    FFD completa a solução a partir das rodadas já cortadas.
+    Retorna (barras, desperdicio, tempo) com barras {tamanho: quantidade}, como
+    o resolver_ffd_agregado.
+    """
+    inicio = time.time()
+    prazo = None if tempo_limite is None else inicio + tempo_limite
+    capacidade = instancia.capacidade
+    restantes = instancia.contagem()
+    barras = []
+
+    for _ in range(max_rodadas):
+        if not any(restantes.values()) or (prazo is not None and time.time() >= prazo):
+            break
+        residual = Instancia(capacidade, list(restantes), list(restantes.values()))
+        _, padroes, x = resolver_lp(residual, prazo=prazo)
+        if prazo is not None and time.time() >= prazo:
+            break  # LP interrompido: base ainda longe do ótimo, o resíduo vai para o FFD
+        cortou = False
+        for padrao, x_p in zip(padroes, x):
+            for _ in range(int(x_p + 1e-6)):
+                barra = {}
+                for tamanho, qtd in zip(residual.tamanhos, padrao):
+                    qtd = min(qtd, restantes[tamanho])
+                    if qtd > 0:
+                        barra[tamanho] = qtd
+                        restantes[tamanho] -= qtd
+                if not barra:
+                    break
+                barras.append(barra)
+                cortou = True
+        if not cortou:
+            break
+
+    if any(restantes.values()):
+        residual = Instancia(capacidade, list(restantes), list(restantes.values()))
+        barras_residuais, _, _ = resolver_ffd_agregado(residual)
+        barras.extend(barras_residuais)
+
+    tempo = time.time() - inicio
+    return barras, calcular_desperdicio_agregado(capacidade, barras), tempo
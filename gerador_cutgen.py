@@ -0,0 +1,140 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+from armazem_instancias import gravar_instancias
+from heuristicas_v3 import Instancia
+
+try:
+    import numpy as np
+except ImportError:  # sem NumPy o gerador usa random.Random, mais lento
+    np = None
+
+# ==========================================
+# 1. PARÂMETROS DO CUTGEN1 (Gau e Wäscher, 1995)
+# ==========================================
+# classe -> (m, v1, v2, demanda média), como em cutgen/README.txt; L = 1000
+CLASSES_CUTGEN = {
+    1: (10, 0.01, 0.2, 10), 2: (10, 0.01, 0.2, 100),
+    3: (20, 0.01, 0.2, 10), 4: (20, 0.01, 0.2, 100),
+    5: (40, 0.01, 0.2, 10), 6: (40, 0.01, 0.2, 100),
+    7: (10, 0.01, 0.8, 10), 8: (10, 0.01, 0.8, 100),
+    9: (20, 0.01, 0.8, 10), 10: (20, 0.01, 0.8, 100),
+    11: (40, 0.01, 0.8, 10), 12: (40, 0.01, 0.8, 100),
+    13: (10, 0.2, 0.8, 10), 14: (10, 0.2, 0.8, 100),
+    15: (20, 0.2, 0.8, 10), 16: (20, 0.2, 0.8, 100),
+    17: (40, 0.2, 0.8, 10), 18: (40, 0.2, 0.8, 100),
+}
+CAPACIDADE_CUTGEN = 1000
+
+# ==========================================
+# 2. GERAÇÃO
+# ==========================================
+# Para cada tipo i, com R uniforme em (0, 1):
+#   tamanho  l_i = floor((v1 + (v2 - v1) * R) * L + R)
+#   demanda  d_i = floor(R_i / sum(R) * D + 0.5), D = m * demanda média, e a
+#            última demanda fecha o total D (no mínimo 1)
+# Tamanhos repetidos são agregados pela Instancia, então m pode sair menor.
+
+def _demandas(pesos, total):
+    """Regra do CUTGEN1 para uma linha de pesos aleatórios."""
+    soma = sum(pesos)
+    demandas = [int(p / soma * total + 0.5) for p in pesos[:-1]]
+    demandas.append(max(1, total - sum(demandas)))
+    return demandas
+
+def gerar_cutgen(m, v1, v2, demanda_media, capacidade=CAPACIDADE_CUTGEN, semente=0, quantidade=1, prefixo='TEST'):
+    """
+    Gera `quantidade` instâncias CUTGEN1 com os parâmetros dados. Com NumPy as
+    matrizes quantidade x m de tamanhos e demandas saem de uma vez de
+    numpy.random.default_rng(semente); sem NumPy, de random.Random(semente). A
+    mesma semente reproduz o lote no mesmo modo, mas os dois modos geram
+    números diferentes. Retorna a lista de Instancias com nome prefixo + número.
+    """
+    total = m * demanda_media
+    if np is not None:
+        rng = np.random.default_rng(semente)
+        sorteio = rng.random((quantidade, m))
+        tamanhos = np.floor((v1 + (v2 - v1) * sorteio) * capacidade + sorteio).astype(np.int64)
+        tamanhos = np.clip(tamanhos, 1, capacidade)
+        pesos = rng.random((quantidade, m))
+        demandas = np.floor(pesos[:, :-1] / pesos.sum(axis=1, keepdims=True) * total + 0.5).astype(np.int64)
+        ultima = np.maximum(1, total - demandas.sum(axis=1, keepdims=True))
+        demandas = np.concatenate([demandas, ultima], axis=1)
+        return [Instancia(capacidade, tamanhos[k].tolist(), demandas[k].tolist(), nome=f"{prefixo}{k + 1}")
+                for k in range(quantidade)]
+
+    rng = random.Random(semente)
+    instancias = []
+    for k in range(quantidade):
+        tamanhos = []
+        for _ in range(m):
+            r = rng.random()
+            tamanhos.append(min(capacidade, max(1, int((v1 + (v2 - v1) * r) * capacidade + r))))
+        demandas = _demandas([rng.random() for _ in range(m)], total)
+        instancias.append(Instancia(capacidade, tamanhos, demandas, nome=f"{prefixo}{k + 1}"))
+    return instancias
+
+def gerar_classe(classe, quantidade=100, semente=0, **ajustes):
+    """Instâncias de uma das 18 classes; ajustes sobrescreve m, v1, v2 ou demanda_media."""
+    m, v1, v2, demanda_media = CLASSES_CUTGEN[classe]
+    parametros = {'m': m, 'v1': v1, 'v2': v2, 'demanda_media': demanda_media}
+    parametros.update(ajustes)
+    return gerar_cutgen(semente=semente, quantidade=quantidade, **parametros)
+
+# ==========================================
+# 3. SAÍDA
+# ==========================================
+def formatar_instancia(instancia):
+    """Texto no formato dos arquivos de cutgen/ (L=, m=, 'tamanho.00<TAB>demanda')."""
+    linhas = [f"L= {instancia.capacidade}", f"m= {instancia.num_tipos}"]
+    linhas.extend(f"{t}.00\t{d}" for t, d in instancia.tipos())
+    return '\n'.join(linhas) + '\n'
+
+def escrever_instancias(instancias, pasta):
+    """Um arquivo por instância em pasta/<nome>; retorna os caminhos."""
+    caminhos = []
+    for instancia in instancias:
+        caminho = os.path.join(pasta, instancia.nome)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(caminho, 'w') as f:
+            f.write(formatar_instancia(instancia))
+        caminhos.append(caminho)
+    return caminhos
+
+# ==========================================
+# MAIN
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gerador CUTGEN1 para testes de escala.")
+    parser.add_argument('destino', help="pasta dos arquivos de texto ou, com --armazem, o arquivo binário")
+    parser.add_argument('-c', '--classe', type=int, choices=sorted(CLASSES_CUTGEN), default=1)
+    parser.add_argument('-n', '--quantidade', type=int, default=100)
+    parser.add_argument('-m', '--tipos', type=int, default=None, help="sobrescreve o m da classe")
+    parser.add_argument('-d', '--demanda-media', type=int, default=None, help="sobrescreve a demanda média")
+    parser.add_argument('-s', '--semente', type=int, default=0)
+    parser.add_argument('--armazem', action='store_true', help="grava num armazém binário (armazem_instancias.py)")
+    args = parser.parse_args(argv)
+
+    ajustes = {}
+    if args.tipos:
+        ajustes['m'] = args.tipos
+    if args.demanda_media:
+        ajustes['demanda_media'] = args.demanda_media
+    inicio = time.perf_counter()
+    instancias = gerar_classe(args.classe, args.quantidade, args.semente, **ajustes)
+    for instancia in instancias:
+        instancia.nome = f"type{args.classe:02d}/{instancia.nome}"
+    gerado = time.perf_counter() - inicio
+    if args.armazem:
+        gravar_instancias(instancias, args.destino)
+    else:
+        escrever_instancias(instancias, args.destino)
+    print(f"{len(instancias)} instâncias (classe {args.classe}, semente {args.semente}) geradas em {gerado:.2f}s, "
+          f"gravadas em {time.perf_counter() - inicio - gerado:.2f}s -> {args.destino}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
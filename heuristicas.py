@@ -6,18 +6,19 @@ import os
 # ==========================================
 # 1. GERADOR DE DADOS (Simulando CUTGEN1)
 # ==========================================
-def gerar_arquivo_instancia(nome_arquivo, capacidade, num_tipos, min_tam, max_tam, max_demanda):
+def gerar_arquivo_instancia(nome_arquivo, capacidade, num_tipos, min_tam, max_tam, max_demanda, semente=None):
     """
-    Gera um arquivo de texto com dados aleatórios para teste.
+    Gera um arquivo de texto com dados aleatórios para teste (reprodutível se semente for dada).
     """
+    rng = random.Random(semente)
     with open(nome_arquivo, 'w') as f:
         f.write(f"L= {capacidade}\n")
         f.write(f"m= {num_tipos}\n")
         
         for _ in range(num_tipos):
             # Gera tamanho entre min e max (garantindo que cabe na barra)
-            tamanho = random.randint(min_tam, min(max_tam, capacidade))
-            demanda = random.randint(1, max_demanda)
+            tamanho = rng.randint(min_tam, min(max_tam, capacidade))
+            demanda = rng.randint(1, max_demanda)
             f.write(f"{tamanho} {demanda}\n")
     
     return nome_arquivo
@@ -74,8 +75,9 @@ def resolver_ffd(capacidade, itens):
     desperdicio = calcular_desperdicio(capacidade, barras)
     return barras, desperdicio, tempo
 
-def busca_local(capacidade, solucao_inicial, max_iter=1000):
+def busca_local(capacidade, solucao_inicial, max_iter=1000, semente=None):
     inicio = time.time()
+    rng = random.Random(semente)  # gerador próprio: não compartilha estado entre execuções
     melhor_solucao = copy.deepcopy(solucao_inicial)
     melhor_desperdicio = calcular_desperdicio(capacidade, melhor_solucao)
     
@@ -119,8 +121,8 @@ def busca_local(capacidade, solucao_inicial, max_iter=1000):
                 melhor_desperdicio = novo_desperdicio
         else:
             # TENTATIVA 2: TROCA ALEATÓRIA (SWAP) PARA SAIR DO ÓTIMO LOCAL
-            b1_idx = random.randint(0, len(solucao_atual)-1)
-            b2_idx = random.randint(0, len(solucao_atual)-1)
+            b1_idx = rng.randint(0, len(solucao_atual)-1)
+            b2_idx = rng.randint(0, len(solucao_atual)-1)
             
             if b1_idx != b2_idx and solucao_atual[b1_idx] and solucao_atual[b2_idx]:
                 item1 = solucao_atual[b1_idx].pop()
@@ -148,6 +150,8 @@ def busca_local(capacidade, solucao_inicial, max_iter=1000):
 # ==========================================
 # 4. FUNÇÕES DE EXECUÇÃO
 # ==========================================
+SEMENTE_PADRAO = 0  # registrada na saída para que as execuções possam ser repetidas
+
 def imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib):
     print(f"{nome:<25} | {'FFD':<10} | {len(res_ffd):<6} | {desp_ffd:<12} | {tempo_ffd:.4f}")
     
@@ -161,7 +165,8 @@ def imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib,
     print("-" * 70)
 
 def rodar_automatizado():
-    print("\n>>> INICIANDO BATERIA DE 10 TESTES AUTOMATIZADOS <<<\n")
+    print("\n>>> INICIANDO BATERIA DE 10 TESTES AUTOMATIZADOS <<<")
+    print(f"Semente: {SEMENTE_PADRAO}\n")
     print(f"{'Instância':<25} | {'Método':<10} | {'Barras':<6} | {'Desperdício':<12} | {'Tempo(s)':<10}")
     print("-" * 70)
 
@@ -179,13 +184,15 @@ def rodar_automatizado():
         ("Teste_10", 1500, 25, 200, 1200, 4)
     ]
 
-    for nome, cap, tipos, min_t, max_t, max_d in configuracoes:
-        arquivo = gerar_arquivo_instancia(f"{nome}.txt", cap, tipos, min_t, max_t, max_d)
+    for i, (nome, cap, tipos, min_t, max_t, max_d) in enumerate(configuracoes):
+        # uma semente por arquivo, derivada da padrão: mesmos Teste_XX a cada execução
+        arquivo = gerar_arquivo_instancia(f"{nome}.txt", cap, tipos, min_t, max_t, max_d,
+                                          semente=SEMENTE_PADRAO + i)
         cap_lida, itens = ler_instancia(arquivo)
         
         # Executa
         res_ffd, desp_ffd, tempo_ffd = resolver_ffd(cap_lida, itens)
-        res_hib, desp_hib, tempo_hib = busca_local(cap_lida, res_ffd)
+        res_hib, desp_hib, tempo_hib = busca_local(cap_lida, res_ffd, semente=SEMENTE_PADRAO)
         
         imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib)
 
@@ -198,13 +205,13 @@ def rodar_arquivo_unico():
         return
 
     print(f"\nProcessando arquivo: {nome_arquivo}...")
-    print(f"Capacidade: {cap_lida} | Total de Itens: {len(itens)}")
+    print(f"Capacidade: {cap_lida} | Total de Itens: {len(itens)} | Semente: {SEMENTE_PADRAO}")
     print("-" * 70)
     print(f"{'Instância':<25} | {'Método':<10} | {'Barras':<6} | {'Desperdício':<12} | {'Tempo(s)':<10}")
     print("-" * 70)
 
     res_ffd, desp_ffd, tempo_ffd = resolver_ffd(cap_lida, itens)
-    res_hib, desp_hib, tempo_hib = busca_local(cap_lida, res_ffd)
+    res_hib, desp_hib, tempo_hib = busca_local(cap_lida, res_ffd, semente=SEMENTE_PADRAO)
     
     imprimir_linha_tabela(nome_arquivo, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib)
 
@@ -1,23 +1,26 @@
 import time
 import random
-import copy
 import os
 
+from limites import calcular_limite_inferior, contagem_de_barras
+from solucao import SolucaoIncremental
+
 # ==========================================
 # 1. GERADOR DE DADOS (Simulando CUTGEN1)
 # ==========================================
-def gerar_arquivo_instancia(nome_arquivo, capacidade, num_tipos, min_tam, max_tam, max_demanda):
+def gerar_arquivo_instancia(nome_arquivo, capacidade, num_tipos, min_tam, max_tam, max_demanda, semente=None):
     """
-    Gera um arquivo de texto com dados aleatórios para teste.
+    Gera um arquivo de texto com dados aleatórios para teste (reprodutível se semente for dada).
     """
+    rng = random.Random(semente)
     with open(nome_arquivo, 'w') as f:
         f.write(f"L= {capacidade}\n")
         f.write(f"m= {num_tipos}\n")
         
         for _ in range(num_tipos):
             # Gera tamanho entre min e max (garantindo que cabe na barra)
-            tamanho = random.randint(min_tam, min(max_tam, capacidade))
-            demanda = random.randint(1, max_demanda)
+            tamanho = rng.randint(min_tam, min(max_tam, capacidade))
+            demanda = rng.randint(1, max_demanda)
             f.write(f"{tamanho} {demanda}\n")
     
     return nome_arquivo
@@ -77,242 +80,216 @@ def resolver_ffd(capacidade, itens):
     return barras, desperdicio, tempo
 
 
-def busca_local(capacidade, solucao_inicial, max_iter=1000):
+def busca_local(capacidade, solucao_inicial, max_iter=1000, limite_inferior=None, semente=None, tempo_limite=None):
     """
     Iterated Local Search (ILS) para 1DCSP.
     - capacidade: capacidade da barra
     - solucao_inicial: lista de barras (cada barra é lista de itens)
     - max_iter: número máximo de iterações ILS (controle global)
+    - limite_inferior: para quando a melhor solução atinge esse número de barras
+      (padrão: maior entre L1 e L2 calculados dos itens)
+    - semente: semente do gerador aleatório desta execução (None = entropia do sistema)
+    - tempo_limite: segundos até parar e devolver a melhor solução (None = sem prazo)
     Retorna: (melhor_solucao, melhor_desperdicio, tempo_exec)
+
+    Os movimentos são aplicados direto numa SolucaoIncremental e desfeitos pelo
+    diário quando não melhoram; a melhor solução só é copiada quando melhora.
     """
     inicio_total = time.time()
-    random.seed()  # comportamento estocástico
+    prazo = None if tempo_limite is None else inicio_total + tempo_limite
+    rng = random.Random(semente)  # gerador próprio: não compartilha estado entre execuções
     
     # parâmetros internos
     max_iter_ls = 200       # iterações máximas da busca local interna por chamada
-    max_no_improve_ls = 20  # critério de parada rápido da busca local
     perturb_k = 2           # número de itens a perturbar na etapa de shake
     max_iter_ils = max_iter if max_iter > 0 else 100
 
-    def custo(sol):
-        return calcular_desperdicio(capacidade, sol)
+    def custo(estado):
+        return estado.desperdicio
+
+    def esgotado():
+        return prazo is not None and time.time() >= prazo
 
-    # funções auxiliares (operam em cópias)
-    def eliminar_barra(sol):
+    # funções auxiliares (aplicam o movimento e desfazem se não melhorar)
+    def eliminar_barra(estado):
         """
-        Tenta eliminar uma barra testando realocações em cópia.
-        Retorna nova solução se alguma barra puder ser eliminada (primeira que der certo),
-        caso contrário retorna sol (inalterada).
+        Tenta eliminar uma barra realocando seus itens nas demais.
+        Retorna True na primeira barra eliminada; caso contrário desfaz tudo e retorna False.
         """
+        ativos = estado.indices_ativos()
         # ordenar barras por preenchimento crescente (tentar eliminar as menos cheias primeiro)
-        indices = sorted(range(len(sol)), key=lambda i: sum(sol[i]))
+        indices = sorted(ativos, key=lambda i: estado.cargas[i])
         for idx in indices:
-            barra = sol[idx]
-            # T: cópia das outras barras
-            T = [copy.deepcopy(sol[i]) for i in range(len(sol)) if i != idx]
-            sucesso = True
+            ponto = estado.ponto()
             # Ordem dos itens: pode usar ordem decrescente para facilitar encaixe
-            itens = sorted(barra, reverse=True)
+            itens = sorted(estado.barras[idx], reverse=True)
+            while estado.barras[idx]:
+                estado.remover(idx, len(estado.barras[idx]) - 1)
+            outras = [i for i in ativos if i != idx]
+            sucesso = True
             for item in itens:
-                encaixou = False
                 # tentar nas barras mais cheias primeiro (best-fit like)
-                T.sort(key=lambda b: sum(b), reverse=True)
-                for destino in T:
-                    if sum(destino) + item <= capacidade:
-                        destino.append(item)
-                        encaixou = True
-                        break
-                if not encaixou:
+                destino = None
+                for i in outras:
+                    if estado.cargas[i] + item <= capacidade and \
+                       (destino is None or estado.cargas[i] > estado.cargas[destino]):
+                        destino = i
+                if destino is None:
                     sucesso = False
                     break
+                estado.inserir(destino, item)
             if sucesso:
-                # retornamos T (barra eliminada)
-                return T
-        return sol
+                return True
+            estado.desfazer(ponto)
+        return False
 
-    def realocar_item(sol):
+    def realocar_item(estado):
         """
         One-item move: tenta mover um item de uma barra para outra se melhora custo.
-        Retorna nova solução se encontrar movimento melhorante; caso contrário sol.
+        Retorna True se aplicou um movimento melhorante.
         """
-        # iterar itens em barras (preferir itens grandes primeiro)
-        # construir lista (barra_idx, item) ordenada por item descendente
+        # construir lista (barra_idx, posição, item) ordenada por item descendente,
+        # com uma barra por classe de barras iguais e uma cópia por tamanho
+        ativos = estado.indices_ativos()
         items_list = []
-        for b_idx, barra in enumerate(sol):
-            for item in barra:
-                items_list.append((b_idx, item))
-        # ordenar por tamanho decrescente
-        items_list.sort(key=lambda x: x[1], reverse=True)
-        for (b_idx, item) in items_list:
-            for dest_idx in range(len(sol)):
-                if dest_idx == b_idx:
+        for b_idx in estado.representantes(ativos):
+            for item, pos in estado.primeiras_posicoes(b_idx).items():
+                items_list.append((b_idx, pos, item))
+        items_list.sort(key=lambda x: x[2], reverse=True)
+        custo_atual = custo(estado)
+        for (b_idx, pos, item) in items_list:
+            cargas_testadas = set()  # destinos com a mesma carga dão o mesmo custo
+            for dest_idx in ativos:
+                if dest_idx == b_idx or estado.cargas[dest_idx] in cargas_testadas:
                     continue
-                if sum(sol[dest_idx]) + item <= capacidade:
-                    T = [copy.deepcopy(s) for s in sol]
-                    # remover item da origem (remove apenas uma ocorrência)
-                    try:
-                        T[b_idx].remove(item)
-                    except ValueError:
-                        continue  # item não está lá na cópia (pouco provável), pular
-                    T[dest_idx].append(item)
-                    # se barra origem ficou vazia, eliminá-la da solução
-                    T = [b for b in T if b]  
-                    if custo(T) < custo(sol):
-                        return T
-        return sol
-
-    def swap_itens(sol):
+                cargas_testadas.add(estado.cargas[dest_idx])
+                if estado.cargas[dest_idx] + item <= capacidade:
+                    ponto = estado.ponto()
+                    estado.mover(b_idx, pos, dest_idx)
+                    if custo(estado) < custo_atual:
+                        return True
+                    estado.desfazer(ponto)
+        return False
+
+    def swap_itens(estado):
         """
         Swap inteligente: testa troca entre pares de itens de barras distintas.
-        Retorna solução melhorante se encontrada.
+        Retorna True se aplicou uma troca melhorante.
         """
-        # percorrer pares de barras
-        n = len(sol)
         # ordenar barras por soma para heurística (opcional)
-        order = list(range(n))
-        order.sort(key=lambda i: sum(sol[i]), reverse=True)
+        order = sorted(estado.indices_ativos(), key=lambda i: estado.cargas[i], reverse=True)
+        n = len(order)
+        custo_atual = custo(estado)
+        # Trocas entre barras das mesmas classes (barras iguais) e entre cópias dos
+        # mesmos tamanhos dão a mesma solução: cada par só é testado na primeira vez
+        classe = {b: tuple(sorted(estado.barras[b])) for b in order}
+        pares_testados = set()
         for i_idx in range(n):
             for j_idx in range(i_idx+1, n):
                 b1 = order[i_idx]
                 b2 = order[j_idx]
+                par = (classe[b1], classe[b2]) if classe[b1] <= classe[b2] else (classe[b2], classe[b1])
+                if par in pares_testados:
+                    continue
+                pares_testados.add(par)
                 # testar swaps entre items das barras b1 e b2
-                for item1 in sol[b1]:
-                    for item2 in sol[b2]:
-                        new_sum_b1 = sum(sol[b1]) - item1 + item2
-                        new_sum_b2 = sum(sol[b2]) - item2 + item1
+                for item1, pos1 in estado.primeiras_posicoes(b1).items():
+                    for item2, pos2 in estado.primeiras_posicoes(b2).items():
+                        if item1 == item2:
+                            continue
+                        new_sum_b1 = estado.cargas[b1] - item1 + item2
+                        new_sum_b2 = estado.cargas[b2] - item2 + item1
                         if new_sum_b1 <= capacidade and new_sum_b2 <= capacidade:
-                            T = [copy.deepcopy(s) for s in sol]
-                            # efetuar troca
-                            try:
-                                T[b1].remove(item1)
-                                T[b2].remove(item2)
-                            except ValueError:
-                                continue
-                            T[b1].append(item2)
-                            T[b2].append(item1)
-                            # remover barras vazias
-                            T = [b for b in T if b]
-                            if custo(T) < custo(sol):
-                                return T
-        return sol
-
-    def busca_local_interna(sol):
+                            ponto = estado.ponto()
+                            estado.trocar(b1, pos1, b2, pos2)
+                            if custo(estado) < custo_atual:
+                                return True
+                            estado.desfazer(ponto)
+        return False
+
+    def busca_local_interna(estado):
         """
         Aplica iterativamente eliminar_barra, realocar_item e swap_itens até não melhorar.
-        Usa limite de iterações max_iter_ls.
+        Usa limite de iterações max_iter_ls. As vizinhanças são determinísticas,
+        então uma rodada sem melhoria encerra a busca.
         """
-        S = [copy.deepcopy(b) for b in sol]
-        best = [copy.deepcopy(b) for b in S]
-        best_cost = custo(best)
-        no_improve = 0
         iter_ls = 0
-        while iter_ls < max_iter_ls and no_improve < max_no_improve_ls:
-            improved = False
-            # 1) tentar eliminar barra
-            S1 = eliminar_barra(S)
-            if S1 is not S and custo(S1) < best_cost:
-                S = [copy.deepcopy(b) for b in S1]
-                best = [copy.deepcopy(b) for b in S]
-                best_cost = custo(best)
-                improved = True
-                no_improve = 0
-                iter_ls += 1
-                continue
-
-            # 2) one-item move
-            S2 = realocar_item(S)
-            if S2 is not S and custo(S2) < best_cost:
-                S = [copy.deepcopy(b) for b in S2]
-                best = [copy.deepcopy(b) for b in S]
-                best_cost = custo(best)
-                improved = True
-                no_improve = 0
-                iter_ls += 1
-                continue
-
-            # 3) swap itens
-            S3 = swap_itens(S)
-            if S3 is not S and custo(S3) < best_cost:
-                S = [copy.deepcopy(b) for b in S3]
-                best = [copy.deepcopy(b) for b in S]
-                best_cost = custo(best)
-                improved = True
-                no_improve = 0
-                iter_ls += 1
-                continue
-
-            # se chegou aqui, não houve melhoria nesta iteração
-            if not improved:
-                no_improve += 1
+        while iter_ls < max_iter_ls and not esgotado():
+            if not (eliminar_barra(estado) or realocar_item(estado) or swap_itens(estado)):
+                break
             iter_ls += 1
 
-        return best
-
-    def perturbar(sol, k=perturb_k):
+    def perturbar(estado, k=perturb_k):
         """
         Perturba solução removendo k itens aleatórios e reinserindo-os via FFD (first-fit decrescente).
         """
-        T = [copy.deepcopy(b) for b in sol]
-        all_items = []
-        for b in T:
-            all_items.extend(b)
-        if not all_items:
-            return T
-        # escolher k itens distintos
-        k = min(k, len(all_items))
-        itens_escolhidos = random.sample(all_items, k)
-        # remover as ocorrências selecionadas (uma por item escolhido)
-        for item in itens_escolhidos:
-            removed = False
-            for b in T:
-                if item in b:
-                    b.remove(item)
-                    removed = True
-                    break
-            # remover barras vazias
-            T = [b for b in T if b]
+        total_itens = sum(len(b) for b in estado.barras)
+        if total_itens == 0:
+            return
+        # escolher k posições distintas e localizar (barra, posição) de cada uma
+        k = min(k, total_itens)
+        escolhidos = sorted(rng.sample(range(total_itens), k))
+        posicoes = []
+        inicio_barra = 0
+        for b_idx, barra in enumerate(estado.barras):
+            while escolhidos and escolhidos[0] < inicio_barra + len(barra):
+                posicoes.append((b_idx, escolhidos.pop(0) - inicio_barra))
+            inicio_barra += len(barra)
+        # remover de trás para frente para não deslocar as posições ainda não removidas
+        itens_escolhidos = [estado.remover(b_idx, pos) for b_idx, pos in reversed(posicoes)]
         # reinsere os itens por ordem decrescente (FFD)
         itens_escolhidos.sort(reverse=True)
         for item in itens_escolhidos:
             placed = False
             # tentar first-fit
-            for b in T:
-                if sum(b) + item <= capacidade:
-                    b.append(item)
+            for b_idx, barra in enumerate(estado.barras):
+                if barra and estado.cargas[b_idx] + item <= capacidade:
+                    estado.inserir(b_idx, item)
                     placed = True
                     break
             if not placed:
-                T.append([item])
-        return T
+                estado.abrir_barra(item)
 
     # --- início do ILS ---
-    S0 = [copy.deepcopy(b) for b in solucao_inicial]
-    # garantir consistência (remover barras vazias)
-    S0 = [b for b in S0 if b]
-    S0 = busca_local_interna(S0)
-    best_solution = [copy.deepcopy(b) for b in S0]
-    best_cost = custo(best_solution)
-
-    current = [copy.deepcopy(b) for b in S0]
+    # SolucaoIncremental já descarta barras vazias
+    estado = SolucaoIncremental(capacidade, solucao_inicial)
+    if limite_inferior is None:
+        limite_inferior = calcular_limite_inferior(capacidade, contagem_de_barras(estado.barras))
+    if estado.num_barras > limite_inferior:
+        busca_local_interna(estado)
+    estado.confirmar()
+    best_solution = estado.para_listas()
+    best_cost = custo(estado)
+
+    current_cost = best_cost
+    current_is_best = True
 
     iter_ils = 0
-    while iter_ils < max_iter_ils:
-        # perturba
-        shaken = perturbar(current)
-        # local search intensification
-        shaken = busca_local_interna(shaken)
-        shaken_cost = custo(shaken)
+    while iter_ils < max_iter_ils and len(best_solution) > limite_inferior and not esgotado():
+        # perturba e intensifica sobre o estado atual (o diário guarda o caminho de volta)
+        perturbar(estado)
+        busca_local_interna(estado)
+        shaken_cost = custo(estado)
 
         # atualizar melhor global
-        if shaken_cost < best_cost:
-            best_solution = [copy.deepcopy(b) for b in shaken]
+        new_best = shaken_cost < best_cost
+        if new_best:
+            best_solution = estado.para_listas()
             best_cost = shaken_cost
 
         # critério de aceitação simples: aceitar se melhor ou igual, senão aceitar com pequena probabilidade
-        if shaken_cost <= custo(current) or random.random() < 0.01:
-            current = [copy.deepcopy(b) for b in shaken]
+        if shaken_cost <= current_cost or rng.random() < 0.01:
+            estado.confirmar()
+            current_cost = shaken_cost
+            current_is_best = new_best
         else:
-            current = [copy.deepcopy(b) for b in best_solution]
+            # volta para a melhor solução
+            if current_is_best:
+                estado.desfazer()
+            else:
+                estado = SolucaoIncremental(capacidade, best_solution)
+                current_is_best = True
+            current_cost = best_cost
 
         iter_ils += 1
 
@@ -323,6 +300,8 @@ def busca_local(capacidade, solucao_inicial, max_iter=1000):
 # ==========================================
 # 4. FUNÇÕES DE EXECUÇÃO
 # ==========================================
+SEMENTE_PADRAO = 0  # registrada na saída para que as execuções possam ser repetidas
+
 def imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib):
     print(f"{nome:<25} | {'FFD':<10} | {len(res_ffd):<6} | {desp_ffd:<12} | {tempo_ffd:.4f}")
     
@@ -336,7 +315,8 @@ def imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib,
     print("-" * 70)
 
 def rodar_automatizado():
-    print("\n>>> INICIANDO BATERIA DE 10 TESTES AUTOMATIZADOS <<<\n")
+    print("\n>>> INICIANDO BATERIA DE 10 TESTES AUTOMATIZADOS <<<")
+    print(f"Semente: {SEMENTE_PADRAO}\n")
     print(f"{'Instância':<25} | {'Método':<10} | {'Barras':<6} | {'Desperdício':<12} | {'Tempo(s)':<10}")
     print("-" * 70)
 
@@ -354,13 +334,15 @@ def rodar_automatizado():
         ("Teste_10", 1500, 25, 200, 1200, 4)
     ]
 
-    for nome, cap, tipos, min_t, max_t, max_d in configuracoes:
-        arquivo = gerar_arquivo_instancia(f"{nome}.txt", cap, tipos, min_t, max_t, max_d)
+    for i, (nome, cap, tipos, min_t, max_t, max_d) in enumerate(configuracoes):
+        # uma semente por arquivo, derivada da padrão: mesmos Teste_XX a cada execução
+        arquivo = gerar_arquivo_instancia(f"{nome}.txt", cap, tipos, min_t, max_t, max_d,
+                                          semente=SEMENTE_PADRAO + i)
         cap_lida, itens = ler_instancia(arquivo)
         
         # Executa
         res_ffd, desp_ffd, tempo_ffd = resolver_ffd(cap_lida, itens)
-        res_hib, desp_hib, tempo_hib = busca_local(cap_lida, res_ffd)
+        res_hib, desp_hib, tempo_hib = busca_local(cap_lida, res_ffd, semente=SEMENTE_PADRAO)
         
         imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib)
 
@@ -373,13 +355,13 @@ def rodar_arquivo_unico():
         return
 
     print(f"\nProcessando arquivo: {nome_arquivo}...")
-    print(f"Capacidade: {cap_lida} | Total de Itens: {len(itens)}")
+    print(f"Capacidade: {cap_lida} | Total de Itens: {len(itens)} | Semente: {SEMENTE_PADRAO}")
     print("-" * 70)
     print(f"{'Instância':<25} | {'Método':<10} | {'Barras':<6} | {'Desperdício':<12} | {'Tempo(s)':<10}")
     print("-" * 70)
 
     res_ffd, desp_ffd, tempo_ffd = resolver_ffd(cap_lida, itens)
-    res_hib, desp_hib, tempo_hib = busca_local(cap_lida, res_ffd)
+    res_hib, desp_hib, tempo_hib = busca_local(cap_lida, res_ffd, semente=SEMENTE_PADRAO)
     
     imprimir_linha_tabela(nome_arquivo, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib)
 
@@ -1,20 +1,33 @@
 import time
 import random
-import copy
+import heapq
 import os
+from array import array
+from bisect import bisect_right
+from itertools import chain
+
+from limites import calcular_gap, calcular_limite_inferior, contagem_de_barras
+from mochila import enchimento_maximo
+from solucao import SolucaoIncremental
+
+try:
+    import numpy as np
+except ImportError:  # a avaliação vetorizada é opcional
+    np = None
 
 # ==========================================
 # 1. GERADOR DE DADOS (Simulando CUTGEN1)
 # ==========================================
-def gerar_arquivo_instancia(nome_arquivo, capacidade, num_tipos, min_tam, max_tam, max_demanda):
-    """Gera um arquivo de texto com dados aleatórios para teste."""
+def gerar_arquivo_instancia(nome_arquivo, capacidade, num_tipos, min_tam, max_tam, max_demanda, semente=None):
+    """Gera um arquivo de texto com dados aleatórios para teste (reprodutível se semente for dada)."""
+    rng = random.Random(semente)
     with open(nome_arquivo, 'w') as f:
         f.write(f"L= {capacidade}\n")
         f.write(f"m= {num_tipos}\n")
         
         for _ in range(num_tipos):
-            tamanho = random.randint(min_tam, min(max_tam, capacidade))
-            demanda = random.randint(1, max_demanda)
+            tamanho = rng.randint(min_tam, min(max_tam, capacidade))
+            demanda = rng.randint(1, max_demanda)
             f.write(f"{tamanho} {demanda}\n")
     
     return nome_arquivo
@@ -22,24 +35,106 @@ def gerar_arquivo_instancia(nome_arquivo, capacidade, num_tipos, min_tam, max_ta
 # ==========================================
 # 2. LEITURA E ESTRUTURAS
 # ==========================================
-def ler_instancia(caminho_arquivo):
-    itens_expandidos = []
-    capacidade_barra = 0
+class Instancia:
+    """
+    Instância agregada do 1DCSP: um par (tamanho, demanda) por tipo distinto de item.
+    Tamanhos repetidos no arquivo são somados e os tipos ficam em ordem decrescente
+    de tamanho, de modo que memória e laços escalam com m, não com a demanda total.
+    """
+
+    def __init__(self, capacidade, tamanhos, demandas, nome=""):
+        agregado = {}
+        for tamanho, demanda in zip(tamanhos, demandas):
+            if demanda > 0:
+                agregado[tamanho] = agregado.get(tamanho, 0) + demanda
+        ordenados = sorted(agregado.items(), reverse=True)
+        self.capacidade = capacidade
+        self.nome = nome
+        self.tamanhos = array('q', (t for t, _ in ordenados))
+        self.demandas = array('q', (d for _, d in ordenados))
+
+    @classmethod
+    def de_itens(cls, capacidade, itens, nome=""):
+        """Constrói a instância a partir de uma lista expandida de itens."""
+        contagem = {}
+        for item in itens:
+            contagem[item] = contagem.get(item, 0) + 1
+        return cls(capacidade, list(contagem), list(contagem.values()), nome)
+
+    @classmethod
+    def de_vetores(cls, capacidade, tamanhos, demandas, nome=""):
+        """
+        Usa os vetores como estão, sem copiar nem reagregar (ex.: fatias de um
+        memoryview do armazém de instâncias). Devem estar agregados e em ordem
+        decrescente de tamanho.
+        """
+        instancia = cls.__new__(cls)
+        instancia.capacidade = capacidade
+        instancia.nome = nome
+        instancia.tamanhos = tamanhos
+        instancia.demandas = demandas
+        return instancia
+
+    def __reduce__(self):
+        # Vetores vindos do armazém são fatias de memoryview, que não vão para
+        # outro processo: o pickle leva cópias em array('q')
+        return (type(self).de_vetores, (self.capacidade, array('q', self.tamanhos),
+                                        array('q', self.demandas), self.nome))
+
+    @property
+    def num_tipos(self):
+        return len(self.tamanhos)
+
+    @property
+    def total_itens(self):
+        return sum(self.demandas)
+
+    def soma_tamanhos(self):
+        return sum(t * d for t, d in zip(self.tamanhos, self.demandas))
+
+    def tipos(self):
+        """Itera sobre os pares (tamanho, demanda), maiores primeiro."""
+        return zip(self.tamanhos, self.demandas)
+
+    def contagem(self):
+        """Retorna {tamanho: demanda}."""
+        return dict(self.tipos())
+
+    def itens_expandidos(self):
+        """Lista com uma entrada por unidade (formato antigo de ler_instancia)."""
+        itens = []
+        for tamanho, demanda in self.tipos():
+            itens.extend([tamanho] * demanda)
+        return itens
+
+def ler_instancia_agregada(caminho_arquivo):
+    """Lê um arquivo CUTGEN/fiber e retorna uma Instancia (ou None se não existir)."""
     try:
         with open(caminho_arquivo, 'r') as f:
-            linhas = f.readlines()
-            capacidade_barra = int(linhas[0].split()[1])
-            num_tipos = int(linhas[1].split()[1])
-            for i in range(2, num_tipos + 2):
-                dados = linhas[i].split()
-                if len(dados) >= 2:
-                    tamanho = int(float(dados[0]))
-                    demanda = int(dados[1])
-                    for _ in range(demanda):
-                        itens_expandidos.append(tamanho)
-        return capacidade_barra, itens_expandidos
+            return ler_instancia_texto(f.read(), nome=caminho_arquivo)
     except FileNotFoundError:
+        return None
+
+def ler_instancia_texto(texto, nome=""):
+    """Mesmo formato do arquivo (L=, m=, linhas 'tamanho demanda'), já em memória."""
+    tamanhos = []
+    demandas = []
+    linhas = texto.splitlines()
+    capacidade_barra = int(linhas[0].split()[1])
+    num_tipos = int(linhas[1].split()[1])
+    for i in range(2, num_tipos + 2):
+        dados = linhas[i].split()
+        if len(dados) >= 2:
+            tamanhos.append(int(float(dados[0])))
+            demandas.append(int(dados[1]))
+    return Instancia(capacidade_barra, tamanhos, demandas, nome=nome)
+
+def ler_instancia(caminho_arquivo):
+    """Compatibilidade: retorna (capacidade, itens expandidos)."""
+    instancia = ler_instancia_agregada(caminho_arquivo)
+    if instancia is None:
         return None, None
+    return instancia.capacidade, instancia.itens_expandidos()
 
 def calcular_desperdicio(capacidade, barras):
     return sum(capacidade - sum(barra) for barra in barras)
@@ -48,263 +143,720 @@ def calcular_utilizacao(capacidade, barra):
     """Retorna a utilização percentual da barra"""
     return sum(barra) / capacidade if barra else 0
 
+# Barras agregadas: {tamanho: quantidade} em vez de uma lista com cada item
+def carga_barra_agregada(barra):
+    return sum(tamanho * qtd for tamanho, qtd in barra.items())
+
+def calcular_desperdicio_agregado(capacidade, barras):
+    return sum(capacidade - carga_barra_agregada(barra) for barra in barras)
+
+def agregar_barras(barras):
+    """Converte listas de itens em barras {tamanho: quantidade}."""
+    agregadas = []
+    for barra in barras:
+        contagem = {}
+        for item in barra:
+            contagem[item] = contagem.get(item, 0) + 1
+        agregadas.append(contagem)
+    return agregadas
+
+def expandir_barras(barras):
+    """Converte barras {tamanho: quantidade} de volta para listas de itens."""
+    return [[tamanho for tamanho in sorted(barra, reverse=True) for _ in range(barra[tamanho])]
+            for barra in barras]
+
 # ==========================================
 # 3. ALGORITMOS BASE
 # ==========================================
+class ArvoreResidual:
+    """
+    Árvore de segmentos de máximo sobre a folga (capacidade residual) das barras.
+    Folhas ainda não usadas valem a capacidade cheia, então a primeira folha com
+    folga suficiente é a barra aberta do First-Fit ou, se nenhuma servir, a
+    próxima barra a ser aberta. Consulta e atualização custam O(log B).
+    """
+
+    def __init__(self, capacidade, max_barras):
+        tam = 1
+        while tam < max(1, max_barras):
+            tam *= 2
+        self.tam = tam
+        self.arvore = [capacidade] * (2 * tam)
+
+    def folga(self, idx):
+        return self.arvore[idx + self.tam]
+
+    def atualizar(self, idx, folga):
+        arvore = self.arvore
+        pos = idx + self.tam
+        arvore[pos] = folga
+        pos //= 2
+        while pos:
+            esq = arvore[2 * pos]
+            dir = arvore[2 * pos + 1]
+            arvore[pos] = esq if esq >= dir else dir
+            pos //= 2
+
+    def primeira_com_folga(self, item):
+        """Índice da primeira barra com folga >= item, ou -1 se nenhuma comporta o item."""
+        arvore = self.arvore
+        if arvore[1] < item:
+            return -1
+        pos = 1
+        while pos < self.tam:
+            pos *= 2
+            if arvore[pos] < item:
+                pos += 1
+        return pos - self.tam
+
 def resolver_ffd(capacidade, itens):
+    """First-Fit Decreasing em O(n log n) usando ArvoreResidual (o tempo inclui a ordenação)."""
+    inicio = time.time()
+    barras, desperdicio, _ = resolver_first_fit(capacidade, sorted(itens, reverse=True))
+    return barras, desperdicio, time.time() - inicio
+
+def resolver_ffd_aleatorio(capacidade, itens, rng, ruido=0.1):
+    """
+    FFD com a ordem embaralhada localmente: cada item é ordenado por
+    tamanho * (1 + U(-ruido, ruido)), então itens de tamanhos próximos trocam de
+    posição e cada semente gera uma solução inicial diferente, ainda boa.
+    """
+    inicio = time.time()
+    chaves = [(item * (1 + rng.uniform(-ruido, ruido)), item) for item in itens]
+    chaves.sort(reverse=True)
+    barras, desperdicio, _ = resolver_first_fit(capacidade, [item for _, item in chaves])
+    return barras, desperdicio, time.time() - inicio
+
+def resolver_first_fit(capacidade, itens_ordenados):
+    """First-Fit na ordem dada, com a ArvoreResidual achando a primeira barra com folga."""
     inicio = time.time()
-    itens_ordenados = sorted(itens, reverse=True)
     barras = []
+    arvore = ArvoreResidual(capacidade, len(itens_ordenados))
     
     for item in itens_ordenados:
-        alocado = False
-        for barra in barras:
-            if sum(barra) + item <= capacidade:
-                barra.append(item)
-                alocado = True
-                break
-        if not alocado:
-            barras.append([item])
+        idx = arvore.primeira_com_folga(item)
+        if idx < 0 or idx == len(barras):
+            # Nenhuma barra aberta serve: abre a próxima (itens maiores que a barra também caem aqui)
+            idx = len(barras)
+            barras.append([])
+        barras[idx].append(item)
+        arvore.atualizar(idx, arvore.folga(idx) - item)
             
     tempo = time.time() - inicio
     desperdicio = calcular_desperdicio(capacidade, barras)
     return barras, desperdicio, tempo
 
+def resolver_bfd(capacidade, itens):
+    """
+    Best-Fit Decreasing: cada item vai para a barra aberta de menor folga que o comporta;
+    empates vão para a barra aberta há mais tempo. Uma ArvoreResidual indexada pela
+    folga (folha f vale f se alguma barra tem folga f, senão -1) acha a menor folga
+    >= item, e um heap por folga guarda os índices das barras. Custa O(n log C),
+    com memória O(C) na capacidade.
+    """
+    inicio = time.time()
+    itens_ordenados = sorted(itens, reverse=True)
+    barras = []
+    arvore = ArvoreResidual(-1, capacidade + 1)
+    por_folga = {}  # folga -> heap de índices de barras
+
+    for item in itens_ordenados:
+        folga = arvore.primeira_com_folga(item)
+        if 0 <= folga <= capacidade:
+            indices = por_folga[folga]
+            idx = heapq.heappop(indices)
+            if not indices:
+                del por_folga[folga]
+                arvore.atualizar(folga, -1)
+        else:
+            # Nenhuma barra serve (itens maiores que a barra também caem aqui)
+            folga, idx = capacidade, len(barras)
+            barras.append([])
+        barras[idx].append(item)
+        folga -= item
+        if folga >= 0:
+            if folga not in por_folga:
+                por_folga[folga] = []
+                arvore.atualizar(folga, folga)
+            heapq.heappush(por_folga[folga], idx)
+
+    tempo = time.time() - inicio
+    desperdicio = calcular_desperdicio(capacidade, barras)
+    return barras, desperdicio, tempo
+
+def resolver_ffd_agregado(instancia):
+    """
+    FFD sobre contagens por tipo. Como os itens de um tipo chegam em sequência,
+    cada barra recebe de uma vez quantas cópias couberem, o que reproduz
+    exatamente o resolver_ffd. A ArvoreResidual pula as barras sem folga, então
+    o custo é O((m + barras tocadas) log B) em vez de O(n * barras).
+    """
+    inicio = time.time()
+    capacidade = instancia.capacidade
+    barras = []
+    cargas = []
+
+    # Limite superior de barras do FFD: cada tipo sozinho em barras próprias
+    max_barras = sum(-(-demanda // max(1, capacidade // tamanho))
+                     for tamanho, demanda in instancia.tipos())
+    arvore = ArvoreResidual(capacidade, max_barras)
+
+    for tamanho, demanda in instancia.tipos():
+        restante = demanda
+        while restante > 0:
+            idx = arvore.primeira_com_folga(tamanho)
+            if idx < 0 or idx == len(barras):
+                idx = len(barras)
+                barras.append({})
+                cargas.append(0)
+            # Itens maiores que a barra ocupam uma barra sozinhos (como no resolver_ffd)
+            qtd = min(max(1, (capacidade - cargas[idx]) // tamanho), restante)
+            barras[idx][tamanho] = barras[idx].get(tamanho, 0) + qtd
+            cargas[idx] += qtd * tamanho
+            restante -= qtd
+            arvore.atualizar(idx, capacidade - cargas[idx])
+
+    tempo = time.time() - inicio
+    desperdicio = sum(capacidade - carga for carga in cargas)
+    return barras, desperdicio, tempo
+
 # ==========================================
 # 4. BUSCA LOCAL MELHORADA
 # ==========================================
+# Ganho de um movimento entre duas barras: (desperdício economizado, aumento da
+# soma dos quadrados das cargas). O desperdício de duas barras não muda com uma
+# troca ou realocação que não esvazie barra, então o segundo termo desempata:
+# concentrar carga nas barras mais cheias abre espaço para eliminar as vazias.
+SEM_GANHO = (0, 0)
+
+def ganho_realocacao(estado, origem, destino, item):
+    carga_origem = estado.cargas[origem]
+    carga_destino = estado.cargas[destino]
+    ganho_desp = estado.capacidade if carga_origem == item else 0
+    return ganho_desp, 2 * item * (carga_destino - carga_origem + item)
+
+def ganho_troca(estado, i, j, item_i, item_j):
+    delta = item_j - item_i
+    return 0, 2 * delta * (estado.cargas[i] - estado.cargas[j] + delta)
 
-def tentar_eliminar_barra(capacidade, solucao):
+class Cancelamento:
+    """
+    Sinal de parada cooperativa: cancelar() vindo de fora (outra thread, um
+    serviço que descartou o pedido) ou prazo absoluto em time.time(). Os
+    operadores consultam esgotado() dentro dos seus laços, então a busca para
+    em milissegundos e não só no fim da iteração. origem encadeia outro sinal
+    (ex.: o prazo interno da busca sobre o token do chamador).
+    """
+
+    def __init__(self, prazo=None, origem=None):
+        self.prazo = prazo
+        self.origem = origem
+        self.cancelado = False
+
+    def cancelar(self):
+        self.cancelado = True
+
+    def esgotado(self):
+        if self.cancelado or (self.prazo is not None and time.time() > self.prazo):
+            return True
+        return self.origem is not None and self.origem.esgotado()
+
+class PerfilBusca:
+    """
+    Instrumentação opcional da busca_local_avancada. Para cada operador registra
+    chamadas, candidatos avaliados, movimentos aceitos, tempo gasto e quanto de
+    barras/desperdício ele reduziu; guarda também a trajetória da melhor solução
+    (tempo, iteração, barras, desperdício). Sem perfil a busca não mede nada.
+    """
+
+    OPERADORES = ('eliminar', 'consolidar', 'realocar', 'swap', 'reempacotar', 'perturbacao')
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.operadores = {nome: {'chamadas': 0, 'avaliados': 0, 'aceitos': 0, 'tempo': 0.0,
+                                  'ganho_barras': 0, 'ganho_desperdicio': 0}
+                           for nome in self.OPERADORES}
+        self.trajetoria = []
+        self.iteracoes = 0
+
+    def executar(self, nome, operador, estado, **opcoes):
+        """Roda operador(estado, perfil=self, **opcoes) medindo tempo e efeito."""
+        barras, desperdicio = estado.num_barras, estado.desperdicio
+        inicio = time.perf_counter()
+        aceito = operador(estado, perfil=self, **opcoes)
+        self.registrar(nome, time.perf_counter() - inicio, aceito,
+                       barras - estado.num_barras, desperdicio - estado.desperdicio)
+        return aceito
+
+    def registrar(self, nome, tempo, aceito, ganho_barras=0, ganho_desperdicio=0):
+        registro = self.operadores[nome]
+        registro['chamadas'] += 1
+        registro['tempo'] += tempo
+        if aceito:
+            registro['aceitos'] += 1
+            registro['ganho_barras'] += ganho_barras
+            registro['ganho_desperdicio'] += ganho_desperdicio
+
+    def registrar_melhor(self, iteracao, barras, desperdicio):
+        self.trajetoria.append((time.perf_counter() - self.inicio, iteracao, barras, desperdicio))
+
+    def como_dict(self):
+        return {'iteracoes': self.iteracoes, 'operadores': self.operadores,
+                'trajetoria': [list(ponto) for ponto in self.trajetoria]}
+
+def contar_avaliados(perfil, nome, avaliados):
+    if perfil is not None:
+        perfil.operadores[nome]['avaliados'] += avaliados
+
+def tentar_eliminar_barra(estado, perfil=None, parada=None):
     """Tenta eliminar a barra com menor utilização realocando seus itens"""
-    if len(solucao) <= 1:
-        return None, False
+    if estado.num_barras <= 1:
+        return False
     
+    capacidade = estado.capacidade
+    ativos = estado.indices_ativos()
     # Ordena por utilização (menor primeiro)
-    solucao_ordenada = sorted(enumerate(solucao), key=lambda x: sum(x[1]))
+    ordenados = sorted(ativos, key=lambda idx: estado.cargas[idx])
     
-    for idx_alvo, barra_alvo in solucao_ordenada[:len(solucao)//3]:  # Testa até 1/3 das barras
-        if not barra_alvo:
-            continue
-            
-        itens_realocacao = sorted(barra_alvo, reverse=True)  # Maiores primeiro
-        nova_solucao = [copy.deepcopy(b) for i, b in enumerate(solucao) if i != idx_alvo]
+    avaliados = 0
+    for idx_alvo in ordenados[:len(ativos)//3]:  # Testa até 1/3 das barras
+        if parada is not None and parada.esgotado():
+            break
+        itens_realocacao = sorted(estado.barras[idx_alvo], reverse=True)  # Maiores primeiro
+        ponto = estado.ponto()
+        while estado.barras[idx_alvo]:
+            estado.remover(idx_alvo, len(estado.barras[idx_alvo]) - 1)
         
         sucesso = True
         for item in itens_realocacao:
             # Tenta alocar em barras com melhor fit (menos espaço desperdiçado)
             melhor_barra = None
             menor_desperdicio = float('inf')
+            avaliados += len(ativos) - 1
             
-            for barra in nova_solucao:
-                espaco_livre = capacidade - sum(barra)
+            for idx in ativos:
+                if idx == idx_alvo:
+                    continue
+                espaco_livre = capacidade - estado.cargas[idx]
                 if espaco_livre >= item:
                     desperdicio_resultante = espaco_livre - item
                     if desperdicio_resultante < menor_desperdicio:
                         menor_desperdicio = desperdicio_resultante
-                        melhor_barra = barra
+                        melhor_barra = idx
             
             if melhor_barra is not None:
-                melhor_barra.append(item)
+                estado.inserir(melhor_barra, item)
             else:
                 sucesso = False
                 break
         
         if sucesso:
-            return nova_solucao, True
+            contar_avaliados(perfil, 'eliminar', avaliados)
+            return True
+        estado.desfazer(ponto)
     
-    return None, False
+    contar_avaliados(perfil, 'eliminar', avaliados)
+    return False
+
+class IndiceTrocas:
+    """
+    Índice para a vizinhança de troca. Para cada tamanho distinto guarda as barras
+    que o contêm em ordem crescente de carga (maior folga primeiro), e para cada
+    barra a posição de um representante de cada tamanho. Uma troca melhorante
+    sempre tem uma barra "receptora" i que recebe o item maior b no lugar de a,
+    com a < b <= a + folga(i); como o ganho 2d(s_i - s_j + d) cresce quando s_j
+    diminui, o melhor parceiro para (i, a, b) é a barra mais leve com b.
+    """
+
+    def __init__(self, estado):
+        self.por_tamanho = {}
+        self.posicoes = {}
+        for idx in estado.indices_ativos():
+            posicoes = {}
+            for pos, item in enumerate(estado.barras[idx]):
+                posicoes.setdefault(item, pos)
+            self.posicoes[idx] = posicoes
+            for item in posicoes:
+                self.por_tamanho.setdefault(item, []).append((estado.cargas[idx], idx))
+        for barras in self.por_tamanho.values():
+            barras.sort()
+        self.tamanhos = sorted(self.por_tamanho)
 
-def swap_entre_barras(capacidade, solucao):
-    """Tenta trocar itens entre barras para melhorar utilização"""
-    melhorias = []
+    def tamanhos_entre(self, minimo, maximo):
+        """Tamanhos distintos t com minimo < t <= maximo."""
+        return self.tamanhos[bisect_right(self.tamanhos, minimo):bisect_right(self.tamanhos, maximo)]
+
+    def barra_mais_leve(self, tamanho, exceto):
+        for _, idx in self.por_tamanho[tamanho]:
+            if idx != exceto:
+                return idx
+        return None
+
+def swap_entre_barras(estado, modo='melhor', perfil=None, parada=None):
+    """
+    Tenta trocar itens entre barras para melhorar utilização.
+    Em vez de testar todos os pares de itens de todos os pares de barras, consulta
+    o IndiceTrocas só com os tamanhos cuja diferença cabe na folga da receptora.
+    modo='melhor' aplica a troca de maior ganho; modo='primeira' aplica a
+    primeira melhorante, percorrendo as receptoras da mais cheia para a mais vazia.
+    Interrompida por parada, aplica a melhor troca vista até ali.
+    """
+    indice = IndiceTrocas(estado)
+    melhor_ganho = SEM_GANHO
+    melhor_troca = None
+    avaliados = 0
     
-    for i in range(len(solucao)):
-        for j in range(i+1, len(solucao)):
-            if not solucao[i] or not solucao[j]:
-                continue
-                
-            for idx_i, item_i in enumerate(solucao[i]):
-                for idx_j, item_j in enumerate(solucao[j]):
-                    # Calcula desperdício antes
-                    desp_antes = (capacidade - sum(solucao[i])) + (capacidade - sum(solucao[j]))
-                    
-                    # Simula troca
-                    nova_soma_i = sum(solucao[i]) - item_i + item_j
-                    nova_soma_j = sum(solucao[j]) - item_j + item_i
-                    
-                    if nova_soma_i <= capacidade and nova_soma_j <= capacidade:
-                        desp_depois = (capacidade - nova_soma_i) + (capacidade - nova_soma_j)
-                        ganho = desp_antes - desp_depois
-                        
-                        if ganho > 0:
-                            melhorias.append((ganho, i, j, idx_i, idx_j))
+    # Receptoras iguais geram os mesmos candidatos: uma por classe
+    receptoras = estado.representantes(sorted(indice.posicoes, key=lambda idx: estado.cargas[idx], reverse=True))
+    for i in receptoras:
+        if parada is not None and parada.esgotado():
+            break
+        folga_i = estado.folga(i)
+        if folga_i <= 0:
+            continue
+        for item_i, pos_i in indice.posicoes[i].items():
+            for item_j in indice.tamanhos_entre(item_i, item_i + folga_i):
+                j = indice.barra_mais_leve(item_j, i)
+                if j is None:
+                    continue
+                avaliados += 1
+                ganho = ganho_troca(estado, i, j, item_i, item_j)
+                if ganho > melhor_ganho:
+                    melhor_ganho = ganho
+                    melhor_troca = (i, pos_i, j, indice.posicoes[j][item_j])
+                    if modo == 'primeira':
+                        contar_avaliados(perfil, 'swap', avaliados)
+                        estado.trocar(*melhor_troca)
+                        return True
     
-    if melhorias:
+    contar_avaliados(perfil, 'swap', avaliados)
+    if melhor_troca:
         # Aplica a melhor troca
-        melhorias.sort(reverse=True)
-        _, i, j, idx_i, idx_j = melhorias[0]
-        
-        nova_solucao = copy.deepcopy(solucao)
-        item_i = nova_solucao[i][idx_i]
-        item_j = nova_solucao[j][idx_j]
-        
-        nova_solucao[i][idx_i] = item_j
-        nova_solucao[j][idx_j] = item_i
-        
-        return nova_solucao, True
+        estado.trocar(*melhor_troca)
+        return True
     
-    return None, False
+    return False
 
-def realocar_item(capacidade, solucao):
-    """Move um item de uma barra para outra que tenha melhor fit"""
-    melhor_melhoria = 0
+def realocar_item(estado, perfil=None, parada=None):
+    """
+    Move um item de uma barra para outra que tenha melhor fit. Interrompida por
+    parada, aplica o melhor movimento visto até ali.
+    Candidatos simétricos são avaliados uma vez só: uma origem por classe de
+    barras iguais, uma cópia por tamanho e um destino por carga (o ganho só
+    depende da carga do destino). Os representantes são os primeiros na ordem
+    do laço completo, então o movimento escolhido é o mesmo.
+    """
+    capacidade = estado.capacidade
+    ativos = estado.indices_ativos()
+    melhor_ganho = SEM_GANHO
     melhor_movimento = None
+    avaliados = 0
     
-    for i_origem in range(len(solucao)):
-        if not solucao[i_origem]:
-            continue
-            
-        for idx_item, item in enumerate(solucao[i_origem]):
-            desp_origem_antes = capacidade - sum(solucao[i_origem])
-            desp_origem_depois = capacidade - (sum(solucao[i_origem]) - item)
-            
-            for i_destino in range(len(solucao)):
-                if i_origem == i_destino:
+    # carga -> as duas primeiras barras com ela (a segunda serve quando a primeira é a origem)
+    por_carga = {}
+    for idx in ativos:
+        barras_da_carga = por_carga.setdefault(estado.cargas[idx], [])
+        if len(barras_da_carga) < 2:
+            barras_da_carga.append(idx)
+    
+    for i_origem in estado.representantes(ativos):
+        if parada is not None and parada.esgotado():
+            break
+        for item, idx_item in estado.primeiras_posicoes(i_origem).items():
+            avaliados += len(por_carga)
+            for carga, barras_da_carga in por_carga.items():
+                if carga + item > capacidade:
                     continue
-                    
-                nova_soma_destino = sum(solucao[i_destino]) + item
-                if nova_soma_destino <= capacidade:
-                    desp_destino_antes = capacidade - sum(solucao[i_destino])
-                    desp_destino_depois = capacidade - nova_soma_destino
-                    
-                    # Ganho total
-                    ganho = (desp_origem_antes + desp_destino_antes) - \
-                            (desp_origem_depois + desp_destino_depois)
-                    
-                    if ganho > melhor_melhoria:
-                        melhor_melhoria = ganho
-                        melhor_movimento = (i_origem, idx_item, i_destino)
+                i_destino = barras_da_carga[0]
+                if i_destino == i_origem:
+                    if len(barras_da_carga) == 1:
+                        continue
+                    i_destino = barras_da_carga[1]
+                ganho = ganho_realocacao(estado, i_origem, i_destino, item)
+                if ganho > melhor_ganho:
+                    melhor_ganho = ganho
+                    melhor_movimento = (i_origem, idx_item, i_destino)
     
+    contar_avaliados(perfil, 'realocar', avaliados)
     if melhor_movimento:
-        i_origem, idx_item, i_destino = melhor_movimento
-        nova_solucao = copy.deepcopy(solucao)
-        item = nova_solucao[i_origem].pop(idx_item)
-        nova_solucao[i_destino].append(item)
-        
-        # Remove barras vazias
-        nova_solucao = [b for b in nova_solucao if b]
-        return nova_solucao, True
+        estado.mover(*melhor_movimento)
+        return True
     
-    return None, False
+    return False
 
-def consolidar_barras(capacidade, solucao):
+def consolidar_barras(estado, perfil=None):
     """Tenta mesclar barras parcialmente cheias"""
-    if len(solucao) <= 1:
-        return None, False
+    if estado.num_barras <= 1:
+        return False
     
-    # Ordena por utilização
-    barras_ordenadas = sorted(enumerate(solucao), key=lambda x: sum(x[1]))
+    # Se algum par cabe numa barra só, as duas barras menos carregadas cabem
+    idx_i, idx_j = heapq.nsmallest(2, estado.indices_ativos(), key=lambda idx: estado.cargas[idx])
+    contar_avaliados(perfil, 'consolidar', 1)
+    if estado.cargas[idx_i] + estado.cargas[idx_j] <= estado.capacidade:
+        estado.mesclar(idx_i, idx_j)
+        return True
     
-    for i in range(len(barras_ordenadas)):
-        idx_i, barra_i = barras_ordenadas[i]
-        
-        for j in range(i+1, len(barras_ordenadas)):
-            idx_j, barra_j = barras_ordenadas[j]
-            
-            if sum(barra_i) + sum(barra_j) <= capacidade:
-                # Pode mesclar!
-                nova_solucao = []
-                barra_mesclada = barra_i + barra_j
-                
-                for k, barra in enumerate(solucao):
-                    if k == idx_i:
-                        nova_solucao.append(barra_mesclada)
-                    elif k != idx_j:
-                        nova_solucao.append(copy.deepcopy(barra))
-                
-                return nova_solucao, True
+    return False
+
+def reempacotar_barras(estado, k=4, perfil=None, parada=None):
+    """
+    Junta os itens das k barras menos carregadas e as reenche uma a uma com a
+    maior carga possível (soma de subconjuntos sobre os itens que sobram, com as
+    tabelas memorizadas em mochila.enchimento_maximo). Aplica se o reempacotamento
+    usa menos barras ou, com as mesmas, concentra mais a carga (o mesmo ganho
+    lexicográfico dos outros movimentos).
+    """
+    ativos = estado.indices_ativos()
+    if len(ativos) < 2:
+        return False
+    alvos = heapq.nsmallest(min(k, len(ativos)), ativos, key=lambda idx: estado.cargas[idx])
+    restantes = {}
+    for idx in alvos:
+        for item in estado.barras[idx]:
+            restantes[item] = restantes.get(item, 0) + 1
+    
+    novas = []
+    while restantes:
+        if len(novas) == len(alvos) or (parada is not None and parada.esgotado()):
+            contar_avaliados(perfil, 'reempacotar', len(novas))
+            return False
+        tipos = tuple(sorted(restantes.items()))
+        carga, quantidades = enchimento_maximo(estado.capacidade, tipos)
+        if carga == 0:
+            return False  # item maior que a barra
+        barra = []
+        for (tamanho, _), qtd in zip(tipos, quantidades):
+            if qtd:
+                barra.extend([tamanho] * qtd)
+                restantes[tamanho] -= qtd
+                if not restantes[tamanho]:
+                    del restantes[tamanho]
+        novas.append(barra)
+    contar_avaliados(perfil, 'reempacotar', len(novas))
+    
+    ganho = ((len(alvos) - len(novas)) * estado.capacidade,
+             sum(sum(barra) ** 2 for barra in novas) - sum(estado.cargas[idx] ** 2 for idx in alvos))
+    if ganho <= SEM_GANHO:
+        return False
+    for idx in alvos:
+        while estado.barras[idx]:
+            estado.remover(idx, len(estado.barras[idx]) - 1)
+    for idx, barra in zip(alvos, novas):
+        for item in barra:
+            estado.inserir(idx, item)
+    return True
+
+# --- Avaliação vetorizada (NumPy opcional) ---
+# Cargas e a atribuição item -> barra ficam em vetores e os ganhos de todas as
+# realocações saem de operações sobre os vetores inteiros. A ordem de desempate
+# é a mesma do laço interpretado (itens por barra de origem, destinos na ordem
+# de indices_ativos), então o movimento escolhido é idêntico.
+# A troca não tem versão vetorizada: o IndiceTrocas já avalia só os pares com
+# diferença dentro da folga, bem menos que a matriz densa item x item.
+# Faixa de itens em que o modo automático usa o caminho vetorizado. Acima do teto
+# o laço interpretado, que só avalia um representante por classe de barras, é
+# igual ou mais rápido: os dois pagam O(B) em Python e o vetorizado ainda copia
+# todos os itens para os vetores.
+LIMIAR_VETORIZADO = 500
+TETO_VETORIZADO = 20000
+
+def vetores_estado(estado):
+    """
+    (ativos, cargas, origem, posicao, tamanho) com todos os itens das barras
+    ativas, montados em C (chain + repeat) e sem laço Python por barra. Cópias e
+    barras iguais repetem ganhos, mas o argmax fica com a primeira ocorrência,
+    que é o representante que o laço interpretado avaliaria.
+    """
+    ativos = estado.indices_ativos()
+    barras = [estado.barras[idx] for idx in ativos]
+    comprimentos = np.fromiter(map(len, barras), dtype=np.intp, count=len(barras))
+    total = int(comprimentos.sum())
+    tamanho = np.fromiter(chain.from_iterable(barras), dtype=np.int64, count=total)
+    origem = np.repeat(np.arange(len(barras), dtype=np.intp), comprimentos)
+    inicios = np.cumsum(comprimentos) - comprimentos
+    posicao = np.arange(total, dtype=np.intp) - np.repeat(inicios, comprimentos)
+    cargas = np.array(estado.cargas, dtype=np.int64)[ativos]
+    return ativos, cargas, origem, posicao, tamanho
+
+def realocar_item_vetorizado(estado, perfil=None, parada=None):
+    """
+    Mesmo movimento de realocar_item, avaliado com NumPy (sem NumPy, delega).
+    O ganho 2w(s_destino - s_origem + w) cresce com a carga do destino, então o
+    melhor destino de cada item é a barra mais cheia em que ele cabe: com as
+    cargas ordenadas, um searchsorted acha esse destino para todos os itens de
+    uma vez, em O(n log B) em vez de n x B comparações.
+    """
+    if np is None:
+        return realocar_item(estado, perfil, parada)
+    capacidade = estado.capacidade
+    ativos, cargas, origem, posicao, tamanho = vetores_estado(estado)
+    if len(ativos) < 2:
+        return False
+    contar_avaliados(perfil, 'realocar', len(tamanho) * (len(ativos) - 1))
+    
+    # Cargas em ordem crescente; empates na ordem de ativos, como no laço interpretado
+    ordem = np.argsort(cargas, kind='stable')
+    ordenadas = cargas[ordem]
+    # Maior carga em que o item cabe e a primeira barra com essa carga
+    ultimo = np.searchsorted(ordenadas, capacidade - tamanho, side='right') - 1
+    cabe = ultimo >= 0
+    ultimo = np.maximum(ultimo, 0)
+    primeiro = np.searchsorted(ordenadas, ordenadas[ultimo], side='left')
+    destino = ordem[primeiro]
+    # Se essa barra é a própria origem: a seguinte de mesma carga ou, sem ela,
+    # a primeira do grupo de carga logo abaixo
+    e_origem = destino == origem
+    tem_par = primeiro + 1 <= ultimo
+    anterior = np.maximum(primeiro - 1, 0)
+    primeiro_anterior = np.searchsorted(ordenadas, ordenadas[anterior], side='left')
+    destino = np.where(e_origem & tem_par, ordem[np.minimum(primeiro + 1, len(ordem) - 1)], destino)
+    destino = np.where(e_origem & ~tem_par, ordem[primeiro_anterior], destino)
+    cabe &= ~(e_origem & ~tem_par & (primeiro == 0))
+    if not cabe.any():
+        return False
     
-    return None, False
+    cargas_origem = cargas[origem]
+    # Esvaziar a origem economiza uma barra inteira e domina qualquer outro ganho
+    esvaziam = cabe & (cargas_origem == tamanho)
+    ganho_desp, candidatos = (capacidade, esvaziam) if esvaziam.any() else (0, cabe)
+    ganhos = np.where(candidatos, 2 * tamanho * (cargas[destino] - cargas_origem + tamanho),
+                      np.iinfo(np.int64).min)
+    k = int(np.argmax(ganhos))
+    if (ganho_desp, int(ganhos[k])) <= SEM_GANHO:
+        return False
+    estado.mover(ativos[origem[k]], int(posicao[k]), ativos[destino[k]])
+    return True
 
-def busca_local_avancada(capacidade, solucao_inicial, max_iter=500, tempo_limite=30):
-    """Busca local com múltiplas estratégias"""
+def busca_local_avancada(capacidade, solucao_inicial, max_iter=500, tempo_limite=30, limite_inferior=None,
+                         semente=None, perfil=None, parar=None, ao_melhorar=None, parada=None,
+                         vetorizado=None):
+    """
+    Busca local com múltiplas estratégias.
+    Para assim que o número de barras atinge limite_inferior (calculado com L1/L2
+    a partir dos itens se não for informado): com as barras fixas o desperdício
+    também não cai mais, então a solução já é ótima.
+    A perturbação usa um random.Random(semente) próprio da execução, então a
+    mesma semente reproduz a mesma trajetória (a menos do corte por tempo).
+    Se perfil (PerfilBusca) for passado, ele é preenchido com os contadores de
+    cada operador e a trajetória da melhor solução. parar(melhor_num_barras),
+    se informada, é chamada a cada iteração e encerra a busca ao devolver True.
+    ao_melhorar(barras, desperdicio, tempo) é chamada a cada novo incumbente e
+    parada (Cancelamento) interrompe a busca por fora; ver busca_anytime.
+    vetorizado escolhe realocar_item_vetorizado (None: automático, com NumPy
+    instalado e entre LIMIAR_VETORIZADO e TETO_VETORIZADO itens); a trajetória
+    não muda.
+    """
+    passos = busca_anytime(capacidade, solucao_inicial, max_iter, tempo_limite, limite_inferior,
+                           semente, perfil, parar, parada, vetorizado)
+    while True:
+        try:
+            incumbente = next(passos)
+        except StopIteration as fim:
+            return fim.value
+        if ao_melhorar is not None:
+            ao_melhorar(*incumbente)
+
+def busca_anytime(capacidade, solucao_inicial, max_iter=500, tempo_limite=30, limite_inferior=None,
+                  semente=None, perfil=None, parar=None, parada=None, vetorizado=None):
+    """
+    Versão geradora da busca_local_avancada: produz (barras, desperdicio, tempo)
+    para a solução inicial e para cada melhoria, então quem consome pode usar a
+    primeira resposta na hora e trocar por uma melhor depois. O prazo de
+    tempo_limite e o Cancelamento parada são verificados dentro dos laços dos
+    operadores. O valor de retorno do gerador (StopIteration.value) é o mesmo
+    (melhor_solucao, melhor_desperdicio, tempo) da busca_local_avancada. As
+    barras produzidas são a cópia guardada do incumbente e não devem ser alteradas.
+    """
     inicio = time.time()
-    melhor_solucao = copy.deepcopy(solucao_inicial)
-    melhor_desperdicio = calcular_desperdicio(capacidade, melhor_solucao)
-    melhor_num_barras = len(melhor_solucao)
+    rng = random.Random(semente)
+    interrupcao = Cancelamento(prazo=inicio + tempo_limite, origem=parada)
+    estado = SolucaoIncremental(capacidade, solucao_inicial)
+    melhor_solucao = estado.para_listas()
+    melhor_desperdicio = estado.desperdicio
+    melhor_num_barras = estado.num_barras
+    if limite_inferior is None:
+        limite_inferior = calcular_limite_inferior(capacidade, contagem_de_barras(estado.barras))
+    if vetorizado is None:
+        vetorizado = np is not None and LIMIAR_VETORIZADO <= sum(map(len, estado.barras)) < TETO_VETORIZADO
+    realocar = realocar_item_vetorizado if vetorizado else realocar_item
+    
+    def aplicar(nome, operador, **opcoes):
+        if perfil is None:
+            return operador(estado, **opcoes)
+        return perfil.executar(nome, operador, estado, **opcoes)
     
-    solucao_atual = copy.deepcopy(melhor_solucao)
+    if perfil is not None:
+        perfil.registrar_melhor(0, melhor_num_barras, melhor_desperdicio)
+    yield melhor_solucao, melhor_desperdicio, time.time() - inicio
     sem_melhoria = 0
     
     for iteracao in range(max_iter):
-        # Verifica tempo limite
-        if time.time() - inicio > tempo_limite:
+        # Verifica tempo limite, cancelamento e otimalidade provada
+        if interrupcao.esgotado() or melhor_num_barras <= limite_inferior:
+            break
+        if parar is not None and parar(melhor_num_barras):
             break
+        if perfil is not None:
+            perfil.iteracoes += 1
         
-        melhorou = False
+        # Os movimentos aplicados abaixo são definitivos
+        estado.confirmar()
         
         # ESTRATÉGIA 1: Tentar eliminar barras (prioridade máxima)
-        nova_sol, sucesso = tentar_eliminar_barra(capacidade, solucao_atual)
-        if sucesso and nova_sol:
-            desperdicio_novo = calcular_desperdicio(capacidade, nova_sol)
-            if len(nova_sol) < len(solucao_atual) or desperdicio_novo < calcular_desperdicio(capacidade, solucao_atual):
-                solucao_atual = nova_sol
-                melhorou = True
+        melhorou = aplicar('eliminar', tentar_eliminar_barra, parada=interrupcao)
         
         # ESTRATÉGIA 2: Consolidar barras
         if not melhorou:
-            nova_sol, sucesso = consolidar_barras(capacidade, solucao_atual)
-            if sucesso and nova_sol:
-                solucao_atual = nova_sol
-                melhorou = True
+            melhorou = aplicar('consolidar', consolidar_barras)
         
         # ESTRATÉGIA 3: Realocar itens
         if not melhorou:
-            nova_sol, sucesso = realocar_item(capacidade, solucao_atual)
-            if sucesso and nova_sol:
-                solucao_atual = nova_sol
-                melhorou = True
+            melhorou = aplicar('realocar', realocar, parada=interrupcao)
         
         # ESTRATÉGIA 4: Swap entre barras
         if not melhorou:
-            nova_sol, sucesso = swap_entre_barras(capacidade, solucao_atual)
-            if sucesso and nova_sol:
-                solucao_atual = nova_sol
-                melhorou = True
+            melhorou = aplicar('swap', swap_entre_barras, parada=interrupcao)
         
-        # Atualiza melhor solução
-        desperdicio_atual = calcular_desperdicio(capacidade, solucao_atual)
-        num_barras_atual = len(solucao_atual)
+        # ESTRATÉGIA 5: Reempacotar as barras mais vazias de forma exata
+        if not melhorou:
+            melhorou = aplicar('reempacotar', reempacotar_barras, parada=interrupcao)
         
-        if num_barras_atual < melhor_num_barras or \
-           (num_barras_atual == melhor_num_barras and desperdicio_atual < melhor_desperdicio):
-            melhor_solucao = copy.deepcopy(solucao_atual)
-            melhor_desperdicio = desperdicio_atual
-            melhor_num_barras = num_barras_atual
+        # Atualiza melhor solução
+        if estado.num_barras < melhor_num_barras or \
+           (estado.num_barras == melhor_num_barras and estado.desperdicio < melhor_desperdicio):
+            melhor_solucao = estado.para_listas()
+            melhor_desperdicio = estado.desperdicio
+            melhor_num_barras = estado.num_barras
             sem_melhoria = 0
+            if perfil is not None:
+                perfil.registrar_melhor(iteracao + 1, melhor_num_barras, melhor_desperdicio)
+            yield melhor_solucao, melhor_desperdicio, time.time() - inicio
         else:
             sem_melhoria += 1
         
         # Perturbação para escapar de ótimos locais
-        if sem_melhoria > 50 and len(solucao_atual) > 2:
+        if sem_melhoria > 50 and estado.num_barras > 2:
             # Pequena perturbação aleatória
-            idx1 = random.randint(0, len(solucao_atual)-1)
-            idx2 = random.randint(0, len(solucao_atual)-1)
+            inicio_perturbacao = time.perf_counter() if perfil is not None else 0
+            aceita = False
+            ativos = estado.indices_ativos()
+            idx1 = rng.choice(ativos)
+            idx2 = rng.choice(ativos)
             
-            if idx1 != idx2 and solucao_atual[idx1] and solucao_atual[idx2]:
-                item1 = random.choice(solucao_atual[idx1])
-                item2 = random.choice(solucao_atual[idx2])
+            if idx1 != idx2:
+                pos1 = rng.randrange(len(estado.barras[idx1]))
+                pos2 = rng.randrange(len(estado.barras[idx2]))
+                item1 = estado.barras[idx1][pos1]
+                item2 = estado.barras[idx2][pos2]
                 
-                solucao_temp = copy.deepcopy(solucao_atual)
-                solucao_temp[idx1].remove(item1)
-                solucao_temp[idx2].remove(item2)
-                
-                if sum(solucao_temp[idx1]) + item2 <= capacidade and \
-                   sum(solucao_temp[idx2]) + item1 <= capacidade:
-                    solucao_temp[idx1].append(item2)
-                    solucao_temp[idx2].append(item1)
-                    solucao_atual = solucao_temp
+                if estado.cargas[idx1] - item1 + item2 <= capacidade and \
+                   estado.cargas[idx2] - item2 + item1 <= capacidade:
+                    estado.trocar(idx1, pos1, idx2, pos2)
                     sem_melhoria = 0
+                    aceita = True
+            if perfil is not None:
+                contar_avaliados(perfil, 'perturbacao', 1)
+                perfil.registrar('perturbacao', time.perf_counter() - inicio_perturbacao, aceita)
     
     tempo = time.time() - inicio
     return melhor_solucao, melhor_desperdicio, tempo
@@ -312,8 +864,15 @@ def busca_local_avancada(capacidade, solucao_inicial, max_iter=500, tempo_limite
 # ==========================================
 # 5. FUNÇÕES DE EXECUÇÃO
 # ==========================================
-def imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib, capacidade):
-    print(f"{nome:<25} | {capacidade:<12} | {'FFD':<12} | {len(res_ffd):<6} | {desp_ffd:<12} | {tempo_ffd:.4f}")
+SEMENTE_PADRAO = 0  # registrada na saída para que as execuções possam ser repetidas
+
+def imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib, capacidade, limite=None):
+    def colunas_limite(num_barras):
+        if limite is None:
+            return f"{'-':<6} | {'-':<8}"
+        return f"{limite:<6} | {calcular_gap(num_barras, limite):.2f}%"
+
+    print(f"{nome:<25} | {capacidade:<12} | {'FFD':<12} | {len(res_ffd):<6} | {desp_ffd:<12} | {tempo_ffd:<8.4f} | {colunas_limite(len(res_ffd))}")
     
     melhoria = ""
     reducao_barras = len(res_ffd) - len(res_hib)
@@ -324,13 +883,14 @@ def imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib,
     elif reducao_desp > 0:
         melhoria = f" << -{reducao_desp} desperdício"
     
-    print(f"{'':<25} | {'':<12} | {'BL Avançada':<12} | {len(res_hib):<6} | {desp_hib:<12} | {tempo_hib:.4f} {melhoria}")
-    print("-" * 85)
+    print(f"{'':<25} | {'':<12} | {'BL Avançada':<12} | {len(res_hib):<6} | {desp_hib:<12} | {tempo_hib:<8.4f} | {colunas_limite(len(res_hib))} {melhoria}")
+    print("-" * 105)
 
 def rodar_automatizado():
-    print("\n>>> INICIANDO BATERIA DE 10 TESTES AUTOMATIZADOS <<<\n")
-    print(f"{'Instância':<25} | {'Capacidade:':<12} | {'Método':<12} | {'Barras':<6} | {'Desperdício':<12} | {'Tempo(s)':<10}")
-    print("-" * 85)
+    print("\n>>> INICIANDO BATERIA DE 100 TESTES AUTOMATIZADOS (cutgen/type02) <<<")
+    print(f"Semente: {SEMENTE_PADRAO}\n")
+    print(f"{'Instância':<25} | {'Capacidade:':<12} | {'Método':<12} | {'Barras':<6} | {'Desperdício':<12} | {'Tempo(s)':<8} | {'LB':<6} | {'Gap':<8}")
+    print("-" * 105)
 
     configuracoes = [
         ("Teste_01", 1000, 10, 100, 500, 5),
@@ -360,45 +920,53 @@ def rodar_automatizado():
         # nome, cap, tipos, min_t, max_t, max_d = configuracoes[i]
         # arquivo = gerar_arquivo_instancia(f"{nome}.txt", cap, tipos, min_t, max_t, max_d)
         arquivo = nome = cutgen[i]
-        cap_lida, itens = ler_instancia(arquivo)
+        instancia = ler_instancia_agregada(arquivo)
+        cap_lida = instancia.capacidade
         
-        res_ffd, desp_ffd, tempo_ffd = resolver_ffd(cap_lida, itens)
-        res_hib, desp_hib, tempo_hib = busca_local_avancada(cap_lida, res_ffd)
+        barras_ffd, desp_ffd, tempo_ffd = resolver_ffd_agregado(instancia)
+        res_ffd = expandir_barras(barras_ffd)
+        limite = calcular_limite_inferior(cap_lida, instancia.contagem())
+        res_hib, desp_hib, tempo_hib = busca_local_avancada(cap_lida, res_ffd, limite_inferior=limite,
+                                                        semente=SEMENTE_PADRAO)
         
         if len(res_hib) < len(res_ffd):
             total_reduz_barras += 1
         if desp_hib < desp_ffd:
             total_reduz_desp += 1
         
-        imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib, cap_lida)
+        imprimir_linha_tabela(nome, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib, cap_lida, limite)
     
-    print(f"\nResumo: {total_reduz_barras}/10 testes reduziram barras | {total_reduz_desp}/10 reduziram desperdício")
+    print(f"\nResumo: {total_reduz_barras}/{len(cutgen)} testes reduziram barras | {total_reduz_desp}/{len(cutgen)} reduziram desperdício")
 
 def rodar_arquivo_unico():
     nome_arquivo = input("\nDigite o nome do arquivo (ex: instancia.txt): ")
-    cap_lida, itens = ler_instancia(nome_arquivo)
+    instancia = ler_instancia_agregada(nome_arquivo)
     
-    if cap_lida is None:
+    if instancia is None:
         print("ERRO: Arquivo não encontrado.")
         return
 
     print(f"\nProcessando arquivo: {nome_arquivo}...")
-    print(f"Capacidade: {cap_lida} | Total de Itens: {len(itens)}")
-    print("-" * 85)
-    print(f"{'Instância':<25} | {'Capacidade:':<12} | {'Método':<12} | {'Barras':<6} | {'Desperdício':<12} | {'Tempo(s)':<10}")
-    print("-" * 85)
+    cap_lida = instancia.capacidade
+    print(f"Capacidade: {cap_lida} | Total de Itens: {instancia.total_itens} | Tipos: {instancia.num_tipos} | Semente: {SEMENTE_PADRAO}")
+    print("-" * 105)
+    print(f"{'Instância':<25} | {'Capacidade:':<12} | {'Método':<12} | {'Barras':<6} | {'Desperdício':<12} | {'Tempo(s)':<8} | {'LB':<6} | {'Gap':<8}")
+    print("-" * 105)
 
-    res_ffd, desp_ffd, tempo_ffd = resolver_ffd(cap_lida, itens)
-    res_hib, desp_hib, tempo_hib = busca_local_avancada(cap_lida, res_ffd)
+    barras_ffd, desp_ffd, tempo_ffd = resolver_ffd_agregado(instancia)
+    res_ffd = expandir_barras(barras_ffd)
+    limite = calcular_limite_inferior(cap_lida, instancia.contagem())
+    res_hib, desp_hib, tempo_hib = busca_local_avancada(cap_lida, res_ffd, limite_inferior=limite,
+                                                        semente=SEMENTE_PADRAO)
     
-    imprimir_linha_tabela(nome_arquivo, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib, cap_lida)
+    imprimir_linha_tabela(nome_arquivo, res_ffd, desp_ffd, tempo_ffd, res_hib, desp_hib, tempo_hib, cap_lida, limite)
 
 # ==========================================
 # MAIN
 # ==========================================
 if __name__ == "__main__":
     print("=== SISTEMA DE TESTES: CORTE DE ESTOQUE (1DCSP) - VERSÃO MELHORADA ===")
-    print("1 - Rodar bateria de 10 testes automatizados")
+    print("1 - Rodar bateria de 100 testes automatizados (cutgen/type02)")
     print("2 - Rodar teste em um arquivo específico")
     
     opcao = input("Escolha uma opção (1 ou 2): ")
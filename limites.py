@@ -0,0 +1,72 @@
+# ==========================================
+# LIMITES INFERIORES PARA O NÚMERO DE BARRAS
+# ==========================================
+# As funções recebem a capacidade e a contagem {tamanho: demanda}, então servem
+# tanto para Instancia (instancia.contagem()) quanto para uma solução em listas
+# (contagem_de_barras).
+
+def contagem_de_barras(barras):
+    """Contagem {tamanho: demanda} dos itens de uma solução em listas."""
+    contagem = {}
+    for barra in barras:
+        for item in barra:
+            contagem[item] = contagem.get(item, 0) + 1
+    return contagem
+
+def limite_l1(capacidade, contagem):
+    """Limite contínuo: ceil(soma dos tamanhos / L)."""
+    soma = sum(tamanho * demanda for tamanho, demanda in contagem.items())
+    return -(-soma // capacidade)
+
+def limite_l2(capacidade, contagem):
+    """
+    Limite L2 de Martello-Toth. Para cada K em {0} U {tamanhos <= L/2}:
+    J1 = itens > L-K (uma barra cada), J2 = itens em (L/2, L-K] (uma barra cada,
+    sobrando folga), J3 = itens em [K, L/2], que só cabem na folga de J2 ou em
+    barras novas. O(m^2) sobre os tipos distintos.
+    """
+    candidatos = {0} | {t for t in contagem if 2 * t <= capacidade}
+    melhor = limite_l1(capacidade, contagem)
+    for k in candidatos:
+        n1 = n2 = soma2 = soma3 = 0
+        for tamanho, demanda in contagem.items():
+            if tamanho > capacidade - k:
+                n1 += demanda
+            elif 2 * tamanho > capacidade:
+                n2 += demanda
+                soma2 += tamanho * demanda
+            elif tamanho >= k:
+                soma3 += tamanho * demanda
+        folga_j2 = n2 * capacidade - soma2
+        extra = max(0, -(-(soma3 - folga_j2) // capacidade))
+        melhor = max(melhor, n1 + n2 + extra)
+    return melhor
+
+def limite_lp(capacidade, contagem):
+    """
+    ceil do valor da relaxação linear de Gilmore-Gomory (geracao_colunas).
+    Só é um limite válido se a precificação convergiu, o que vale para as
+    instâncias CUTGEN/fiber com o limite de nós padrão da mochila.
+    """
+    from geracao_colunas import resolver_lp
+    from heuristicas_v3 import Instancia
+    valor, _, _ = resolver_lp(Instancia(capacidade, list(contagem), list(contagem.values())))
+    return int(-(-(valor - 1e-6) // 1))
+
+def calcular_limites(capacidade, contagem, usar_lp=False):
+    """Retorna {'l1', 'l2', ['lp'], 'limite'}; 'limite' é o maior deles."""
+    limites = {
+        'l1': limite_l1(capacidade, contagem),
+        'l2': limite_l2(capacidade, contagem),
+    }
+    if usar_lp:
+        limites['lp'] = limite_lp(capacidade, contagem)
+    limites['limite'] = max(limites.values())
+    return limites
+
+def calcular_limite_inferior(capacidade, contagem, usar_lp=False):
+    return calcular_limites(capacidade, contagem, usar_lp)['limite']
+
+def calcular_gap(num_barras, limite):
+    """Gap percentual de uma solução em relação ao limite inferior."""
+    return 100.0 * (num_barras - limite) / limite if limite else 0.0
@@ -0,0 +1,265 @@
+import fnmatch
+import glob
+import os
+import re
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import heuristicas_v2
+from armazem_instancias import abrir_armazem, carregar_instancia
+from busca_tabu import busca_tabu
+from geracao_colunas import resolver_geracao_colunas
+from padroes import SolucaoPadroes, busca_local_padroes
+from portfolio import resolver_portfolio
+from heuristicas_v3 import (resolver_ffd_agregado, resolver_bfd,
+                            expandir_barras, busca_local_avancada, PerfilBusca)
+from limites import calcular_gap, calcular_limite_inferior
+
+# ==========================================
+# 1. ALGORITMOS DISPONÍVEIS
+# ==========================================
+def _rodar_ffd(instancia, max_iter, tempo_limite, limite, semente):
+    barras, desperdicio, _ = resolver_ffd_agregado(instancia)
+    return expandir_barras(barras), desperdicio
+
+def _rodar_bfd(instancia, max_iter, tempo_limite, limite, semente):
+    barras, desperdicio, _ = resolver_bfd(instancia.capacidade, instancia.itens_expandidos())
+    return barras, desperdicio
+
+def _rodar_bl_avancada(instancia, max_iter, tempo_limite, limite, semente, perfil=None):
+    barras_ffd, _ = _rodar_ffd(instancia, max_iter, tempo_limite, limite, semente)
+    barras, desperdicio, _ = busca_local_avancada(instancia.capacidade, barras_ffd,
+                                                  max_iter=max_iter or 500, tempo_limite=tempo_limite,
+                                                  limite_inferior=limite, semente=semente, perfil=perfil)
+    return barras, desperdicio
+
+def _rodar_ils_v2(instancia, max_iter, tempo_limite, limite, semente):
+    barras_ffd, _ = _rodar_ffd(instancia, max_iter, tempo_limite, limite, semente)
+    barras, desperdicio, _ = heuristicas_v2.busca_local(instancia.capacidade, barras_ffd,
+                                                        max_iter=max_iter or 1000, tempo_limite=tempo_limite,
+                                                        limite_inferior=limite, semente=semente)
+    return barras, desperdicio
+
+def _rodar_tabu(instancia, max_iter, tempo_limite, limite, semente):
+    barras_ffd, _ = _rodar_ffd(instancia, max_iter, tempo_limite, limite, semente)
+    barras, desperdicio, _ = busca_tabu(instancia.capacidade, barras_ffd, max_iter=max_iter or 5000,
+                                        tempo_limite=tempo_limite, limite_inferior=limite, semente=semente)
+    return barras, desperdicio
+
+def _rodar_colunas(instancia, max_iter, tempo_limite, limite, semente):
+    barras, desperdicio, _ = resolver_geracao_colunas(instancia, tempo_limite=tempo_limite)
+    return expandir_barras(barras), desperdicio
+
+def _rodar_padroes(instancia, max_iter, tempo_limite, limite, semente):
+    barras_ffd, _, _ = resolver_ffd_agregado(instancia)
+    solucao = SolucaoPadroes.de_agregadas(instancia.capacidade, barras_ffd)
+    solucao, desperdicio, _ = busca_local_padroes(solucao, max_iter=max_iter or 10000,
+                                                  tempo_limite=tempo_limite, limite_inferior=limite)
+    return solucao.para_barras(), desperdicio
+
+def _rodar_portfolio(instancia, max_iter, tempo_limite, limite, semente, trabalhadores=None):
+    barras, desperdicio, _, _ = resolver_portfolio(instancia, trabalhadores, tempo_limite=tempo_limite,
+                                                   max_iter=max_iter, semente=semente, limite_inferior=limite)
+    return barras, desperdicio
+
+# nome -> função(instancia, max_iter, tempo_limite, limite, semente) que retorna (barras, desperdicio);
+# limite é o limite inferior de barras, usado pelas buscas para parar cedo, e semente
+# alimenta o gerador aleatório próprio de cada execução
+ALGORITMOS = {
+    'ffd': _rodar_ffd,
+    'bfd': _rodar_bfd,
+    'bl_avancada': _rodar_bl_avancada,
+    'ils_v2': _rodar_ils_v2,
+    'tabu': _rodar_tabu,
+    'colunas': _rodar_colunas,
+    'padroes': _rodar_padroes,
+    'portfolio': _rodar_portfolio,
+}
+
+# algoritmos que aceitam perfil=PerfilBusca() como argumento extra
+COM_PERFIL = {'bl_avancada'}
+# algoritmos que abrem processos próprios e aceitam trabalhadores=N
+COM_TRABALHADORES = {'portfolio'}
+
+# ==========================================
+# 2. INSTÂNCIAS
+# ==========================================
+SUITE_NOTURNA = ['cutgen/type*/TEST*', 'fiber/*.txt']
+
+def _chave_natural(caminho):
+    """Ordena TEST2 antes de TEST10."""
+    return [int(parte) if parte.isdigit() else parte for parte in re.split(r'(\d+)', caminho)]
+
+def listar_instancias(padroes, armazem=None):
+    """
+    Expande caminhos e globs numa lista ordenada e sem repetições. Com armazem,
+    os padrões também casam com as chaves do índice, que podem não existir no
+    disco (ex.: typeNN/TESTk gravados por gerador_cutgen.py --armazem).
+    """
+    aberto = abrir_armazem(armazem)
+    chaves = list(aberto.indice) if aberto is not None else []
+    caminhos = set()
+    for padrao in padroes:
+        encontrados = glob.glob(padrao) + fnmatch.filter(chaves, padrao)
+        caminhos.update(encontrados if encontrados else [padrao])
+    return sorted(caminhos, key=_chave_natural)
+
+def grupo_da_instancia(caminho):
+    """Classe usada no resumo: 'type02' para cutgen, 'fiber_5180' para fiber, senão a pasta."""
+    nome = os.path.basename(caminho)
+    pasta = os.path.basename(os.path.dirname(caminho))
+    if pasta == 'fiber':
+        return 'fiber_' + os.path.splitext(nome)[0].rsplit('_', 1)[-1]
+    return pasta or 'raiz'
+
+# ==========================================
+# 3. EXECUÇÃO DE UM TRABALHO
+# ==========================================
+class TempoEsgotado(Exception):
+    pass
+
+def _alarme(signum, frame):
+    raise TempoEsgotado()
+
+def executar_trabalho(caminho, algoritmo, semente=None, max_iter=None, tempo_limite=30, limite_rigido=None,
+                      armazem=None, perfil=False, trabalhadores=None):
+    """
+    Roda um algoritmo numa instância e devolve um dicionário de resultado.
+    tempo_limite é repassado ao algoritmo; limite_rigido (padrão tempo_limite + 10s)
+    interrompe por SIGALRM quem não respeitar o tempo. Com armazem (arquivo de
+    armazem_instancias.py) a instância vem do mapa binário, sem parsing. Com
+    perfil=True, algoritmos em COM_PERFIL anexam os contadores por operador.
+    trabalhadores é repassado aos algoritmos em COM_TRABALHADORES.
+    """
+    resultado = {
+        'instancia': caminho,
+        'grupo': grupo_da_instancia(caminho),
+        'algoritmo': algoritmo,
+        'semente': semente,
+        'status': 'ok',
+        'tempo': 0.0,
+    }
+    instancia = carregar_instancia(caminho, armazem)
+    if instancia is None:
+        resultado['status'] = 'erro'
+        resultado['erro'] = 'arquivo não encontrado'
+        return resultado
+    resultado['capacidade'] = instancia.capacidade
+    resultado['tipos'] = instancia.num_tipos
+    resultado['itens'] = instancia.total_itens
+    limite = calcular_limite_inferior(instancia.capacidade, instancia.contagem())
+    resultado['limite_inferior'] = limite
+
+    if limite_rigido is None:
+        limite_rigido = tempo_limite + 10
+    usa_alarme = hasattr(signal, 'setitimer')
+    if usa_alarme:
+        anterior = signal.signal(signal.SIGALRM, _alarme)
+        signal.setitimer(signal.ITIMER_REAL, limite_rigido)
+
+    extras = {}
+    if perfil and algoritmo in COM_PERFIL:
+        extras['perfil'] = PerfilBusca()
+    if trabalhadores and algoritmo in COM_TRABALHADORES:
+        extras['trabalhadores'] = trabalhadores
+    inicio = time.perf_counter()
+    try:
+        barras, desperdicio = ALGORITMOS[algoritmo](instancia, max_iter, tempo_limite, limite, semente, **extras)
+        resultado['barras'] = len(barras)
+        resultado['desperdicio'] = desperdicio
+        resultado['gap'] = calcular_gap(len(barras), limite)
+    except TempoEsgotado:
+        resultado['status'] = 'tempo_esgotado'
+    except Exception as erro:
+        resultado['status'] = 'erro'
+        resultado['erro'] = repr(erro)
+    finally:
+        if usa_alarme:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, anterior)
+    resultado['tempo'] = time.perf_counter() - inicio
+    if 'perfil' in extras:
+        resultado['perfil'] = extras['perfil'].como_dict()
+    return resultado
+
+# ==========================================
+# 4. LOTE PARALELO
+# ==========================================
+def gerar_sementes(semente_base, repeticoes):
+    """Sementes determinísticas para execuções repetidas: base, base+1, ..."""
+    return [semente_base + k for k in range(repeticoes)]
+
+def gerar_trabalhos(caminhos, algoritmos, sementes=(0,)):
+    """Lista determinística de trabalhos; cada um carrega sua própria semente."""
+    return [(caminho, algoritmo, semente)
+            for caminho in caminhos for algoritmo in algoritmos for semente in sementes]
+
+def rodar_lote(caminhos, algoritmos=('ffd', 'bl_avancada'), sementes=(0,), max_iter=None,
+               tempo_limite=30, limite_rigido=None, processos=None, armazem=None, perfil=False,
+               trabalhadores=1):
+    """
+    Distribui instância x algoritmo x semente num pool de processos e produz os
+    resultados na ordem em que terminam (gerador). trabalhadores limita os
+    processos de cada portfólio (padrão 1): o pool já ocupa os núcleos.
+    """
+    for algoritmo in algoritmos:
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconhecido: {algoritmo}")
+    trabalhos = gerar_trabalhos(caminhos, algoritmos, sementes)
+    with ProcessPoolExecutor(max_workers=processos or os.cpu_count()) as pool:
+        futuros = [pool.submit(executar_trabalho, caminho, algoritmo, semente,
+                               max_iter, tempo_limite, limite_rigido, armazem, perfil, trabalhadores)
+                   for caminho, algoritmo, semente in trabalhos]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+def resumir(resultados):
+    """Agrega por (grupo, algoritmo): execuções, barras, limite inferior, desperdício e tempo."""
+    resumo = {}
+    for r in resultados:
+        chave = (r['grupo'], r['algoritmo'])
+        linha = resumo.setdefault(chave, {'execucoes': 0, 'ok': 0, 'barras': 0, 'limite': 0,
+                                          'otimas': 0, 'desperdicio': 0, 'tempo': 0.0})
+        linha['execucoes'] += 1
+        linha['tempo'] += r['tempo']
+        if r['status'] == 'ok':
+            linha['ok'] += 1
+            linha['barras'] += r['barras']
+            linha['limite'] += r['limite_inferior']
+            linha['otimas'] += r['barras'] == r['limite_inferior']
+            linha['desperdicio'] += r['desperdicio']
+    return resumo
+
+def imprimir_resumo(resumo):
+    print(f"{'Grupo':<12} | {'Método':<12} | {'OK':<9} | {'Barras':<8} | {'LB':<8} | {'Gap':<7} | "
+          f"{'Ótimas':<7} | {'Desperdício':<12} | {'Tempo médio(s)':<10}")
+    print("-" * 110)
+    for (grupo, algoritmo), linha in sorted(resumo.items()):
+        ok = f"{linha['ok']}/{linha['execucoes']}"
+        tempo_medio = linha['tempo'] / linha['execucoes']
+        gap = f"{calcular_gap(linha['barras'], linha['limite']):.2f}%"
+        print(f"{grupo:<12} | {algoritmo:<12} | {ok:<9} | {linha['barras']:<8} | {linha['limite']:<8} | {gap:<7} | "
+              f"{linha['otimas']:<7} | {linha['desperdicio']:<12} | {tempo_medio:.4f}")
+
+def imprimir_resultado(r):
+    if r['status'] == 'ok':
+        print(f"{r['instancia']:<30} | {r['algoritmo']:<12} | {r['barras']:<6} | {r['limite_inferior']:<6} | "
+              f"{r['desperdicio']:<12} | {r['tempo']:.4f}")
+    else:
+        print(f"{r['instancia']:<30} | {r['algoritmo']:<12} | {r['status']} {r.get('erro', '')}")
+
+# ==========================================
+# MAIN
+# ==========================================
+if __name__ == "__main__":
+    caminhos = listar_instancias(SUITE_NOTURNA)
+    print(f"=== LOTE: {len(caminhos)} instâncias em {os.cpu_count()} processos ===")
+    inicio = time.perf_counter()
+    resultados = []
+    for r in rodar_lote(caminhos):
+        imprimir_resultado(r)
+        resultados.append(r)
+    print()
+    imprimir_resumo(resumir(resultados))
+    print(f"\nTempo total: {time.perf_counter() - inicio:.1f}s")
@@ -0,0 +1,104 @@
+from functools import lru_cache
+
+# ==========================================
+# PROBLEMAS DE MOCHILA USADOS PELOS SOLVERS
+# ==========================================
+def mochila_limitada(valores, pesos, limites, capacidade, max_nos=200000):
+    """
+    Mochila inteira limitada: max sum(v_i * a_i) com sum(w_i * a_i) <= capacidade
+    e 0 <= a_i <= limites[i]. Branch-and-bound em profundidade (Horowitz-Sahni) com
+    o limitante fracionário de Dantzig; tipos em ordem decrescente de valor/peso.
+    Retorna (valor, quantidades). Se max_nos for atingido, devolve a melhor
+    solução encontrada até ali, que pode não ser ótima.
+    """
+    n = len(valores)
+    ordem = [i for i in range(n)
+             if valores[i] > 0 and pesos[i] <= capacidade and limites[i] > 0]
+    ordem.sort(key=lambda i: valores[i] / pesos[i], reverse=True)
+
+    melhor = [0.0, [0] * n]
+    atual = [0] * n
+    nos = [0]
+
+    def limitante(k, livre):
+        """Valor fracionário máximo com os tipos ordem[k:] e folga livre."""
+        total = 0.0
+        for i in ordem[k:]:
+            if livre <= 0:
+                break
+            qtd = min(limites[i], livre // pesos[i])
+            total += qtd * valores[i]
+            livre -= qtd * pesos[i]
+            if qtd < limites[i] and livre > 0:
+                return total + valores[i] * livre / pesos[i]
+        return total
+
+    def explorar(k, livre, valor):
+        nos[0] += 1
+        if valor > melhor[0]:
+            melhor[0] = valor
+            melhor[1] = list(atual)
+        if k == len(ordem) or nos[0] > max_nos:
+            return
+        if valor + limitante(k, livre) <= melhor[0] + 1e-9:
+            return
+        i = ordem[k]
+        for qtd in range(min(limites[i], livre // pesos[i]), -1, -1):
+            atual[i] = qtd
+            explorar(k + 1, livre - qtd * pesos[i], valor + qtd * valores[i])
+        atual[i] = 0
+
+    explorar(0, capacidade, 0.0)
+    return melhor[0], melhor[1]
+
+def soma_subconjuntos_limitada(pesos, limites, capacidade):
+    """
+    Soma de subconjuntos limitada: maior carga sum(w_i * a_i) <= capacidade com
+    0 <= a_i <= limites[i], por programação dinâmica O(m * capacidade).
+    origem[c] guarda o tipo que alcançou a carga c pela primeira vez e qtd[c]
+    quantas cópias dele foram usadas; c - qtd[c] * w já era alcançável pelos
+    tipos anteriores, o que permite reconstruir a solução.
+    Retorna (carga, quantidades).
+    """
+    capacidade = min(capacidade, sum(w * u for w, u in zip(pesos, limites)))
+    origem = [-1] * (capacidade + 1)
+    qtd = [0] * (capacidade + 1)
+    origem[0] = len(pesos)
+    for i, (w, u) in enumerate(zip(pesos, limites)):
+        if origem[capacidade] != -1:
+            break
+        if u <= 0:
+            continue
+        for c in range(w, capacidade + 1):
+            if origem[c] != -1:
+                continue
+            anterior = origem[c - w]
+            if anterior == i:
+                if qtd[c - w] < u:
+                    origem[c] = i
+                    qtd[c] = qtd[c - w] + 1
+            elif anterior != -1:
+                origem[c] = i
+                qtd[c] = 1
+
+    carga = capacidade
+    while origem[carga] == -1:
+        carga -= 1
+    quantidades = [0] * len(pesos)
+    c = carga
+    while c > 0:
+        i = origem[c]
+        quantidades[i] += qtd[c]
+        c -= qtd[c] * pesos[i]
+    return carga, quantidades
+
+@lru_cache(maxsize=4096)
+def enchimento_maximo(capacidade, tipos):
+    """
+    soma_subconjuntos_limitada memorizada por (capacidade, multiconjunto), com
+    tipos = tupla ordenada de (tamanho, quantidade). Buscas locais repetem os
+    mesmos conjuntos de itens muitas vezes, e aí a tabela não é refeita.
+    Retorna (carga, quantidades) com quantidades alinhadas a tipos.
+    """
+    carga, quantidades = soma_subconjuntos_limitada([w for w, _ in tipos], [u for _, u in tipos], capacidade)
+    return carga, tuple(quantidades)
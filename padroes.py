@@ -0,0 +1,218 @@
+import time
+
+from limites import calcular_limite_inferior
+
+# ==========================================
+# 1. SOLUÇÃO POR PADRÕES COM MULTIPLICIDADE
+# ==========================================
+class SolucaoPadroes:
+    """
+    Solução compacta: cada padrão de corte é um vetor de quantidades por tipo
+    (na ordem de tamanhos, decrescente) associado ao número de barras cortadas
+    daquele jeito. 300 barras iguais ocupam uma entrada, e carga, desperdício
+    e contagem de barras custam O(padrões distintos).
+    """
+
+    def __init__(self, capacidade, tamanhos, padroes=None):
+        self.capacidade = capacidade
+        self.tamanhos = tuple(tamanhos)
+        self.padroes = {}
+        self._cargas = {}
+        for padrao, multiplicidade in (padroes or {}).items():
+            self.adicionar(tuple(padrao), multiplicidade)
+
+    # --- conversões ---
+    @classmethod
+    def de_agregadas(cls, capacidade, barras):
+        """A partir de barras {tamanho: quantidade} (ex.: resolver_ffd_agregado)."""
+        tamanhos = sorted({t for barra in barras for t in barra}, reverse=True)
+        solucao = cls(capacidade, tamanhos)
+        for barra in barras:
+            solucao.adicionar(tuple(barra.get(t, 0) for t in tamanhos), 1)
+        return solucao
+
+    @classmethod
+    def de_barras(cls, capacidade, barras):
+        """A partir do formato de listas de itens usado pelas buscas locais."""
+        tamanhos = sorted({item for barra in barras for item in barra}, reverse=True)
+        posicao = {t: i for i, t in enumerate(tamanhos)}
+        solucao = cls(capacidade, tamanhos)
+        for barra in barras:
+            padrao = [0] * len(tamanhos)
+            for item in barra:
+                padrao[posicao[item]] += 1
+            solucao.adicionar(tuple(padrao), 1)
+        return solucao
+
+    def para_agregadas(self):
+        barras = []
+        for padrao, multiplicidade in self.padroes.items():
+            barra = {t: q for t, q in zip(self.tamanhos, padrao) if q}
+            barras.extend(dict(barra) for _ in range(multiplicidade))
+        return barras
+
+    def para_barras(self):
+        barras = []
+        for padrao, multiplicidade in self.padroes.items():
+            barra = [t for t, q in zip(self.tamanhos, padrao) for _ in range(q)]
+            barras.extend(list(barra) for _ in range(multiplicidade))
+        return barras
+
+    # --- consultas ---
+    def carga(self, padrao):
+        carga = self._cargas.get(padrao)
+        if carga is None:
+            carga = sum(t * q for t, q in zip(self.tamanhos, padrao))
+            self._cargas[padrao] = carga
+        return carga
+
+    @property
+    def num_barras(self):
+        return sum(self.padroes.values())
+
+    @property
+    def desperdicio(self):
+        return sum(m * (self.capacidade - self.carga(p)) for p, m in self.padroes.items())
+
+    def contagem(self):
+        """Demanda atendida {tamanho: quantidade}."""
+        total = [0] * len(self.tamanhos)
+        for padrao, multiplicidade in self.padroes.items():
+            for i, q in enumerate(padrao):
+                total[i] += q * multiplicidade
+        return {t: q for t, q in zip(self.tamanhos, total) if q}
+
+    # --- alterações ---
+    def adicionar(self, padrao, multiplicidade):
+        if multiplicidade <= 0 or not any(padrao):
+            return
+        self.padroes[padrao] = self.padroes.get(padrao, 0) + multiplicidade
+
+    def remover(self, padrao, multiplicidade):
+        restante = self.padroes[padrao] - multiplicidade
+        if restante:
+            self.padroes[padrao] = restante
+        else:
+            del self.padroes[padrao]
+
+def calcular_desperdicio_padroes(solucao):
+    return solucao.desperdicio
+
+# ==========================================
+# 2. BUSCA LOCAL SOBRE CLASSES DE BARRAS IGUAIS
+# ==========================================
+# Um movimento entre os padrões P (p barras) e Q (q barras) é aplicado de uma vez
+# em k = min(p, q) pares de barras, ou p // 2 pares se P == Q. O ganho por par é
+# o mesmo da busca por itens (desperdício economizado, aumento da soma dos
+# quadrados das cargas), multiplicado por k.
+
+def _pares(solucao, p, q):
+    return solucao.padroes[p] // 2 if p == q else min(solucao.padroes[p], solucao.padroes[q])
+
+def _com(padrao, i, delta):
+    novo = list(padrao)
+    novo[i] += delta
+    return tuple(novo)
+
+def consolidar_padroes(solucao):
+    """Junta pares de barras de dois padrões que cabem numa barra só."""
+    classes = sorted(solucao.padroes, key=solucao.carga)
+    for a, p in enumerate(classes):
+        for q in classes[a:]:
+            if solucao.carga(p) + solucao.carga(q) > solucao.capacidade:
+                break
+            k = _pares(solucao, p, q)
+            if k:
+                solucao.remover(p, k)
+                solucao.remover(q, k)
+                solucao.adicionar(tuple(x + y for x, y in zip(p, q)), k)
+                return True
+    return False
+
+def realocar_padroes(solucao):
+    """Melhor realocação de um item de tipo i de P para Q, aplicada em k pares."""
+    capacidade = solucao.capacidade
+    melhor_ganho = (0, 0)
+    melhor = None
+    classes = list(solucao.padroes)
+    for p in classes:
+        carga_p = solucao.carga(p)
+        for i, qtd in enumerate(p):
+            if not qtd:
+                continue
+            w = solucao.tamanhos[i]
+            for q in classes:
+                carga_q = solucao.carga(q)
+                if carga_q + w > capacidade:
+                    continue
+                k = _pares(solucao, p, q)
+                if not k:
+                    continue
+                ganho_desp = capacidade if carga_p == w else 0
+                ganho = (k * ganho_desp, k * 2 * w * (carga_q - carga_p + w))
+                if ganho > melhor_ganho:
+                    melhor_ganho = ganho
+                    melhor = (p, q, i, k)
+    if melhor is None:
+        return False
+    p, q, i, k = melhor
+    solucao.remover(p, k)
+    solucao.remover(q, k)
+    solucao.adicionar(_com(p, i, -1), k)
+    solucao.adicionar(_com(q, i, +1), k)
+    return True
+
+def trocar_padroes(solucao):
+    """Melhor troca: P entrega um item do tipo i e recebe um maior do tipo j de Q."""
+    capacidade = solucao.capacidade
+    tamanhos = solucao.tamanhos
+    melhor_ganho = (0, 0)
+    melhor = None
+    classes = list(solucao.padroes)
+    for p in classes:
+        carga_p = solucao.carga(p)
+        folga_p = capacidade - carga_p
+        for i, qtd_i in enumerate(p):
+            if not qtd_i:
+                continue
+            # tipos em ordem decrescente: j < i são os maiores que o tipo i
+            for j in range(i - 1, -1, -1):
+                delta = tamanhos[j] - tamanhos[i]
+                if delta > folga_p:
+                    break
+                for q in classes:
+                    if not q[j]:
+                        continue
+                    k = _pares(solucao, p, q)
+                    if not k:
+                        continue
+                    ganho = (0, k * 2 * delta * (carga_p - solucao.carga(q) + delta))
+                    if ganho > melhor_ganho:
+                        melhor_ganho = ganho
+                        melhor = (p, q, i, j, k)
+    if melhor is None:
+        return False
+    p, q, i, j, k = melhor
+    solucao.remover(p, k)
+    solucao.remover(q, k)
+    solucao.adicionar(_com(_com(p, i, -1), j, +1), k)
+    solucao.adicionar(_com(_com(q, j, -1), i, +1), k)
+    return True
+
+def busca_local_padroes(solucao, max_iter=10000, tempo_limite=30, limite_inferior=None):
+    """
+    Busca local sobre a SolucaoPadroes (alterada no lugar): consolidação, depois
+    realocação e troca, cada movimento aplicado a uma classe inteira de barras
+    iguais. O custo por iteração depende do número de padrões distintos, não de
+    barras. Para no limite inferior, sem melhoria, por iterações ou por tempo.
+    Retorna (solucao, desperdicio, tempo).
+    """
+    inicio = time.time()
+    if limite_inferior is None:
+        limite_inferior = calcular_limite_inferior(solucao.capacidade, solucao.contagem())
+    for _ in range(max_iter):
+        if solucao.num_barras <= limite_inferior or time.time() - inicio > tempo_limite:
+            break
+        if not (consolidar_padroes(solucao) or realocar_padroes(solucao) or trocar_padroes(solucao)):
+            break
+    return solucao, solucao.desperdicio, time.time() - inicio
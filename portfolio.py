@@ -0,0 +1,129 @@
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from heuristicas_v3 import (resolver_ffd_agregado, resolver_bfd, resolver_ffd_aleatorio,
+                            expandir_barras, busca_local_avancada)
+from limites import calcular_limite_inferior
+
+# ==========================================
+# 1. SOLUÇÕES DE PARTIDA
+# ==========================================
+PARTIDAS = ('ffd', 'bfd', 'ffd_aleatorio')
+
+def solucao_de_partida(instancia, partida, semente=0):
+    """Barras em listas para a partida 'ffd', 'bfd' ou 'ffd_aleatorio' (esta depende da semente)."""
+    if partida == 'ffd':
+        barras, _, _ = resolver_ffd_agregado(instancia)
+        return expandir_barras(barras)
+    if partida == 'bfd':
+        barras, _, _ = resolver_bfd(instancia.capacidade, instancia.itens_expandidos())
+        return barras
+    if partida == 'ffd_aleatorio':
+        barras, _, _ = resolver_ffd_aleatorio(instancia.capacidade, instancia.itens_expandidos(),
+                                              random.Random(semente))
+        return barras
+    raise ValueError(f"Partida desconhecida: {partida}")
+
+def portfolio_padrao(trabalhadores, semente=0):
+    """FFD e BFD determinísticos e o resto com FFD aleatório; cada um com sua semente."""
+    base = [('ffd', semente), ('bfd', semente + 1)]
+    extras = [('ffd_aleatorio', semente + k) for k in range(2, trabalhadores)]
+    return (base + extras)[:max(1, trabalhadores)]
+
+# ==========================================
+# 2. TRABALHADORES COM INCUMBENTE COMPARTILHADO
+# ==========================================
+# Cada processo recebe no inicializador um multiprocessing.Value com o menor
+# número de barras já encontrado por qualquer trabalhador.
+_incumbente = None
+
+def _iniciar_trabalhador(incumbente):
+    global _incumbente
+    _incumbente = incumbente
+
+def _publicar(num_barras):
+    with _incumbente.get_lock():
+        if num_barras < _incumbente.value:
+            _incumbente.value = num_barras
+
+def _trabalhador(instancia, partida, semente, max_iter, prazo, limite, paciencia):
+    """
+    Uma trajetória da busca_local_avancada. Para quando outro trabalhador já
+    atingiu o limite inferior, ou quando está atrás do incumbente e não melhora
+    há paciencia segundos.
+    """
+    inicio = time.time()
+    barras = solucao_de_partida(instancia, partida, semente)
+    _publicar(len(barras))
+    ultima_melhoria = [len(barras), time.time()]
+    motivo = ['prazo']
+
+    def parar(melhor_num_barras):
+        agora = time.time()
+        if melhor_num_barras < ultima_melhoria[0]:
+            ultima_melhoria[:] = [melhor_num_barras, agora]
+            _publicar(melhor_num_barras)
+        incumbente = _incumbente.value
+        if incumbente <= limite < melhor_num_barras:
+            motivo[0] = 'otimo_de_outro'
+            return True
+        if melhor_num_barras > incumbente and agora - ultima_melhoria[1] > paciencia:
+            motivo[0] = 'dominado'
+            return True
+        return False
+
+    barras, desperdicio, _ = busca_local_avancada(instancia.capacidade, barras, max_iter=max_iter,
+                                                  tempo_limite=max(0.0, prazo - time.time()),
+                                                  limite_inferior=limite, semente=semente, parar=parar)
+    _publicar(len(barras))
+    if len(barras) <= limite:
+        motivo[0] = 'otimo'
+    return {
+        'partida': partida,
+        'semente': semente,
+        'barras': barras,
+        'num_barras': len(barras),
+        'desperdicio': desperdicio,
+        'tempo': time.time() - inicio,
+        'parada': motivo[0],
+    }
+
+# ==========================================
+# 3. PORTFÓLIO
+# ==========================================
+def resolver_portfolio(instancia, trabalhadores=None, tempo_limite=30, max_iter=None, semente=0,
+                       paciencia=1.0, limite_inferior=None, portfolio=None):
+    """
+    Roda várias trajetórias da busca local em paralelo, uma por processo, a partir
+    de partidas diferentes (portfolio: lista de (partida, semente); padrão
+    portfolio_padrao). Todas dividem o mesmo prazo de tempo_limite segundos e o
+    incumbente, então trabalhadores fracos param cedo e todos param quando um
+    deles prova a otimalidade. Retorna (barras, desperdicio, tempo, execucoes),
+    com execucoes sem as barras, na ordem do portfólio. Sem trabalhadores, usa
+    os.cpu_count() no processo principal e 1 dentro de um processo filho (ex.:
+    um trabalho de lote.py), para não abrir N x N processos.
+    """
+    inicio = time.time()
+    prazo = inicio + tempo_limite
+    if not trabalhadores:
+        trabalhadores = 1 if multiprocessing.parent_process() is not None else os.cpu_count()
+    portfolio = portfolio or portfolio_padrao(trabalhadores, semente)
+    if limite_inferior is None:
+        limite_inferior = calcular_limite_inferior(instancia.capacidade, instancia.contagem())
+
+    incumbente = multiprocessing.Value('q', instancia.total_itens + 1)
+    with ProcessPoolExecutor(max_workers=min(trabalhadores, len(portfolio)),
+                             initializer=_iniciar_trabalhador, initargs=(incumbente,)) as pool:
+        futuros = {pool.submit(_trabalhador, instancia, partida, semente_k, max_iter or 500, prazo,
+                               limite_inferior, paciencia): k
+                   for k, (partida, semente_k) in enumerate(portfolio)}
+        execucoes = [None] * len(portfolio)
+        for futuro in as_completed(futuros):
+            execucoes[futuros[futuro]] = futuro.result()
+
+    melhor = min(execucoes, key=lambda r: (r['num_barras'], r['desperdicio']))
+    resumo = [{campo: valor for campo, valor in r.items() if campo != 'barras'} for r in execucoes]
+    return melhor['barras'], melhor['desperdicio'], time.time() - inicio, resumo
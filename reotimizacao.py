@@ -0,0 +1,182 @@
+import heapq
+import time
+from itertools import zip_longest
+
+from heuristicas_v3 import ArvoreResidual, busca_local_avancada
+from limites import calcular_limite_inferior, contagem_de_barras
+
+# ==========================================
+# RE-OTIMIZAÇÃO INCREMENTAL APÓS MUDANÇA DE DEMANDA
+# ==========================================
+def diferenca_demandas(antiga, nova):
+    """Delta {tamanho: variação} entre duas contagens {tamanho: demanda} (ex.: Instancia.contagem())."""
+    delta = {}
+    for tamanho in set(antiga) | set(nova):
+        variacao = nova.get(tamanho, 0) - antiga.get(tamanho, 0)
+        if variacao:
+            delta[tamanho] = variacao
+    return delta
+
+class PedidoIncremental:
+    """
+    Solução de um pedido mantida entre alterações. Os índices são atualizados só
+    nas barras alteradas, então aplicar() custa em função do tamanho da mudança
+    (e da busca sobre as barras em foco), não do pedido inteiro:
+    - por_tamanho: tamanho -> heap de (carga, barra) para achar a barra menos
+      carregada que contém o tamanho; entradas vencidas são descartadas na leitura;
+    - por_folga + ArvoreResidual indexada pela folga (folha f vale f se alguma
+      barra tem folga f, senão -1): best-fit em O(log C) e barras mais vazias
+      percorrendo as folgas distintas, no máximo C + 1.
+    Barras esvaziadas ficam como listas vazias e o índice é reaproveitado.
+    """
+
+    def __init__(self, capacidade, barras):
+        self.capacidade = capacidade
+        self.barras = [list(barra) for barra in barras if barra]
+        self.cargas = [sum(barra) for barra in self.barras]
+        self.desperdicio = sum(capacidade - carga for carga in self.cargas)
+        self.num_barras = len(self.barras)
+        self.contagem = contagem_de_barras(self.barras)
+        self.livres = []
+        self.por_folga = {}
+        self.por_tamanho = {}
+        self.arvore = ArvoreResidual(-1, capacidade + 1)
+        for idx in range(len(self.barras)):
+            self._indexar(idx)
+
+    def para_listas(self):
+        return [list(barra) for barra in self.barras if barra]
+
+    # --- índices ---
+    def _indexar(self, idx):
+        carga = self.cargas[idx]
+        folga = self.capacidade - carga
+        if folga >= 0:  # barras com item maior que a capacidade não recebem nada
+            if folga not in self.por_folga:
+                self.por_folga[folga] = set()
+                self.arvore.atualizar(folga, folga)
+            self.por_folga[folga].add(idx)
+        for tamanho in set(self.barras[idx]):
+            heapq.heappush(self.por_tamanho.setdefault(tamanho, []), (carga, idx))
+
+    def _desindexar(self, idx):
+        folga = self.capacidade - self.cargas[idx]
+        indices = self.por_folga.get(folga)
+        if indices is not None:
+            indices.discard(idx)
+            if not indices:
+                del self.por_folga[folga]
+                self.arvore.atualizar(folga, -1)
+
+    def _substituir(self, idx, barra):
+        """Troca o conteúdo da barra idx (idx == len(barras) abre uma nova)."""
+        if idx == len(self.barras):
+            self.barras.append([])
+            self.cargas.append(0)
+        antiga = self.barras[idx]
+        if antiga:
+            self._desindexar(idx)
+            self.desperdicio -= self.capacidade - self.cargas[idx]
+            self.num_barras -= 1
+            for item in antiga:
+                self.contagem[item] -= 1
+        self.barras[idx] = barra
+        self.cargas[idx] = sum(barra)
+        if barra:
+            self.desperdicio += self.capacidade - self.cargas[idx]
+            self.num_barras += 1
+            for item in barra:
+                self.contagem[item] = self.contagem.get(item, 0) + 1
+            self._indexar(idx)
+        else:
+            self.livres.append(idx)
+
+    def _nova_barra(self):
+        return self.livres.pop() if self.livres else len(self.barras)
+
+    # --- alteração do pedido ---
+    def _retirar(self, tamanho, quantidade, tocadas):
+        """Retira cópias de tamanho começando pelas barras menos carregadas que o contêm."""
+        heap = self.por_tamanho.get(tamanho, [])
+        while quantidade:
+            carga, idx = heap[0]
+            barra = self.barras[idx]
+            if self.cargas[idx] != carga or tamanho not in barra:
+                heapq.heappop(heap)  # entrada vencida
+                continue
+            heapq.heappop(heap)
+            restantes = list(barra)
+            while quantidade and tamanho in restantes:
+                restantes.remove(tamanho)
+                quantidade -= 1
+            self._substituir(idx, restantes)
+            tocadas.add(idx)
+
+    def _inserir(self, item, tocadas):
+        """Best-fit: barra de menor folga que comporta o item, ou uma barra nova."""
+        folga = self.arvore.primeira_com_folga(item)
+        if 0 <= folga <= self.capacidade:
+            idx = next(iter(self.por_folga[folga]))
+            barra = self.barras[idx] + [item]
+        else:
+            idx = self._nova_barra()
+            barra = [item]
+        self._substituir(idx, barra)
+        tocadas.add(idx)
+
+    def _mais_vazias(self, quantidade, excluir):
+        vazias = []
+        for folga in sorted(self.por_folga, reverse=True):
+            for idx in self.por_folga[folga]:
+                if idx not in excluir:
+                    vazias.append(idx)
+                    if len(vazias) == quantidade:
+                        return vazias
+        return vazias
+
+    def aplicar(self, delta, vizinhas=10, max_iter=200, tempo_limite=1.0, semente=0):
+        """
+        Aplica delta {tamanho: variação}: negativos retiram itens, positivos
+        inserem em best-fit (maiores primeiro). Depois a busca_local_avancada roda
+        só sobre as barras tocadas e as `vizinhas` barras mais vazias das demais,
+        com o limite inferior desse subconjunto, e o resultado volta para os
+        mesmos índices. Retorna (desperdicio, tempo, num_tocadas).
+        """
+        inicio = time.time()
+        for tamanho, variacao in delta.items():
+            if variacao < 0 and self.contagem.get(tamanho, 0) < -variacao:
+                raise ValueError(f"Delta retira {-variacao} itens de tamanho {tamanho}, "
+                                 f"mas a solução tem {self.contagem.get(tamanho, 0)}")
+        tocadas = set()
+        for tamanho, variacao in delta.items():
+            if variacao < 0:
+                self._retirar(tamanho, -variacao, tocadas)
+        novos = sorted((tamanho for tamanho, variacao in delta.items() if variacao > 0
+                        for _ in range(variacao)), reverse=True)
+        for item in novos:
+            self._inserir(item, tocadas)
+
+        tocadas = {idx for idx in tocadas if self.barras[idx]}
+        foco = sorted(tocadas) + self._mais_vazias(vizinhas, tocadas)
+        subconjunto = [self.barras[idx] for idx in foco]
+        if subconjunto:
+            limite = calcular_limite_inferior(self.capacidade, contagem_de_barras(subconjunto))
+            novas, _, _ = busca_local_avancada(self.capacidade, subconjunto, max_iter=max_iter,
+                                               tempo_limite=tempo_limite, limite_inferior=limite,
+                                               semente=semente)
+            for idx, barra in zip_longest(foco, novas):
+                self._substituir(self._nova_barra() if idx is None else idx, list(barra or []))
+        return self.desperdicio, time.time() - inicio, len(tocadas)
+
+def reotimizar(capacidade, barras, delta, vizinhas=10, max_iter=200, tempo_limite=1.0, semente=0):
+    """
+    Ajusta uma solução já calculada a uma alteração de pedido (ver
+    PedidoIncremental.aplicar). Monta os índices a cada chamada, o que custa
+    O(pedido); para várias alterações sobre o mesmo pedido, mantenha um
+    PedidoIncremental. Retorna (barras, desperdicio, tempo, num_tocadas); a
+    lista recebida não é alterada.
+    """
+    inicio = time.time()
+    pedido = PedidoIncremental(capacidade, barras)
+    desperdicio, _, num_tocadas = pedido.aplicar(delta, vizinhas, max_iter, tempo_limite, semente)
+    return pedido.para_listas(), desperdicio, time.time() - inicio, num_tocadas
@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_solucoes import impressao_digital
+from heuristicas_v3 import (Instancia, ler_instancia_texto, resolver_ffd_agregado, expandir_barras,
+                            busca_local_avancada)
+from limites import calcular_gap, calcular_limite_inferior
+
+# ==========================================
+# 1. TRABALHO EXECUTADO NO POOL
+# ==========================================
+def _resolver_no_processo(capacidade, tamanhos, demandas, orcamento, semente):
+    """
+    FFD + busca_local_avancada dentro do orçamento; roda num processo do pool.
+    inicio_processo (time.time(), comparável entre processos) marca quando o
+    trabalho saiu da fila do pool.
+    """
+    inicio_processo = time.time()
+    inicio = time.perf_counter()
+    instancia = Instancia.de_vetores(capacidade, tamanhos, demandas)
+    limite = calcular_limite_inferior(capacidade, instancia.contagem())
+    barras_ffd, _, _ = resolver_ffd_agregado(instancia)
+    barras, desperdicio, _ = busca_local_avancada(capacidade, expandir_barras(barras_ffd),
+                                                  tempo_limite=orcamento, limite_inferior=limite,
+                                                  semente=semente)
+    return {
+        'barras': barras,
+        'num_barras': len(barras),
+        'desperdicio': desperdicio,
+        'limite_inferior': limite,
+        'gap': calcular_gap(len(barras), limite),
+        'tempo_solver': time.perf_counter() - inicio,
+        'inicio_processo': inicio_processo,
+    }
+
+# ==========================================
+# 2. SERVIÇO ASSÍNCRONO
+# ==========================================
+class ServicoSobrecarregado(Exception):
+    """A fila do serviço está cheia e o pedido pediu para não esperar."""
+
+class ServicoCorte:
+    """
+    Frente assíncrona para as heurísticas: await resolver(instancia, orcamento)
+    não bloqueia o loop de eventos, pois o trabalho vai para um ProcessPoolExecutor.
+    Pedidos idênticos em andamento (mesma impressão digital de instância,
+    orçamento e semente) compartilham uma única execução. No máximo
+    max_pendentes execuções distintas ficam na fila ou rodando; acima disso
+    resolver espera uma vaga ou, com esperar=False, levanta ServicoSobrecarregado.
+    """
+
+    def __init__(self, processos=None, max_pendentes=None):
+        self.processos = processos or os.cpu_count()
+        self.max_pendentes = max_pendentes or 4 * self.processos
+        self._pool = ProcessPoolExecutor(max_workers=self.processos)
+        self._vagas = asyncio.Semaphore(self.max_pendentes)
+        self._em_andamento = {}
+        self.estatisticas = {'pedidos': 0, 'execucoes': 0, 'compartilhados': 0, 'recusados': 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *erro):
+        await self.fechar()
+
+    async def fechar(self):
+        await asyncio.get_running_loop().run_in_executor(None, self._pool.shutdown)
+
+    @property
+    def pendentes(self):
+        return len(self._em_andamento)
+
+    async def resolver(self, instancia, orcamento=1.0, semente=0, esperar=True):
+        """
+        Resolve a Instancia em até orcamento segundos de busca. Retorna o dicionário
+        de _resolver_no_processo acrescido de latencia (chegada até resposta),
+        espera (da chegada da execução até um processo começar a rodá-la),
+        espera_vaga (a parte da espera por uma das max_pendentes vagas) e
+        compartilhado (se pegou carona numa execução idêntica já em andamento).
+        """
+        chegada = time.perf_counter()
+        self.estatisticas['pedidos'] += 1
+        chave = impressao_digital(instancia, {'orcamento': orcamento, 'semente': semente})
+        execucao = self._em_andamento.get(chave)
+        compartilhado = execucao is not None
+        if compartilhado:
+            self.estatisticas['compartilhados'] += 1
+        else:
+            if not esperar and self._vagas.locked():
+                self.estatisticas['recusados'] += 1
+                raise ServicoSobrecarregado(f"{self.max_pendentes} execuções pendentes")
+            execucao = asyncio.ensure_future(self._executar(chave, instancia, orcamento, semente))
+            self._em_andamento[chave] = execucao
+        # shield: um chamador cancelado não derruba a execução dos outros
+        resultado = dict(await asyncio.shield(execucao))
+        resultado['latencia'] = time.perf_counter() - chegada
+        resultado['compartilhado'] = compartilhado
+        return resultado
+
+    async def resolver_texto(self, texto, orcamento=1.0, semente=0, esperar=True):
+        """Como resolver, recebendo a instância no formato de arquivo CUTGEN/fiber."""
+        return await self.resolver(ler_instancia_texto(texto), orcamento, semente, esperar)
+
+    async def _executar(self, chave, instancia, orcamento, semente):
+        try:
+            entrada = time.time()
+            async with self._vagas:
+                espera_vaga = time.time() - entrada
+                self.estatisticas['execucoes'] += 1
+                resultado = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, _resolver_no_processo, instancia.capacidade, array('q', instancia.tamanhos),
+                    array('q', instancia.demandas), orcamento, semente)
+            # inclui a fila interna do ProcessPoolExecutor, não só a do semáforo
+            resultado['espera'] = max(0.0, resultado.pop('inicio_processo') - entrada)
+            resultado['espera_vaga'] = espera_vaga
+            return resultado
+        finally:
+            del self._em_andamento[chave]
+
+# ==========================================
+# 3. CLIENTE LOCAL
+# ==========================================
+async def cliente_local(servico, caminhos, orcamento=1.0, repeticoes=1):
+    """
+    Dispara todos os pedidos de uma vez, como um front-end web faria, e devolve
+    [(caminho, resultado)]. Com repeticoes > 1 cada arquivo é pedido várias
+    vezes, o que exercita a deduplicação.
+    """
+    textos = {}
+    for caminho in caminhos:
+        with open(caminho) as f:
+            textos[caminho] = f.read()
+    pedidos = [caminho for caminho in caminhos for _ in range(repeticoes)]
+    resultados = await asyncio.gather(*(servico.resolver_texto(textos[c], orcamento) for c in pedidos))
+    return list(zip(pedidos, resultados))
+
+async def _principal(args):
+    from lote import listar_instancias
+    async with ServicoCorte(args.processos, args.max_pendentes) as servico:
+        inicio = time.perf_counter()
+        respostas = await cliente_local(servico, listar_instancias(args.instancias), args.orcamento,
+                                        args.repeticoes)
+        total = time.perf_counter() - inicio
+        print(f"{'Instância':<28} | {'Barras':<6} | {'LB':<6} | {'Espera(s)':<9} | {'Latência(s)':<11} | Compart.")
+        print("-" * 85)
+        for caminho, r in respostas:
+            print(f"{caminho:<28} | {r['num_barras']:<6} | {r['limite_inferior']:<6} | {r['espera']:<9.3f} | "
+                  f"{r['latencia']:<11.3f} | {'sim' if r['compartilhado'] else ''}")
+        latencias = sorted(r['latencia'] for _, r in respostas)
+        print(f"\n{len(respostas)} pedidos em {total:.2f}s; latência mediana {latencias[len(latencias) // 2]:.3f}s, "
+              f"máxima {latencias[-1]:.3f}s; {servico.estatisticas}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço assíncrono de corte com cliente local de teste.")
+    parser.add_argument('instancias', nargs='+')
+    parser.add_argument('-t', '--orcamento', type=float, default=1.0, help="segundos de busca por pedido")
+    parser.add_argument('-p', '--processos', type=int, default=None)
+    parser.add_argument('-q', '--max-pendentes', type=int, default=None)
+    parser.add_argument('-r', '--repeticoes', type=int, default=1, help="pedidos repetidos por arquivo")
+    asyncio.run(_principal(parser.parse_args(argv)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+# ==========================================
+# SOLUÇÃO MUTÁVEL COM DIÁRIO DE DESFAZER
+# ==========================================
+class SolucaoIncremental:
+    """
+    Solução mutável das buscas locais. Mantém a carga de cada barra, o número de
+    barras e a soma dos itens, então carga, desperdício e contagem custam O(1)
+    e cada movimento os atualiza em O(1). Barras esvaziadas ficam no lugar com
+    carga 0 para não invalidar índices e só somem em para_listas().
+
+    Todo movimento é anotado num diário; desfazer(ponto) reverte até uma marca
+    obtida com ponto(), o que permite testar movimentos sem copiar a solução.
+    confirmar() esvazia o diário depois que os movimentos foram aceitos.
+    """
+
+    def __init__(self, capacidade, barras):
+        self.capacidade = capacidade
+        self.barras = [list(barra) for barra in barras if barra]
+        self.cargas = [sum(barra) for barra in self.barras]
+        self.num_barras = len(self.barras)
+        self.soma_itens = sum(self.cargas)
+        self.diario = []
+
+    @property
+    def desperdicio(self):
+        return self.num_barras * self.capacidade - self.soma_itens
+
+    def folga(self, idx):
+        return self.capacidade - self.cargas[idx]
+
+    def indices_ativos(self):
+        return [idx for idx, barra in enumerate(self.barras) if barra]
+
+    def para_listas(self):
+        return [list(barra) for barra in self.barras if barra]
+
+    # --- simetrias ---
+    def representantes(self, indices):
+        """
+        Primeiro índice, na ordem dada, de cada classe de barras iguais (mesmo
+        multiconjunto de itens). Movimentos a partir de barras iguais levam a
+        soluções iguais, então as vizinhanças só precisam avaliar um representante.
+        """
+        vistos = set()
+        representantes = []
+        for idx in indices:
+            chave = tuple(sorted(self.barras[idx]))
+            if chave not in vistos:
+                vistos.add(chave)
+                representantes.append(idx)
+        return representantes
+
+    def primeiras_posicoes(self, idx):
+        """{tamanho: posição da primeira cópia} da barra idx, na ordem das posições."""
+        primeiras = {}
+        for pos, item in enumerate(self.barras[idx]):
+            primeiras.setdefault(item, pos)
+        return primeiras
+
+    # --- movimentos elementares ---
+    def remover(self, idx, pos):
+        """Retira o item na posição pos da barra idx (troca com o último, O(1))."""
+        barra = self.barras[idx]
+        item = barra[pos]
+        barra[pos] = barra[-1]
+        barra.pop()
+        self.cargas[idx] -= item
+        self.soma_itens -= item
+        if not barra:
+            self.num_barras -= 1
+        self.diario.append(('remover', idx, pos, item))
+        return item
+
+    def inserir(self, idx, item):
+        barra = self.barras[idx]
+        if not barra:
+            self.num_barras += 1
+        barra.append(item)
+        self.cargas[idx] += item
+        self.soma_itens += item
+        self.diario.append(('inserir', idx))
+
+    def abrir_barra(self, item):
+        """Abre uma barra nova com o item e retorna seu índice."""
+        self.barras.append([item])
+        self.cargas.append(item)
+        self.num_barras += 1
+        self.soma_itens += item
+        self.diario.append(('abrir',))
+        return len(self.barras) - 1
+
+    def mover(self, origem, pos, destino):
+        self.inserir(destino, self.remover(origem, pos))
+
+    def trocar(self, i, pos_i, j, pos_j):
+        item_i = self.barras[i][pos_i]
+        item_j = self.barras[j][pos_j]
+        self.barras[i][pos_i] = item_j
+        self.barras[j][pos_j] = item_i
+        self.cargas[i] += item_j - item_i
+        self.cargas[j] += item_i - item_j
+        self.diario.append(('trocar', i, pos_i, j, pos_j))
+
+    def mesclar(self, destino, origem):
+        """Passa todos os itens da barra origem para a barra destino."""
+        self.diario.append(('mesclar', destino, origem, len(self.barras[destino])))
+        self.barras[destino].extend(self.barras[origem])
+        self.cargas[destino] += self.cargas[origem]
+        self.barras[origem] = []
+        self.cargas[origem] = 0
+        self.num_barras -= 1
+
+    # --- diário ---
+    def ponto(self):
+        return len(self.diario)
+
+    def confirmar(self):
+        self.diario.clear()
+
+    def desfazer(self, ponto=0):
+        """Reverte, do mais recente para o mais antigo, os movimentos após ponto."""
+        barras = self.barras
+        cargas = self.cargas
+        while len(self.diario) > ponto:
+            registro = self.diario.pop()
+            tipo = registro[0]
+            if tipo == 'remover':
+                _, idx, pos, item = registro
+                barra = barras[idx]
+                if not barra:
+                    self.num_barras += 1
+                if pos == len(barra):
+                    barra.append(item)
+                else:
+                    barra.append(barra[pos])
+                    barra[pos] = item
+                cargas[idx] += item
+                self.soma_itens += item
+            elif tipo == 'inserir':
+                _, idx = registro
+                item = barras[idx].pop()
+                cargas[idx] -= item
+                self.soma_itens -= item
+                if not barras[idx]:
+                    self.num_barras -= 1
+            elif tipo == 'trocar':
+                _, i, pos_i, j, pos_j = registro
+                item_i = barras[i][pos_i]
+                item_j = barras[j][pos_j]
+                barras[i][pos_i] = item_j
+                barras[j][pos_j] = item_i
+                cargas[i] += item_j - item_i
+                cargas[j] += item_i - item_j
+            elif tipo == 'mesclar':
+                _, destino, origem, tamanho = registro
+                barras[origem] = barras[destino][tamanho:]
+                del barras[destino][tamanho:]
+                cargas[origem] = sum(barras[origem])
+                cargas[destino] -= cargas[origem]
+                self.num_barras += 1
+            elif tipo == 'abrir':
+                item = barras.pop()[0]
+                cargas.pop()
+                self.num_barras -= 1
+                self.soma_itens -= item
@@ -0,0 +1,26 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Os módulos do projeto ficam na raiz do repositório, sem pacote
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+@pytest.fixture
+def raiz(monkeypatch):
+    """Roda o teste a partir da raiz, onde ficam cutgen/ e fiber/."""
+    monkeypatch.chdir(RAIZ)
+    return RAIZ
+
+def barras_aleatorias(rng, capacidade=100, num_tamanhos=6, max_itens=60):
+    """Solução FFD de uma lista aleatória com poucos tamanhos distintos (muitas repetições)."""
+    from heuristicas_v3 import resolver_ffd
+    tamanhos = [rng.randint(5, capacidade * 7 // 10) for _ in range(num_tamanhos)]
+    itens = [rng.choice(tamanhos) for _ in range(rng.randint(1, max_itens))]
+    return resolver_ffd(capacidade, itens)[0]
+
+@pytest.fixture
+def rng():
+    return random.Random(0)
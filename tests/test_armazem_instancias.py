@@ -0,0 +1,50 @@
+import os
+
+from armazem_instancias import (ArmazemInstancias, abrir_armazem, carregar_instancia, construir_armazem,
+                                fechar_armazens, gravar_instancias)
+from heuristicas_v3 import Instancia, ler_instancia_agregada
+
+def test_gravar_e_carregar_ida_e_volta(tmp_path):
+    instancias = [Instancia(100, [30, 50, 30, 20], [2, 1, 3, 4], nome='a/1'),
+                  Instancia(1000, [999], [7], nome='b/2')]
+    destino = str(tmp_path / 'inst.bin')
+    assert gravar_instancias(instancias, destino) == 2
+    armazem = ArmazemInstancias(destino)
+    for original in instancias:
+        carregada = armazem.carregar(original.nome)
+        assert carregada.capacidade == original.capacidade
+        assert list(carregada.tamanhos) == list(original.tamanhos)
+        assert list(carregada.demandas) == list(original.demandas)
+        del carregada
+    assert armazem.fechar()
+
+def test_construir_a_partir_dos_textos(tmp_path, raiz):
+    destino = str(tmp_path / 'inst.bin')
+    padroes = ['fiber/*_5180.txt']
+    total, relidas = construir_armazem(padroes, destino)
+    assert total == relidas > 0
+    # nada mudou: tudo é reaproveitado do armazém anterior
+    assert construir_armazem(padroes, destino) == (total, 0)
+    caminho = 'fiber/fiber10_5180.txt'
+    texto = ler_instancia_agregada(caminho)
+    binaria = carregar_instancia(caminho, destino)
+    assert binaria.contagem() == texto.contagem()
+    del binaria
+    assert fechar_armazens() == 0
+
+def test_fechar_com_instancias_vivas(tmp_path):
+    destino = str(tmp_path / 'inst.bin')
+    gravar_instancias([Instancia(100, [30, 20], [1, 2], nome='x')], destino)
+    armazem = ArmazemInstancias(destino)
+    viva = armazem.carregar('x')
+    copia = armazem.carregar('x', copiar=True)
+    assert armazem.fechar() is False  # mapa preso às fatias de viva
+    assert list(viva.tamanhos) == [30, 20]
+    del viva
+    assert armazem.fechar() is True
+    assert copia.contagem() == {30: 1, 20: 2}
+
+def test_abrir_armazem_inexistente(tmp_path):
+    assert abrir_armazem(str(tmp_path / 'nao_existe.bin')) is None
+    assert abrir_armazem(None) is None
+    assert not os.path.exists(tmp_path / 'nao_existe.bin')
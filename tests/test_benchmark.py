@@ -0,0 +1,33 @@
+import pytest
+
+import benchmark
+
+def test_percentil():
+    assert benchmark.percentil([5, 1, 3, 2, 4], 50) == 3
+    assert benchmark.percentil([5, 1, 3, 2, 4], 95) == 5
+    assert benchmark.percentil([], 95) == 0.0
+
+def test_suite_sem_arquivos_falha(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError):
+        benchmark.rodar_suite('fiber_5180', 'ffd')
+    pasta = str(tmp_path / 'base')
+    assert benchmark.main(['fiber_5180', '-a', 'ffd', '--salvar', '--pasta', pasta]) == 1
+    assert benchmark.carregar_linha_base('fiber_5180', 'ffd', pasta) is None
+
+def test_falhas_nao_viram_linha_de_base(raiz, tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmark, 'medir_instancia', lambda caminho, *args: {'instancia': caminho, 'status': 'erro'})
+    pasta = str(tmp_path / 'base')
+    assert benchmark.main(['fiber_5180', '-a', 'ffd', '--salvar', '--pasta', pasta]) == 1
+    assert benchmark.carregar_linha_base('fiber_5180', 'ffd', pasta) is None
+
+def test_linha_de_base_e_regressao(raiz, tmp_path):
+    pasta = str(tmp_path / 'base')
+    assert benchmark.main(['fiber_5180', '-a', 'ffd', '-n', '1', '-w', '0', '--salvar', '--pasta', pasta]) == 0
+    base = benchmark.carregar_linha_base('fiber_5180', 'ffd', pasta)
+    assert base['falhas'] == 0 and base['instancias'] > 1
+    pior = dict(base, barras=base['barras'] + 1, tempo_total=base['tempo_total'] * 2 + 1)
+    regressoes = benchmark.comparar(pior, base)
+    assert any(r.startswith('barras') for r in regressoes)
+    assert any(r.startswith('tempo_total') for r in regressoes)
+    assert benchmark.comparar(base, base) == []
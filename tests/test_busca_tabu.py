@@ -0,0 +1,35 @@
+import random
+
+from busca_tabu import HashZobrist, busca_tabu
+from conftest import barras_aleatorias
+from limites import contagem_de_barras
+from solucao import SolucaoIncremental
+
+def test_hash_incremental_igual_ao_recalculado(rng):
+    for _ in range(100):
+        estado = SolucaoIncremental(100, barras_aleatorias(rng))
+        ativos = estado.indices_ativos()
+        if len(ativos) < 2:
+            continue
+        zobrist = HashZobrist(random.Random(1))
+        zobrist.recalcular(estado)
+        i, j = rng.sample(ativos, 2)
+        pos_i, pos_j = rng.randrange(len(estado.barras[i])), rng.randrange(len(estado.barras[j]))
+        item_i, item_j = estado.barras[i][pos_i], estado.barras[j][pos_j]
+        previsto = zobrist.apos_troca(i, j, item_i, item_j)
+        estado.trocar(i, pos_i, j, pos_j)
+        zobrist.recalcular(estado)
+        assert zobrist.valor == previsto
+        previsto = zobrist.apos_realocacao(i, j, estado.barras[i][0])
+        estado.mover(i, 0, j)
+        zobrist.recalcular(estado)
+        assert zobrist.valor == previsto
+
+def test_tabu_preserva_itens_e_capacidade(rng):
+    for semente in range(10):
+        barras = barras_aleatorias(rng, max_itens=100)
+        resultado, desperdicio, _ = busca_tabu(100, barras, max_iter=200, tempo_limite=5, semente=semente)
+        assert contagem_de_barras(resultado) == contagem_de_barras(barras)
+        assert all(sum(barra) <= 100 for barra in resultado)
+        assert len(resultado) <= len(barras)
+        assert desperdicio == sum(100 - sum(barra) for barra in resultado)
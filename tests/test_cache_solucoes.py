@@ -0,0 +1,45 @@
+from cache_solucoes import CacheSolucoes, impressao_digital, resolver_com_cache
+from heuristicas_v3 import Instancia
+
+def _instancia(k):
+    return Instancia(100, [60, 40 - k], [1, 1])
+
+def test_impressao_digital_ignora_ordem_e_repeticoes():
+    a = Instancia(100, [30, 50, 30], [1, 2, 3])
+    b = Instancia(100, [50, 30], [2, 4])
+    assert impressao_digital(a, {'x': 1}) == impressao_digital(b, {'x': 1})
+    assert impressao_digital(a, {'x': 1}) != impressao_digital(a, {'x': 2})
+
+def test_guarda_so_solucao_melhor(tmp_path):
+    cache = CacheSolucoes(str(tmp_path / 'c.sqlite'))
+    instancia = _instancia(0)
+    cache.guardar(instancia, None, [[60], [40]], 100)
+    cache.guardar(instancia, None, [[60, 40]], 0)
+    cache.guardar(instancia, None, [[60], [40]], 100)
+    barras, desperdicio = cache.obter(instancia)
+    assert sorted(map(sorted, barras)) == [[40, 60]] and desperdicio == 0
+    cache.fechar()
+
+def test_despejo_lru(tmp_path, monkeypatch):
+    import cache_solucoes
+    relogio = iter(range(1000))
+    monkeypatch.setattr(cache_solucoes.time, 'time', lambda: next(relogio))
+    cache = CacheSolucoes(str(tmp_path / 'c.sqlite'), max_entradas=3)
+    for k in range(3):
+        cache.guardar(_instancia(k), None, [[60, 40 - k]], k)
+    assert cache.obter(_instancia(0)) is not None  # 0 passa a ser o mais recente
+    cache.guardar(_instancia(3), None, [[60, 37]], 3)
+    assert len(cache) == 3
+    assert cache.obter(_instancia(1)) is None  # o menos usado saiu
+    for k in (0, 2, 3):
+        assert cache.obter(_instancia(k)) is not None
+    cache.fechar()
+
+def test_resolver_com_cache_reaproveita(tmp_path):
+    cache = CacheSolucoes(str(tmp_path / 'c.sqlite'))
+    instancia = Instancia(100, [50, 30, 20], [4, 3, 3])
+    barras, desperdicio, _, do_cache = resolver_com_cache(instancia, cache, tempo_limite=1)
+    assert not do_cache
+    segunda = resolver_com_cache(instancia, cache, tempo_limite=0)
+    assert segunda[3] and (len(segunda[0]), segunda[1]) == (len(barras), desperdicio)
+    cache.fechar()
@@ -0,0 +1,21 @@
+from fluxo import EmpacotadorFluxo, empacotar_fluxo
+from limites import contagem_de_barras
+
+def test_fluxo_emite_todos_os_itens(rng):
+    for _ in range(20):
+        itens = [rng.randint(5, 70) for _ in range(rng.randint(1, 300))]
+        barras = list(empacotar_fluxo(100, iter(itens), max_abertas=4, janela=8, reotimizar_a_cada=32,
+                                      tempo_limite=0.01))
+        assert contagem_de_barras(barras) == contagem_de_barras([itens])
+        assert all(sum(barra) <= 100 for barra in barras)
+
+def test_fluxo_limita_barras_abertas(rng):
+    empacotador = EmpacotadorFluxo(100, max_abertas=3, janela=4, reotimizar_a_cada=0)
+    emitidas = []
+    for _ in range(200):
+        emitidas.extend(empacotador.adicionar(rng.randint(5, 60)))
+        assert len(empacotador.abertas) <= 3
+        assert len(empacotador.pendentes) <= 4
+    emitidas.extend(empacotador.finalizar())
+    assert empacotador.estatisticas['barras'] == len(emitidas)
+    assert empacotador.estatisticas['desperdicio'] == sum(100 - sum(barra) for barra in emitidas)
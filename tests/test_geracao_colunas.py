@@ -0,0 +1,26 @@
+import time
+
+from geracao_colunas import resolver_geracao_colunas, resolver_lp
+from heuristicas_v3 import Instancia, expandir_barras
+from limites import contagem_de_barras, limite_l1
+
+def test_lp_entre_l1_e_solucao_inteira(rng):
+    for _ in range(20):
+        instancia = Instancia(100, [rng.randint(10, 60) for _ in range(5)], [rng.randint(1, 6) for _ in range(5)])
+        valor, padroes, x = resolver_lp(instancia)
+        soma = sum(t * d for t, d in instancia.tipos())
+        assert valor >= soma / 100 - 1e-6
+        assert all(sum(t * a for t, a in zip(instancia.tamanhos, p)) <= 100 for p in padroes)
+        barras, desperdicio, _ = resolver_geracao_colunas(instancia)
+        expandidas = expandir_barras(barras)
+        assert contagem_de_barras(expandidas) == instancia.contagem()
+        assert all(sum(barra) <= 100 for barra in expandidas)
+        assert limite_l1(100, instancia.contagem()) <= len(expandidas)
+        assert len(expandidas) >= valor - 1e-6
+
+def test_prazo_esgotado_completa_com_ffd(rng):
+    instancia = Instancia(1000, [rng.randint(10, 800) for _ in range(60)], [rng.randint(1, 50) for _ in range(60)])
+    inicio = time.time()
+    barras, _, _ = resolver_geracao_colunas(instancia, tempo_limite=0.0)
+    assert time.time() - inicio < 5
+    assert contagem_de_barras(expandir_barras(barras)) == instancia.contagem()
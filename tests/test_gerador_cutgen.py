@@ -0,0 +1,30 @@
+from armazem_instancias import ArmazemInstancias
+from gerador_cutgen import CLASSES_CUTGEN, formatar_instancia, gerar_classe, gerar_cutgen, main
+from heuristicas_v3 import ler_instancia_texto
+
+def test_mesma_semente_mesmo_lote():
+    primeiro = gerar_classe(4, quantidade=5, semente=3)
+    segundo = gerar_classe(4, quantidade=5, semente=3)
+    assert [i.contagem() for i in primeiro] == [i.contagem() for i in segundo]
+    assert [i.contagem() for i in gerar_classe(4, quantidade=5, semente=4)] != [i.contagem() for i in primeiro]
+
+def test_parametros_da_classe_respeitados():
+    for classe in (1, 8, 18):
+        m, v1, v2, demanda_media = CLASSES_CUTGEN[classe]
+        for instancia in gerar_classe(classe, quantidade=10, semente=1):
+            assert instancia.num_tipos <= m
+            assert instancia.total_itens == m * demanda_media
+            assert all(v1 * 1000 <= t <= v2 * 1000 + 1 for t in instancia.tamanhos)
+
+def test_formato_texto_ida_e_volta():
+    instancia = gerar_cutgen(10, 0.01, 0.8, 10, semente=2)[0]
+    relida = ler_instancia_texto(formatar_instancia(instancia))
+    assert relida.capacidade == instancia.capacidade
+    assert relida.contagem() == instancia.contagem()
+
+def test_main_grava_armazem(tmp_path, capsys):
+    destino = str(tmp_path / 'g.bin')
+    assert main([destino, '-c', '2', '-n', '3', '--armazem']) == 0
+    armazem = ArmazemInstancias(destino)
+    assert sorted(armazem.indice) == ['type02/TEST1', 'type02/TEST2', 'type02/TEST3']
+    armazem.fechar()
@@ -0,0 +1,110 @@
+import pickle
+
+import pytest
+
+from conftest import barras_aleatorias
+from heuristicas_v3 import (Instancia, PerfilBusca, busca_anytime, busca_local_avancada, expandir_barras,
+                            ler_instancia_texto, realocar_item, realocar_item_vetorizado, resolver_bfd,
+                            resolver_ffd, resolver_ffd_agregado)
+from limites import contagem_de_barras
+from solucao import SolucaoIncremental
+
+def ffd_ingenuo(capacidade, itens):
+    barras = []
+    for item in sorted(itens, reverse=True):
+        for barra in barras:
+            if sum(barra) + item <= capacidade:
+                barra.append(item)
+                break
+        else:
+            barras.append([item])
+    return barras
+
+def bfd_ingenuo(capacidade, itens):
+    barras = []
+    for item in sorted(itens, reverse=True):
+        cabem = [idx for idx, barra in enumerate(barras) if sum(barra) + item <= capacidade]
+        if cabem:
+            barras[min(cabem, key=lambda idx: (capacidade - sum(barras[idx]), idx))].append(item)
+        else:
+            barras.append([item])
+    return barras
+
+def itens_aleatorios(rng, capacidade):
+    # inclui itens maiores que a barra, que abrem uma barra própria
+    return [rng.randint(1, capacidade + (5 if rng.random() < 0.05 else 0)) for _ in range(rng.randint(0, 80))]
+
+def test_ffd_igual_ao_ingenuo(rng):
+    for _ in range(300):
+        capacidade = rng.choice([10, 100, 1000])
+        itens = itens_aleatorios(rng, capacidade)
+        barras, desperdicio, _ = resolver_ffd(capacidade, itens)
+        assert barras == ffd_ingenuo(capacidade, itens)
+        assert desperdicio == sum(capacidade - sum(barra) for barra in barras)
+
+def test_bfd_igual_ao_ingenuo(rng):
+    for _ in range(300):
+        capacidade = rng.choice([10, 100, 1000])
+        itens = itens_aleatorios(rng, capacidade)
+        assert resolver_bfd(capacidade, itens)[0] == bfd_ingenuo(capacidade, itens)
+
+def test_ffd_agregado_igual_ao_expandido(rng):
+    for _ in range(200):
+        capacidade = rng.choice([100, 1000])
+        itens = [rng.randint(1, capacidade) for _ in range(rng.randint(1, 60))]
+        instancia = Instancia.de_itens(capacidade, itens)
+        barras, desperdicio, _ = resolver_ffd_agregado(instancia)
+        esperado = ffd_ingenuo(capacidade, itens)
+        assert sorted(map(sorted, expandir_barras(barras))) == sorted(map(sorted, esperado))
+        assert desperdicio == sum(capacidade - sum(barra) for barra in esperado)
+
+def test_instancia_agrega_e_serializa():
+    instancia = ler_instancia_texto("L= 100\nm= 3\n30.00\t2\n50.00\t1\n30.00\t3\n")
+    assert instancia.capacidade == 100
+    assert instancia.contagem() == {50: 1, 30: 5}
+    vista = Instancia.de_vetores(100, memoryview(instancia.tamanhos), memoryview(instancia.demandas))
+    copia = pickle.loads(pickle.dumps(vista))
+    assert copia.contagem() == instancia.contagem()
+
+def test_realocar_vetorizado_escolhe_o_mesmo_movimento(rng):
+    pytest.importorskip('numpy')
+    for _ in range(500):
+        barras = barras_aleatorias(rng)
+        rng.shuffle(barras)
+        laco, vetor = SolucaoIncremental(100, barras), SolucaoIncremental(100, barras)
+        assert realocar_item(laco) == realocar_item_vetorizado(vetor)
+        assert laco.barras == vetor.barras
+
+def test_busca_preserva_itens_e_capacidade(rng):
+    for semente in range(20):
+        barras = barras_aleatorias(rng)
+        resultado, desperdicio, _ = busca_local_avancada(100, barras, max_iter=50, semente=semente)
+        assert contagem_de_barras(resultado) == contagem_de_barras(barras)
+        assert all(sum(barra) <= 100 for barra in resultado)
+        assert len(resultado) <= len(barras)
+        assert desperdicio == sum(100 - sum(barra) for barra in resultado)
+
+def test_busca_reprodutivel_com_semente(rng):
+    barras = barras_aleatorias(rng, max_itens=120)
+    primeira = busca_local_avancada(100, barras, max_iter=80, semente=7)
+    segunda = busca_local_avancada(100, barras, max_iter=80, semente=7)
+    assert primeira[:2] == segunda[:2]
+
+def test_perfil_sem_iteracoes_quando_ja_no_limite():
+    perfil = PerfilBusca()
+    busca_local_avancada(10, [[5, 5], [5, 5]], max_iter=10, perfil=perfil)
+    assert perfil.iteracoes == 0
+
+def test_anytime_produz_incumbentes_melhores(rng):
+    barras = barras_aleatorias(rng, max_itens=120)
+    passos = busca_anytime(100, barras, max_iter=100, semente=1)
+    vistos = []
+    try:
+        while True:
+            vistos.append(next(passos))
+    except StopIteration as fim:
+        final = fim.value
+    assert vistos and vistos[0][0] == SolucaoIncremental(100, barras).para_listas()
+    chaves = [(len(b), d) for b, d, _ in vistos]
+    assert chaves == sorted(chaves, reverse=True)
+    assert (len(final[0]), final[1]) == chaves[-1]
@@ -0,0 +1,44 @@
+from itertools import permutations
+
+from limites import calcular_gap, calcular_limites, limite_l1, limite_l2
+
+def _otimo(capacidade, itens):
+    """Menor número de barras por força bruta (first-fit sobre todas as ordens)."""
+    melhor = len(itens)
+    for ordem in set(permutations(itens)):
+        cargas = []
+        for item in ordem:
+            for idx, carga in enumerate(cargas):
+                if carga + item <= capacidade:
+                    cargas[idx] += item
+                    break
+            else:
+                cargas.append(item)
+        melhor = min(melhor, len(cargas))
+    return melhor
+
+def test_limites_nao_passam_do_otimo(rng):
+    for _ in range(60):
+        capacidade = 20
+        itens = [rng.randint(1, 20) for _ in range(rng.randint(1, 6))]
+        contagem = {}
+        for item in itens:
+            contagem[item] = contagem.get(item, 0) + 1
+        limites = calcular_limites(capacidade, contagem)
+        assert limite_l1(capacidade, contagem) <= limite_l2(capacidade, contagem) == limites['l2']
+        assert limites['limite'] <= _otimo(capacidade, itens)
+
+def test_l2_melhor_que_l1_com_itens_grandes():
+    contagem = {60: 3}
+    assert limite_l1(100, contagem) == 2
+    assert limite_l2(100, contagem) == 3
+
+def test_limite_lp(raiz):
+    from heuristicas_v3 import ler_instancia_agregada
+    instancia = ler_instancia_agregada('cutgen/type01/TEST1')
+    limites = calcular_limites(instancia.capacidade, instancia.contagem(), usar_lp=True)
+    assert limites['lp'] >= limites['l1']
+
+def test_gap():
+    assert calcular_gap(11, 10) == 10.0
+    assert calcular_gap(3, 0) == 0.0
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from gerador_cutgen import main as gerar
+from lote import ALGORITMOS, executar_trabalho, grupo_da_instancia, listar_instancias, resumir, rodar_lote
+
+def test_listar_ordem_natural_e_sem_repeticao(raiz):
+    caminhos = listar_instancias(['cutgen/type01/TEST1*', 'cutgen/type01/TEST1'])
+    assert caminhos[:3] == ['cutgen/type01/TEST1', 'cutgen/type01/TEST10', 'cutgen/type01/TEST11']
+    assert len(caminhos) == len(set(caminhos))
+
+def test_listar_casa_chaves_do_armazem(tmp_path):
+    destino = str(tmp_path / 'g.bin')
+    gerar([destino, '-c', '2', '-n', '3', '--armazem'])
+    assert listar_instancias(['type02/TEST*'], destino) == ['type02/TEST1', 'type02/TEST2', 'type02/TEST3']
+    # sem o armazém o padrão passa adiante e vira "arquivo não encontrado"
+    assert listar_instancias(['type02/TEST*']) == ['type02/TEST*']
+    resultado = executar_trabalho('type02/TEST2', 'ffd', armazem=destino)
+    assert resultado['status'] == 'ok' and resultado['grupo'] == 'type02'
+
+def test_grupo_da_instancia():
+    assert grupo_da_instancia('cutgen/type02/TEST5') == 'type02'
+    assert grupo_da_instancia('fiber/fiber10_5180.txt') == 'fiber_5180'
+
+@pytest.mark.parametrize('algoritmo', sorted(set(ALGORITMOS) - {'portfolio'}))
+def test_todos_os_algoritmos_respeitam_o_tempo(raiz, algoritmo):
+    resultado = executar_trabalho('cutgen/type05/TEST1', algoritmo, semente=0, tempo_limite=0.5, limite_rigido=20)
+    assert resultado['status'] == 'ok', resultado
+    assert resultado['barras'] >= resultado['limite_inferior']
+    assert resultado['tempo'] < 5
+
+def test_instancia_inexistente(raiz):
+    resultado = executar_trabalho('nao/existe', 'ffd')
+    assert resultado['status'] == 'erro' and resultado['erro'] == 'arquivo não encontrado'
+
+def test_rodar_lote_em_pool(raiz):
+    caminhos = listar_instancias(['fiber/fiber1[01]_5180.txt'])
+    resultados = list(rodar_lote(caminhos, ['ffd', 'portfolio'], tempo_limite=0.3, processos=2))
+    assert len(resultados) == 4 and all(r['status'] == 'ok' for r in resultados)
+    resumo = resumir(resultados)
+    assert resumo[('fiber_5180', 'ffd')]['ok'] == 2
+    json.dumps(resultados)
+
+def test_cli_com_armazem_e_portfolio(raiz, tmp_path, capsys):
+    from armazem_instancias import construir_armazem
+    from cli import main
+    destino = str(tmp_path / 'inst.bin')
+    construir_armazem(['fiber/fiber10_5180.txt'], destino)
+    assert main(['fiber/fiber10_5180.txt', '--armazem', destino, '-a', 'portfolio', '-a', 'ffd',
+                 '-t', '0.3', '-w', '1']) == 0
+    linhas = [json.loads(linha) for linha in capsys.readouterr().out.splitlines()]
+    assert [r['status'] for r in linhas] == ['ok', 'ok']
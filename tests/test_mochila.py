@@ -0,0 +1,38 @@
+from itertools import product
+
+from mochila import enchimento_maximo, mochila_limitada, soma_subconjuntos_limitada
+
+def _combinacoes(limites):
+    return product(*(range(u + 1) for u in limites))
+
+def test_mochila_limitada_igual_forca_bruta(rng):
+    for _ in range(150):
+        m = rng.randint(1, 4)
+        pesos = [rng.randint(1, 20) for _ in range(m)]
+        valores = [rng.uniform(0, 2) for _ in range(m)]
+        limites = [rng.randint(0, 3) for _ in range(m)]
+        capacidade = rng.randint(1, 40)
+        valor, quantidades = mochila_limitada(valores, pesos, limites, capacidade)
+        assert sum(w * a for w, a in zip(pesos, quantidades)) <= capacidade
+        assert all(0 <= a <= u for a, u in zip(quantidades, limites))
+        otimo = max(sum(v * a for v, a in zip(valores, combinacao)) for combinacao in _combinacoes(limites)
+                    if sum(w * a for w, a in zip(pesos, combinacao)) <= capacidade)
+        assert abs(valor - otimo) < 1e-9
+
+def test_soma_subconjuntos_igual_forca_bruta(rng):
+    for _ in range(200):
+        m = rng.randint(1, 4)
+        pesos = [rng.randint(1, 20) for _ in range(m)]
+        limites = [rng.randint(0, 3) for _ in range(m)]
+        capacidade = rng.randint(1, 50)
+        carga, quantidades = soma_subconjuntos_limitada(pesos, limites, capacidade)
+        assert carga == sum(w * a for w, a in zip(pesos, quantidades)) <= capacidade
+        assert all(0 <= a <= u for a, u in zip(quantidades, limites))
+        assert carga == max(s for s in (sum(w * a for w, a in zip(pesos, c)) for c in _combinacoes(limites))
+                            if s <= capacidade)
+
+def test_enchimento_maximo_memorizado():
+    tipos = ((7, 2), (5, 3))
+    assert enchimento_maximo(20, tipos) == enchimento_maximo(20, tipos)
+    carga, quantidades = enchimento_maximo(20, tipos)
+    assert carga == 19 and sum(w * a for (w, _), a in zip(tipos, quantidades)) == 19
@@ -0,0 +1,16 @@
+from conftest import barras_aleatorias
+from heuristicas_v3 import agregar_barras
+from limites import contagem_de_barras
+from padroes import SolucaoPadroes, busca_local_padroes
+
+def test_busca_por_padroes_preserva_itens(rng):
+    for _ in range(30):
+        barras = barras_aleatorias(rng, max_itens=100)
+        solucao = SolucaoPadroes.de_agregadas(100, agregar_barras(barras))
+        assert solucao.num_barras == len(barras)
+        solucao, desperdicio, _ = busca_local_padroes(solucao, max_iter=200, tempo_limite=5)
+        resultado = solucao.para_barras()
+        assert contagem_de_barras(resultado) == contagem_de_barras(barras)
+        assert all(sum(barra) <= 100 for barra in resultado)
+        assert len(resultado) <= len(barras)
+        assert desperdicio == sum(100 - sum(barra) for barra in resultado)
@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import barras_aleatorias
+from limites import contagem_de_barras
+from reotimizacao import PedidoIncremental, diferenca_demandas, reotimizar
+
+def _delta_aleatorio(rng, contagem):
+    delta = {}
+    candidatos = sorted(contagem) + [rng.randint(5, 90)]
+    for tamanho in set(rng.sample(candidatos, min(2, len(candidatos)))):
+        variacao = rng.randint(-contagem.get(tamanho, 0), 4)
+        if variacao:
+            delta[tamanho] = variacao
+    return delta
+
+def _aplicado(contagem, delta):
+    nova = dict(contagem)
+    for tamanho, variacao in delta.items():
+        nova[tamanho] = nova.get(tamanho, 0) + variacao
+    return {tamanho: qtd for tamanho, qtd in nova.items() if qtd}
+
+def test_diferenca_demandas():
+    assert diferenca_demandas({10: 2, 20: 1}, {10: 1, 30: 2}) == {10: -1, 20: -1, 30: 2}
+
+def test_alteracoes_sucessivas_conservam_itens(rng):
+    for _ in range(100):
+        barras = barras_aleatorias(rng)
+        pedido = PedidoIncremental(100, barras)
+        esperado = contagem_de_barras(barras)
+        for _ in range(3):
+            delta = _delta_aleatorio(rng, esperado)
+            pedido.aplicar(delta, max_iter=20)
+            esperado = _aplicado(esperado, delta)
+            atuais = pedido.para_listas()
+            assert contagem_de_barras(atuais) == esperado
+            assert all(sum(barra) <= 100 for barra in atuais)
+            assert pedido.num_barras == len(atuais)
+            assert pedido.desperdicio == sum(100 - sum(barra) for barra in atuais)
+
+def test_reotimizar_nao_altera_a_entrada(rng):
+    barras = barras_aleatorias(rng)
+    copia = [list(barra) for barra in barras]
+    delta = _delta_aleatorio(rng, contagem_de_barras(barras))
+    resultado, desperdicio, _, _ = reotimizar(100, barras, delta, max_iter=20)
+    assert barras == copia
+    assert contagem_de_barras(resultado) == _aplicado(contagem_de_barras(barras), delta)
+
+def test_retirada_alem_do_disponivel():
+    with pytest.raises(ValueError):
+        PedidoIncremental(100, [[50]]).aplicar({50: -2})
@@ -0,0 +1,60 @@
+from conftest import barras_aleatorias
+from solucao import SolucaoIncremental
+
+def _foto(estado):
+    return ([list(barra) for barra in estado.barras], list(estado.cargas),
+            estado.num_barras, estado.soma_itens)
+
+def _movimento_aleatorio(estado, rng):
+    ativos = estado.indices_ativos()
+    tipo = rng.choice(['mover', 'trocar', 'mesclar', 'abrir', 'remover_inserir'])
+    if tipo == 'abrir' or len(ativos) < 2:
+        origem = rng.choice(ativos)
+        item = estado.remover(origem, rng.randrange(len(estado.barras[origem])))
+        estado.abrir_barra(item)
+        return
+    i, j = rng.sample(ativos, 2)
+    if tipo == 'mover':
+        estado.mover(i, rng.randrange(len(estado.barras[i])), j)
+    elif tipo == 'trocar':
+        estado.trocar(i, rng.randrange(len(estado.barras[i])), j, rng.randrange(len(estado.barras[j])))
+    elif tipo == 'mesclar':
+        estado.mesclar(i, j)
+    else:
+        estado.inserir(j, estado.remover(i, rng.randrange(len(estado.barras[i]))))
+
+def test_desfazer_restaura_estado_exato(rng):
+    for _ in range(200):
+        estado = SolucaoIncremental(100, barras_aleatorias(rng))
+        antes = _foto(estado)
+        for _ in range(rng.randint(1, 15)):
+            _movimento_aleatorio(estado, rng)
+        estado.desfazer()
+        assert _foto(estado) == antes
+
+def test_desfazer_ate_ponto_intermediario(rng):
+    for _ in range(100):
+        estado = SolucaoIncremental(100, barras_aleatorias(rng))
+        _movimento_aleatorio(estado, rng)
+        ponto = estado.ponto()
+        meio = _foto(estado)
+        for _ in range(rng.randint(1, 10)):
+            _movimento_aleatorio(estado, rng)
+        estado.desfazer(ponto)
+        assert _foto(estado) == meio
+
+def test_contadores_acompanham_as_barras(rng):
+    for _ in range(100):
+        estado = SolucaoIncremental(100, barras_aleatorias(rng))
+        for _ in range(10):
+            _movimento_aleatorio(estado, rng)
+        assert estado.cargas == [sum(barra) for barra in estado.barras]
+        assert estado.num_barras == len(estado.para_listas())
+        assert estado.desperdicio == sum(100 - sum(barra) for barra in estado.para_listas())
+
+def test_representantes_uma_barra_por_classe():
+    estado = SolucaoIncremental(10, [[3, 4], [5], [4, 3], [5], [2]])
+    assert estado.representantes([0, 1, 2, 3, 4]) == [0, 1, 4]
+    assert estado.representantes([3, 2, 1, 0]) == [3, 2]
+    assert estado.primeiras_posicoes(0) == {3: 0, 4: 1}
+    assert SolucaoIncremental(10, [[2, 3, 2]]).primeiras_posicoes(0) == {2: 0, 3: 1}